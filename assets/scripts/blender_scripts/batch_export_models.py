@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Export GLB en parallèle: un processus Blender headless par modèle
+==================================================================
+
+Lance, pour chaque modèle de MODELS_TO_EXPORT (export_all_models_to_glb.py),
+un Blender en arrière-plan sur le .blend sauvegardé:
+
+    blender -b substation_200MW.blend -P export_all_models_to_glb.py -- --model <nom> ...
+
+Les processus sont limités au nombre de cœurs (--jobs). Chaque export part
+du fichier sauvegardé: la sélection et les échelles appliquées par un
+modèle ne touchent pas les autres, et un objet en échec n'interrompt pas
+le lot. Le pilote assemble le manifeste LOD, écrit un rapport JSON
+(statut, durée, taille par modèle) et sort en code 1 si un modèle échoue.
+
+Les modèles à jour dans le cache de construction (build_cache.py: même
+.blend, mêmes sources, GLB intacts) sont repris sans lancer Blender
+(--force pour tout réexporter).
+
+Usage (Python système, hors de Blender):
+    python3 batch_export_models.py
+    python3 batch_export_models.py --blend ../substation_200MW.blend --output ../../../public/models --jobs 4
+    python3 batch_export_models.py --model Transformer --model Switchgear --blender /opt/blender/blender
+"""
+
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from build_cache import EXPORT_SCRIPT, fresh_record, model_export_step
+from export_profiles import DEFAULT_PROFILE, PROFILES
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DEFAULT_BLEND = SCRIPTS_DIR.parent / "substation_200MW.blend"
+DEFAULT_OUTPUT = Path.home() / "Desktop" / "Hearst Qatar" / "public" / "models"
+LOD_MANIFEST = "lod_manifest.json"
+REPORT_NAME = "export_report.json"
+
+# Lignes de sortie Blender conservées dans le rapport en cas d'échec
+LOG_TAIL_LINES = 30
+
+
+# ============================================================================
+# MODÈLES
+# ============================================================================
+
+def read_models(script=EXPORT_SCRIPT):
+    """
+    MODELS_TO_EXPORT lu dans le source du script d'export (littéral Python):
+    le script importe bpy et ne peut pas être importé hors de Blender.
+    """
+    tree = ast.parse(Path(script).read_text(encoding="utf-8"))
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "MODELS_TO_EXPORT" for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise ValueError(f"MODELS_TO_EXPORT introuvable dans {script}")
+
+
+# ============================================================================
+# EXPORT D'UN MODÈLE
+# ============================================================================
+
+def export_model(blender, blend, model, output, work_dir, timeout, force=False, profile=DEFAULT_PROFILE):
+    """
+    Exporte un modèle dans un processus Blender dédié (sauf s'il est à jour
+    dans le cache de construction).
+
+    Returns:
+        Résultat {object_name, filename, ok, seconds, bytes, levels, error, returncode, cached}
+    """
+    start = time.perf_counter()
+    if not force:
+        key, params = model_export_step(model, output, profile)
+        record = fresh_record(key, [EXPORT_SCRIPT], params, [blend])
+        if record is not None:
+            return {**record["result"], "cached": True, "returncode": None,
+                    "seconds": round(time.perf_counter() - start, 3)}
+
+    name = model["object_name"]
+    result_file = Path(work_dir) / f"{name}.json"
+    command = [
+        blender, "-b", "--factory-startup", str(blend), "--python-exit-code", "1",
+        "-P", str(EXPORT_SCRIPT), "--",
+        "--model", name, "--output", str(output), "--result", str(result_file), "--profile", profile,
+    ]
+    if force:
+        command.append("--force")
+    try:
+        process = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+        returncode, log = process.returncode, process.stdout + process.stderr
+    except subprocess.TimeoutExpired:
+        returncode, log = None, f"délai dépassé ({timeout} s)"
+    except OSError as exc:
+        returncode, log = None, f"lancement impossible: {exc}"
+    seconds = round(time.perf_counter() - start, 3)
+
+    result = {"object_name": name, "filename": model["filename"], "ok": False}
+    if result_file.exists():
+        result.update(json.loads(result_file.read_text(encoding="utf-8"))[0])
+    if returncode != 0:
+        result["ok"] = False
+        result.setdefault("error", f"Blender a échoué (code {returncode})")
+    if not result["ok"]:
+        result["log"] = log.splitlines()[-LOG_TAIL_LINES:]
+    # Durée totale du processus (démarrage de Blender et chargement du .blend compris)
+    result["export_seconds"] = result.get("seconds")
+    result["seconds"] = seconds
+    result["returncode"] = returncode
+    return result
+
+
+def run_batch(blender, blend, models, output, jobs, timeout, force=False, profile=DEFAULT_PROFILE):
+    """Exporte les modèles en parallèle (jobs processus au plus), résultats dans l'ordre des modèles"""
+    with tempfile.TemporaryDirectory(prefix="glb_export_") as work_dir:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(export_model, blender, blend, model, output, work_dir, timeout, force, profile)
+                       for model in models]
+            results = []
+            for future in futures:
+                result = future.result()
+                status = ("⏭️ " if result.get("cached") else "✅") if result["ok"] else "❌"
+                print(f"{status} {result['object_name']}: {result['seconds']:.1f} s"
+                      + (f", {result['bytes'] / 1024:.1f} Ko" if result.get("bytes") else "")
+                      + (f" ({result['error']})" if result.get("error") else ""))
+                results.append(result)
+    return results
+
+
+# ============================================================================
+# RAPPORT
+# ============================================================================
+
+def write_manifest(path, results):
+    """Manifeste LOD assemblé à partir des résultats (entrées existantes conservées)"""
+    manifest = {"models": {}}
+    if path.exists():
+        try:
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            pass
+    for result in results:
+        if result["ok"] and result.get("levels"):
+            manifest.setdefault("models", {})[Path(result["filename"]).stem] = {
+                "object": result["object_name"],
+                "levels": result["levels"],
+            }
+    path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Export GLB parallèle (un Blender par modèle)")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"),
+                        help="Exécutable Blender (défaut: $BLENDER ou blender)")
+    parser.add_argument("--blend", type=Path, default=DEFAULT_BLEND, help="Fichier .blend source")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Dossier d'export GLB")
+    parser.add_argument("--model", action="append", default=None,
+                        help="object_name à exporter (répétable, défaut: tous)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Processus Blender simultanés (défaut: nombre de cœurs)")
+    parser.add_argument("--timeout", type=float, default=600, help="Délai max par modèle (s)")
+    parser.add_argument("--force", action="store_true", help="Ignore le cache de construction")
+    parser.add_argument("--profile", choices=list(PROFILES), default=DEFAULT_PROFILE,
+                        help="Profil de compression (export_profiles.py)")
+    parser.add_argument("--report", type=Path, default=None,
+                        help=f"Rapport JSON (défaut: <output>/{REPORT_NAME})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.blend.exists():
+        print(f"ERREUR: fichier .blend introuvable: {args.blend}")
+        return 1
+    models = read_models()
+    if args.model:
+        unknown = sorted(set(args.model) - {m["object_name"] for m in models})
+        if unknown:
+            print(f"ERREUR: modèle(s) absent(s) de MODELS_TO_EXPORT: {', '.join(unknown)}")
+            return 1
+        models = [m for m in models if m["object_name"] in args.model]
+    jobs = max(1, min(args.jobs, len(models)))
+    args.output.mkdir(parents=True, exist_ok=True)
+
+    print(f"🚀 Export de {len(models)} modèle(s), {jobs} processus Blender en parallèle")
+    print(f"📁 Source : {args.blend}")
+    print(f"📁 Destination : {args.output}")
+    print(f"🗜️  Profil : {args.profile} ({PROFILES[args.profile]['description']})\n")
+
+    start = time.perf_counter()
+    results = run_batch(args.blender, args.blend.resolve(), models, args.output.resolve(), jobs, args.timeout,
+                        args.force, args.profile)
+    total = round(time.perf_counter() - start, 3)
+    failed = [r for r in results if not r["ok"]]
+
+    write_manifest(args.output / LOD_MANIFEST, results)
+    report_path = args.report or args.output / REPORT_NAME
+    report = {
+        "blend": str(args.blend),
+        "output": str(args.output),
+        "jobs": jobs,
+        "profile": args.profile,
+        "seconds": total,
+        "exported": len(results) - len(failed),
+        "failed": len(failed),
+        "cached": sum(1 for r in results if r.get("cached")),
+        "bytes": sum(r.get("bytes", 0) for r in results if r["ok"]),
+        "decode_ms": round(sum(r.get("decode_ms", 0) for r in results if r["ok"]), 1),
+        "models": results,
+    }
+    report_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    print("\n" + "=" * 50)
+    print(f"✅ Exportés : {report['exported']}/{len(results)} en {total:.1f} s")
+    if failed:
+        print(f"❌ Échecs : {', '.join(r['object_name'] for r in failed)}")
+    print(f"📁 Rapport : {report_path}")
+    print("=" * 50)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
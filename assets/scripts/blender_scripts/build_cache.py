@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache de construction par empreinte de contenu (.blend et GLB)
+==============================================================
+
+Chaque étape de construction (génération d'éléments dans le .blend, export
+d'un GLB) est décrite par une empreinte SHA-256 de ses entrées:
+- le source de ses scripts et des modules locaux qu'ils importent
+  (mesh_primitives.py, lod_export.py...): dimensions, couleurs, positions
+  et options d'export sont des constantes de ces sources
+- des paramètres explicites (modèle exporté, ratios LOD, dossier d'export)
+- le contenu de fichiers d'entrée (ex. le .blend pour un export)
+
+L'enregistrement d'une étape (un JSON par étape dans CACHE_DIR) garde
+l'empreinte et le hash des fichiers produits: une étape est à jour si son
+empreinte n'a pas changé et que ses sorties sont intactes. Un fichier par
+étape: les exports parallèles (batch_export_models.py) écrivent chacun le
+leur, sans verrou.
+
+Aucune dépendance à Blender: vérification en CI sans Blender
+    python3 build_cache.py --check     (code 1 si une étape est périmée)
+    python3 build_cache.py --list
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+CACHE_DIR = SCRIPTS_DIR.parent / ".build_cache"
+EXPORT_SCRIPT = SCRIPTS_DIR / "export_all_models_to_glb.py"
+
+# Taille des blocs lus pour le hash des fichiers
+HASH_CHUNK = 1 << 20
+
+
+# ============================================================================
+# EMPREINTES
+# ============================================================================
+
+def file_hash(path):
+    """SHA-256 du contenu d'un fichier (None s'il n'existe pas)"""
+    path = Path(path)
+    if not path.is_file():
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def local_imports(script):
+    """Modules du dossier de script importés par script (récursivement), script compris"""
+    script = Path(script).resolve()
+    found, pending = [], [script]
+    while pending:
+        current = pending.pop()
+        if current in found:
+            continue
+        found.append(current)
+        tree = ast.parse(current.read_text(encoding="utf-8"))
+        for node in ast.walk(tree):
+            names = []
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            for name in names:
+                candidate = current.parent / f"{name.split('.')[0]}.py"
+                if candidate.is_file():
+                    pending.append(candidate.resolve())
+    return sorted(found)
+
+
+def fingerprint(scripts=(), params=None, inputs=()):
+    """
+    Empreinte d'une étape.
+
+    Args:
+        scripts: Scripts de l'étape (leurs imports locaux sont inclus)
+        params: Paramètres sérialisables en JSON
+        inputs: Fichiers d'entrée (hash de contenu)
+    """
+    digest = hashlib.sha256()
+    sources = sorted({source for script in scripts for source in local_imports(script)})
+    for source in sources:
+        digest.update(source.name.encode())
+        digest.update(source.read_bytes())
+    digest.update(json.dumps(params or {}, sort_keys=True, default=str).encode())
+    for path in inputs:
+        digest.update(str(file_hash(path)).encode())
+    return digest.hexdigest()
+
+
+# ============================================================================
+# ENREGISTREMENTS
+# ============================================================================
+
+def _record_path(key, cache_dir=CACHE_DIR):
+    return Path(cache_dir) / f"{key.replace('/', '__')}.json"
+
+
+def load_record(key, cache_dir=CACHE_DIR):
+    """Enregistrement d'une étape (None si absent ou illisible)"""
+    path = _record_path(key, cache_dir)
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _relative(path):
+    """Chemin relatif au dossier des scripts si possible (enregistrements portables)"""
+    path = Path(path).resolve()
+    return os.path.relpath(path, SCRIPTS_DIR) if path.drive == SCRIPTS_DIR.drive else str(path)
+
+
+def _absolute(path):
+    return (SCRIPTS_DIR / path).resolve()
+
+
+def save_record(key, scripts=(), params=None, inputs=(), outputs=(), cache_dir=CACHE_DIR, **extra):
+    """
+    Enregistre une étape réussie: empreinte, description des entrées (pour
+    --check) et hash des sorties. extra: données libres (objets créés, résultat).
+    """
+    record = {
+        "key": key,
+        "fingerprint": fingerprint(scripts, params, inputs),
+        "scripts": [_relative(script) for script in scripts],
+        "params": params or {},
+        "inputs": [_relative(path) for path in inputs],
+        "outputs": {_relative(path): file_hash(path) for path in outputs},
+        "built": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        **extra,
+    }
+    path = _record_path(key, cache_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(f".{os.getpid()}.tmp")
+    temporary.write_text(json.dumps(record, indent=2, ensure_ascii=False, default=str), encoding="utf-8")
+    os.replace(temporary, path)
+    return record
+
+
+def stale_reason(record, current_fingerprint=None):
+    """
+    Raison pour laquelle un enregistrement est périmé (None s'il est à jour).
+    Sans current_fingerprint, l'empreinte est recalculée depuis l'enregistrement.
+    """
+    if record is None:
+        return "jamais construit"
+    if current_fingerprint is None:
+        try:
+            current_fingerprint = fingerprint([_absolute(s) for s in record["scripts"]], record["params"],
+                                              [_absolute(p) for p in record["inputs"]])
+        except OSError as exc:
+            return f"entrée illisible ({exc})"
+    if current_fingerprint != record["fingerprint"]:
+        return "entrées modifiées"
+    for path, expected in record["outputs"].items():
+        actual = file_hash(_absolute(path))
+        if actual is None:
+            return f"sortie absente: {path}"
+        if actual != expected:
+            return f"sortie modifiée: {path}"
+    return None
+
+
+def fresh_record(key, scripts=(), params=None, inputs=(), cache_dir=CACHE_DIR):
+    """Enregistrement de l'étape si elle est à jour pour ces entrées, sinon None"""
+    record = load_record(key, cache_dir)
+    if stale_reason(record, fingerprint(scripts, params, inputs)) is None:
+        return record
+    return None
+
+
+def model_export_step(model, export_dir, profile):
+    """
+    Clé et paramètres de l'export d'un modèle de MODELS_TO_EXPORT (partagés par
+    export_all_models_to_glb.py et batch_export_models.py). Les ratios LOD et
+    options glTF sont des constantes des sources: couverts par leur hash.
+    """
+    key = f"export/{Path(model['filename']).stem}"
+    return key, {"model": model, "export_dir": str(Path(export_dir).resolve()), "profile": profile}
+
+
+# ============================================================================
+# LIGNE DE COMMANDE
+# ============================================================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Cache de construction des assets Blender")
+    parser.add_argument("--check", action="store_true", help="Code 1 si une étape enregistrée est périmée")
+    parser.add_argument("--list", action="store_true", help="Liste les étapes et leur état")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help="Dossier du cache")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    records = [load_record(path.stem.replace("__", "/"), args.cache_dir)
+               for path in sorted(Path(args.cache_dir).glob("*.json"))]
+    records = [r for r in records if r is not None]
+    if not records:
+        print(f"ERREUR: aucun enregistrement dans {args.cache_dir}")
+        return 1
+
+    stale = 0
+    for record in records:
+        reason = stale_reason(record)
+        stale += reason is not None
+        if args.list or reason:
+            status = f"⚠️  périmé ({reason})" if reason else "✅ à jour"
+            print(f"{record['key']:<40} {status}  [{record['built']}]")
+    print(f"\n{len(records) - stale}/{len(records)} étapes à jour")
+    return 1 if args.check and stale else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
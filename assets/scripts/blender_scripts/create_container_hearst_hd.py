@@ -11,9 +11,22 @@ Ce script crée automatiquement un container complet avec:
 Tout en 1 seul objet optimisé pour Three.js
 """
 
+import os
+import sys
+from pathlib import Path
+
 import bpy
-import bmesh
-from mathlib import Vector
+
+# Bibliothèque de géométrie du dossier (mesh_primitives.py)
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from build_cache import fresh_record, save_record
+from export_profiles import DEFAULT_PROFILE
+from lod_export import base_level, export_lods, export_selected, write_manifest
+from mesh_primitives import add_object, box_mesh, plane_mesh
+from vertex_paint import paint_by_height
 
 # ============================================================================
 # CONFIGURATION
@@ -45,6 +58,15 @@ VENT_HEIGHT = 0.8
 LOGO_WIDTH = 1.2
 LOGO_HEIGHT = 0.6
 
+# Niveaux de détail exportés (ratios de décimation, puis imposteur boîte)
+LOD_RATIOS = (0.5, 0.2)
+
+# Profil de compression GLB (export_profiles.py: web-fast, web-balanced, web-small, archival)
+EXPORT_PROFILE = DEFAULT_PROFILE
+
+# GLB produit (LOD et manifeste écrits à côté)
+EXPORT_PATH = "/Users/adrienbeyondcrypto/Desktop/Hearst Qatar/public/models/container_hearst_hd.glb"
+
 # ============================================================================
 # FONCTIONS UTILITAIRES
 # ============================================================================
@@ -62,47 +84,12 @@ def setup_units():
     print("✅ Unités configurées (mètres)")
 
 def create_box(name, location, dimensions):
-    """Créer une boîte avec dimensions spécifiques"""
-    bpy.ops.mesh.primitive_cube_add(size=1, location=location)
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = (dimensions[0]/2, dimensions[1]/2, dimensions[2]/2)
-    bpy.ops.object.transform_apply(scale=True)
-    return obj
+    """Créer une boîte avec dimensions spécifiques (dimensions intégrées au maillage)"""
+    return add_object(name, box_mesh(name, dimensions), location=location)
 
 def create_plane(name, location, dimensions, rotation=(0, 0, 0)):
-    """Créer un plan avec dimensions spécifiques"""
-    bpy.ops.mesh.primitive_plane_add(size=1, location=location)
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = (dimensions[0]/2, dimensions[1]/2, 1)
-    obj.rotation_euler = rotation
-    bpy.ops.object.transform_apply(scale=True, rotation=True)
-    return obj
-
-def add_vertex_colors(obj):
-    """Ajouter un calque de couleurs de vertex"""
-    if not obj.data.vertex_colors:
-        obj.data.vertex_colors.new()
-    return obj.data.vertex_colors.active
-
-def paint_vertices(obj, color, vertex_indices=None):
-    """Peindre des vertices avec une couleur"""
-    mesh = obj.data
-    color_layer = mesh.vertex_colors.active
-    
-    if vertex_indices is None:
-        # Peindre tous les vertices
-        for poly in mesh.polygons:
-            for loop_idx in poly.loop_indices:
-                color_layer.data[loop_idx].color = color
-    else:
-        # Peindre des vertices spécifiques
-        for poly in mesh.polygons:
-            for loop_idx in poly.loop_indices:
-                vert_idx = mesh.loops[loop_idx].vertex_index
-                if vert_idx in vertex_indices:
-                    color_layer.data[loop_idx].color = color
+    """Créer un plan avec dimensions spécifiques (rotation intégrée au maillage)"""
+    return add_object(name, plane_mesh(name, dimensions, rotation=rotation), location=location)
 
 # ============================================================================
 # CRÉATION DES COMPOSANTS
@@ -206,38 +193,15 @@ def join_all_objects(objects):
     return final_obj
 
 def apply_vertex_colors(obj):
-    """Appliquer les couleurs de vertex par zones"""
-    # Ajouter le calque de couleurs
-    add_vertex_colors(obj)
-    
-    # Mode édition pour sélectionner par zones
-    bpy.context.view_layer.objects.active = obj
-    bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.mesh.select_all(action='DESELECT')
-    bpy.ops.object.mode_set(mode='OBJECT')
-    
-    mesh = obj.data
-    
-    # Peindre par zones en fonction de la position Z
-    for poly in mesh.polygons:
-        # Calculer la position moyenne du polygone
-        center_z = sum(mesh.vertices[v].co.z for v in poly.vertices) / len(poly.vertices)
-        
-        # Déterminer la couleur selon la hauteur
-        if center_z < DALLE_HEIGHT:
-            # Dalle béton
-            color = COLOR_BETON
-        elif center_z > DALLE_HEIGHT + CONTAINER_HEIGHT + 0.1:
-            # Unité AC
-            color = COLOR_COOLING
-        else:
-            # Container principal
-            color = COLOR_CONTAINER
-        
-        # Appliquer la couleur
-        for loop_idx in poly.loop_indices:
-            mesh.vertex_colors.active.data[loop_idx].color = color
-    
+    """
+    Appliquer les couleurs de vertex par zones de hauteur (centre Z de
+    chaque polygone), en une passe NumPy: dalle, container, unité AC
+    """
+    paint_by_height(
+        obj.data,
+        thresholds=[DALLE_HEIGHT, DALLE_HEIGHT + CONTAINER_HEIGHT + 0.1],
+        colors=[COLOR_BETON, COLOR_CONTAINER, COLOR_COOLING]
+    )
     print("✅ Couleurs de vertex appliquées")
 
 def create_material():
@@ -320,31 +284,30 @@ def center_origin(obj):
 # EXPORT
 # ============================================================================
 
-def export_glb(obj, filepath):
-    """Exporter en GLB optimisé"""
-    # Sélectionner uniquement l'objet
-    bpy.ops.object.select_all(action='DESELECT')
-    obj.select_set(True)
-    bpy.context.view_layer.objects.active = obj
-    
-    # Export
-    bpy.ops.export_scene.gltf(
-        filepath=filepath,
-        export_format='GLB',
-        use_selection=True,
-        export_texcoords=True,
-        export_normals=True,
-        export_materials='EXPORT',
-        export_colors=True,
-        export_cameras=False,
-        export_lights=False,
-        export_apply=True,
-        export_yup=True,
-        export_draco_mesh_compression_enable=True,
-        export_draco_mesh_compression_level=6
-    )
+def export_step(filepath, lod_ratios=LOD_RATIOS, profile=EXPORT_PROFILE):
+    """Clé et paramètres de l'export dans le cache de construction (build_cache.py)"""
+    return f"export/{Path(filepath).stem}", {"filepath": str(filepath), "lod_ratios": lod_ratios, "profile": profile}
+
+
+def export_glb(obj, filepath, lod_ratios=LOD_RATIOS, profile=EXPORT_PROFILE):
+    """Exporter en GLB optimisé (profil de compression), puis la chaîne de LOD"""
+    cache_key, cache_params = export_step(filepath, lod_ratios, profile)
+
+    # Export (objet seul, compression du profil)
+    filepath = Path(filepath)
+    method = export_selected(obj, filepath, profile)
     
-    print(f"✅ Export GLB: {filepath}")
+    print(f"✅ Export GLB ({profile}): {filepath}")
+
+    # Niveaux de détail + manifeste à côté du GLB
+    levels = [base_level(obj, filepath, method)]
+    levels += export_lods(obj, filepath.parent, filepath.stem, lod_ratios, profile=profile)
+    for level in levels:
+        print(f"   LOD{level['level']}: {level['triangles']} triangles, {level['bytes'] / 1024:.1f} Ko, "
+              f"décodage ~{level['decode_ms']} ms ({level['file']})")
+    write_manifest(filepath.parent / "lod_manifest.json", {filepath.stem: {"object": obj.name, "levels": levels}})
+    save_record(cache_key, [__file__], cache_params,
+                outputs=[filepath.parent / level["file"] for level in levels])
 
 # ============================================================================
 # SCRIPT PRINCIPAL
@@ -356,6 +319,14 @@ def main():
     print("CRÉATION CONTAINER HEARST HD")
     print("="*60 + "\n")
     
+    # 0. Rien à reconstruire si ce script (géométrie déterministe) et les
+    # paramètres d'export n'ont pas changé et que les GLB sont intacts
+    cache_key, cache_params = export_step(EXPORT_PATH)
+    record = fresh_record(cache_key, [__file__], cache_params)
+    if record is not None:
+        print(f"⏭️  GLB à jour (cache {record['built']}): {EXPORT_PATH}")
+        return None
+    
     # 1. Préparation
     clean_scene()
     setup_units()
@@ -394,8 +365,7 @@ def main():
     
     # 7. Export
     print("\n--- Export ---")
-    export_path = "/Users/adrienbeyondcrypto/Desktop/Hearst Qatar/public/models/container_hearst_hd.glb"
-    export_glb(final_obj, export_path)
+    export_glb(final_obj, EXPORT_PATH)
     
     print("\n" + "="*60)
     print("✅ CONTAINER HEARST HD CRÉÉ AVEC SUCCÈS!")
@@ -5,8 +5,19 @@ Script Blender pour créer les 4 Power Blocks avec leur structure de base
 Usage: Dans Blender, Scripting workspace > New > Coller ce script > Run
 """
 
+import os
+import sys
+
 import bpy
 
+# Bibliothèque de géométrie du dossier (mesh_primitives.py)
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from mesh_primitives import add_object, box_mesh
+
+
 def create_power_block(pb_num, position):
     """
     Crée un Power Block avec sa structure de base
@@ -17,25 +28,11 @@ def create_power_block(pb_num, position):
     """
     # Créer le groupe principal
     pb_name = f"PowerBlock_{pb_num}"
-    pb_group = bpy.data.objects.new(pb_name, None)
-    pb_group.empty_display_type = 'PLAIN_AXES'
-    pb_group.location = position
-    bpy.context.collection.objects.link(pb_group)
     
     # Parent: SubstationSystem
     substation_system = bpy.data.objects.get("SubstationSystem")
-    if substation_system:
-        pb_group.parent = substation_system
-    
-    # Structure principale (15m x 8m x 10m)
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=(position[0], position[1], position[2] + 4)
-    )
-    pb_structure = bpy.context.active_object
-    pb_structure.name = f"PB{pb_num}_Structure"
-    pb_structure.scale = (15, 8, 10)
-    pb_structure.parent = pb_group
+    pb_group = add_object(pb_name, None, location=position, parent=substation_system)
+    pb_group.empty_display_type = 'PLAIN_AXES'
     
     # Matériau béton industriel
     mat_structure = bpy.data.materials.new(name=f"{pb_name}_Structure_Material")
@@ -44,26 +41,25 @@ def create_power_block(pb_num, position):
     bsdf.inputs["Base Color"].default_value = (0.6, 0.6, 0.6, 1.0)  # Gris béton
     bsdf.inputs["Metallic"].default_value = 0.0
     bsdf.inputs["Roughness"].default_value = 0.7
-    pb_structure.data.materials.append(mat_structure)
+    
+    # Structure principale (15m x 8m x 10m)
+    structure_name = f"PB{pb_num}_Structure"
+    add_object(structure_name, box_mesh(structure_name, (15, 8, 10), material=mat_structure),
+               location=(position[0], position[1], position[2] + 4), parent=pb_group)
     
     # Panneaux électriques latéraux
     for side in ['Left', 'Right']:
-        bpy.ops.mesh.primitive_cube_add(
-            size=1,
-            location=(position[0] + (7.5 if side == 'Right' else -7.5), position[1], position[2] + 4)
-        )
-        panel = bpy.context.active_object
-        panel.name = f"PB{pb_num}_Panel_{side}"
-        panel.scale = (0.2, 6, 8)
-        panel.parent = pb_group
-        
         mat_panel = bpy.data.materials.new(name=f"{pb_name}_Panel_Material")
         mat_panel.use_nodes = True
         bsdf = mat_panel.node_tree.nodes["Principled BSDF"]
         bsdf.inputs["Base Color"].default_value = (0.3, 0.3, 0.35, 1.0)  # Gris métal
         bsdf.inputs["Metallic"].default_value = 0.5
         bsdf.inputs["Roughness"].default_value = 0.5
-        panel.data.materials.append(mat_panel)
+        
+        panel_name = f"PB{pb_num}_Panel_{side}"
+        add_object(panel_name, box_mesh(panel_name, (0.2, 6, 8), material=mat_panel),
+                   location=(position[0] + (7.5 if side == 'Right' else -7.5), position[1], position[2] + 4),
+                   parent=pb_group)
     
     return pb_group
 
@@ -5,8 +5,19 @@ Script Blender pour créer les 24 switchgears/disjoncteurs
 Usage: Dans Blender, Scripting workspace > New > Coller ce script > Run
 """
 
+import os
+import sys
+
 import bpy
 
+# Bibliothèque de géométrie du dossier (mesh_primitives.py)
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from mesh_primitives import add_object, box_mesh, cylinder_mesh
+
+
 def create_switchgear(pb_num, tr_num, position):
     """
     Crée un switchgear pour un transformateur
@@ -26,16 +37,6 @@ def create_switchgear(pb_num, tr_num, position):
     
     sg_name = f"PB{pb_num}_SG_{tr_num:02d}"
     
-    # Boîtier principal (2m x 2m x 1.5m)
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=position
-    )
-    enclosure = bpy.context.active_object
-    enclosure.name = f"{sg_name}_Enclosure"
-    enclosure.scale = (2, 2, 1.5)
-    enclosure.parent = tr_group
-    
     # Matériau boîtier (métal gris RAL 7035)
     mat_enclosure = bpy.data.materials.new(name=f"{sg_name}_Enclosure_Material")
     mat_enclosure.use_nodes = True
@@ -43,45 +44,37 @@ def create_switchgear(pb_num, tr_num, position):
     bsdf.inputs["Base Color"].default_value = (0.5, 0.52, 0.55, 1.0)  # Gris RAL 7035
     bsdf.inputs["Metallic"].default_value = 0.5
     bsdf.inputs["Roughness"].default_value = 0.6
-    enclosure.data.materials.append(mat_enclosure)
     
-    # Panneau de contrôle (avant)
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=(position[0], position[1] - 1.1, position[2])
-    )
-    panel = bpy.context.active_object
-    panel.name = f"{sg_name}_Controls"
-    panel.scale = (1.8, 0.1, 1.3)
-    panel.parent = tr_group
+    # Boîtier principal (2m x 2m x 1.5m)
+    enclosure_name = f"{sg_name}_Enclosure"
+    enclosure = add_object(enclosure_name, box_mesh(enclosure_name, (2, 2, 1.5), material=mat_enclosure),
+                           location=position, parent=tr_group)
     
+    # Panneau de contrôle (avant)
     mat_panel = bpy.data.materials.new(name=f"{sg_name}_Panel_Material")
     mat_panel.use_nodes = True
     bsdf = mat_panel.node_tree.nodes["Principled BSDF"]
     bsdf.inputs["Base Color"].default_value = (0.1, 0.1, 0.1, 1.0)  # Plastique noir
     bsdf.inputs["Metallic"].default_value = 0.0
     bsdf.inputs["Roughness"].default_value = 0.8
-    panel.data.materials.append(mat_panel)
+    
+    panel_name = f"{sg_name}_Controls"
+    add_object(panel_name, box_mesh(panel_name, (1.8, 0.1, 1.3), material=mat_panel),
+               location=(position[0], position[1] - 1.1, position[2]), parent=tr_group)
     
     # Voyants (3 petits cercles)
     for i in range(3):
-        bpy.ops.mesh.primitive_cylinder_add(
-            radius=0.05,
-            depth=0.05,
-            location=(position[0] - 0.5 + i * 0.5, position[1] - 1.15, position[2] + 0.5)
-        )
-        led = bpy.context.active_object
-        led.name = f"{sg_name}_LED_{i+1}"
-        led.rotation_euler = (1.5708, 0, 0)
-        led.parent = tr_group
-        
         mat_led = bpy.data.materials.new(name=f"{sg_name}_LED_Material")
         mat_led.use_nodes = True
         bsdf = mat_led.node_tree.nodes["Principled BSDF"]
         bsdf.inputs["Base Color"].default_value = (0.0, 1.0, 0.0, 1.0)  # Vert
         bsdf.inputs["Emission Color"].default_value = (0.0, 1.0, 0.0, 1.0)
         bsdf.inputs["Emission Strength"].default_value = 2.0
-        led.data.materials.append(mat_led)
+        
+        led_name = f"{sg_name}_LED_{i+1}"
+        add_object(led_name, cylinder_mesh(led_name, 0.05, 0.05, material=mat_led),
+                   location=(position[0] - 0.5 + i * 0.5, position[1] - 1.15, position[2] + 0.5),
+                   rotation=(1.5708, 0, 0), parent=tr_group)
     
     return enclosure
 
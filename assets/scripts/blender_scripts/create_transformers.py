@@ -5,8 +5,19 @@ Script Blender pour créer les 24 transformateurs avec leur structure de base
 Usage: Dans Blender, Scripting workspace > New > Coller ce script > Run
 """
 
+import os
+import sys
+
 import bpy
 
+# Bibliothèque de géométrie du dossier (mesh_primitives.py)
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from mesh_primitives import add_object, box_mesh, cylinder_mesh
+
+
 def create_transformer(pb_num, tr_num, position):
     """
     Crée un transformateur avec sa structure de base
@@ -26,105 +37,71 @@ def create_transformer(pb_num, tr_num, position):
     
     # Créer le groupe transformateur
     tr_name = f"PB{pb_num}_Transformer_{tr_num:02d}"
-    tr_group = bpy.data.objects.new(tr_name, None)
+    tr_group = add_object(tr_name, None, location=position, parent=pb_group)
     tr_group.empty_display_type = 'PLAIN_AXES'
-    tr_group.location = position
-    tr_group.parent = pb_group
-    bpy.context.collection.objects.link(tr_group)
     
     # Socle en béton (4.5m x 3.5m x 0.5m)
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=(position[0], position[1], position[2] - 1.75)
-    )
-    base = bpy.context.active_object
-    base.name = f"{tr_name}_Base"
-    base.scale = (4.5, 0.5, 3.5)
-    base.parent = tr_group
-    
     mat_base = bpy.data.materials.new(name=f"{tr_name}_Base_Material")
     mat_base.use_nodes = True
     bsdf = mat_base.node_tree.nodes["Principled BSDF"]
     bsdf.inputs["Base Color"].default_value = (0.6, 0.6, 0.65, 1.0)  # Béton
     bsdf.inputs["Metallic"].default_value = 0.0
     bsdf.inputs["Roughness"].default_value = 0.7
-    base.data.materials.append(mat_base)
+    base_name = f"{tr_name}_Base"
+    add_object(base_name, box_mesh(base_name, (4.5, 0.5, 3.5), material=mat_base),
+               location=(position[0], position[1], position[2] - 1.75), parent=tr_group)
     
     # Cuve principale (4m x 3m x 5m)
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=position
-    )
-    tank = bpy.context.active_object
-    tank.name = f"{tr_name}_Tank"
-    tank.scale = (4, 3, 5)
-    tank.parent = tr_group
-    
     mat_tank = bpy.data.materials.new(name=f"{tr_name}_Tank_Material")
     mat_tank.use_nodes = True
     bsdf = mat_tank.node_tree.nodes["Principled BSDF"]
     bsdf.inputs["Base Color"].default_value = (0.02, 0.59, 0.41, 1.0)  # Vert industriel
     bsdf.inputs["Metallic"].default_value = 0.2
     bsdf.inputs["Roughness"].default_value = 0.5
-    tank.data.materials.append(mat_tank)
+    tank_name = f"{tr_name}_Tank"
+    add_object(tank_name, box_mesh(tank_name, (4, 3, 5), material=mat_tank),
+               location=position, parent=tr_group)
     
     # Radiateurs verticaux (6 radiateurs de 0.3m de large)
     for i in range(6):
-        bpy.ops.mesh.primitive_cube_add(
-            size=1,
-            location=(position[0] + 1.5 + i * 0.3, position[1], position[2] + 2.6)
-        )
-        radiator = bpy.context.active_object
-        radiator.name = f"{tr_name}_Radiator_{i+1}"
-        radiator.scale = (0.3, 2.5, 0.1)
-        radiator.parent = tr_group
-        
         mat_rad = bpy.data.materials.new(name=f"{tr_name}_Radiator_Material")
         mat_rad.use_nodes = True
         bsdf = mat_rad.node_tree.nodes["Principled BSDF"]
         bsdf.inputs["Base Color"].default_value = (0.42, 0.45, 0.50, 1.0)  # Métal gris
         bsdf.inputs["Metallic"].default_value = 0.7
         bsdf.inputs["Roughness"].default_value = 0.4
-        radiator.data.materials.append(mat_rad)
+        
+        radiator_name = f"{tr_name}_Radiator_{i+1}"
+        add_object(radiator_name, box_mesh(radiator_name, (0.3, 2.5, 0.1), material=mat_rad),
+                   location=(position[0] + 1.5 + i * 0.3, position[1], position[2] + 2.6), parent=tr_group)
     
     # Bushings HT (3 en haut)
     for i in range(3):
-        bpy.ops.mesh.primitive_cylinder_add(
-            radius=0.15,
-            depth=0.4,
-            location=(position[0] - 1.5 + i * 1.5, position[1] + 1.8, position[2])
-        )
-        bushing = bpy.context.active_object
-        bushing.name = f"{tr_name}_Bushing_HT_{i+1}"
-        bushing.rotation_euler = (1.5708, 0, 0)  # Rotation 90° sur X
-        bushing.parent = tr_group
-        
         mat_bushing = bpy.data.materials.new(name=f"{tr_name}_Bushing_Material")
         mat_bushing.use_nodes = True
         bsdf = mat_bushing.node_tree.nodes["Principled BSDF"]
         bsdf.inputs["Base Color"].default_value = (1.0, 1.0, 1.0, 1.0)  # Porcelaine blanche
         bsdf.inputs["Metallic"].default_value = 0.0
         bsdf.inputs["Roughness"].default_value = 0.2
-        bushing.data.materials.append(mat_bushing)
+        
+        bushing_name = f"{tr_name}_Bushing_HT_{i+1}"
+        add_object(bushing_name, cylinder_mesh(bushing_name, 0.15, 0.4, material=mat_bushing),
+                   location=(position[0] - 1.5 + i * 1.5, position[1] + 1.8, position[2]),
+                   rotation=(1.5708, 0, 0),  # Rotation 90° sur X
+                   parent=tr_group)
     
     # Bushings BT (3 sur le côté)
     for i in range(3):
-        bpy.ops.mesh.primitive_cylinder_add(
-            radius=0.12,
-            depth=0.3,
-            location=(position[0] + 2.2, position[1] - 1 + i * 1, position[2])
-        )
-        bushing = bpy.context.active_object
-        bushing.name = f"{tr_name}_Bushing_BT_{i+1}"
-        bushing.parent = tr_group
-        
         mat_bushing = bpy.data.materials.new(name=f"{tr_name}_Bushing_BT_Material")
         mat_bushing.use_nodes = True
         bsdf = mat_bushing.node_tree.nodes["Principled BSDF"]
         bsdf.inputs["Base Color"].default_value = (1.0, 1.0, 1.0, 1.0)
         bsdf.inputs["Metallic"].default_value = 0.0
         bsdf.inputs["Roughness"].default_value = 0.2
-        bushing.data.materials.append(mat_bushing)
+        
+        bushing_name = f"{tr_name}_Bushing_BT_{i+1}"
+        add_object(bushing_name, cylinder_mesh(bushing_name, 0.12, 0.3, material=mat_bushing),
+                   location=(position[0] + 2.2, position[1] - 1 + i * 1, position[2]), parent=tr_group)
     
     return tr_group
 
@@ -1,16 +1,48 @@
 """
 Script Blender pour exporter automatiquement tous les modèles en GLB
 Usage: Exécutez ce script dans Blender pour exporter tous les modèles automatiquement
+
+Chaque modèle maillage est aussi exporté en niveaux de détail (lod_export.py):
+{nom}_lod1.glb, {nom}_lod2.glb (décimés selon LOD_RATIOS) et un imposteur
+boîte en dernier niveau. lod_manifest.json liste fichiers et triangles par niveau.
+
+Mode lot (un modèle par processus, voir batch_export_models.py):
+    blender -b substation_200MW.blend -P export_all_models_to_glb.py -- \
+        --model Transformer --output public/models --result transformer.json
+Le résultat du modèle est écrit dans --result; le manifeste LOD est alors
+assemblé par le pilote.
 """
 
+import argparse
 import bpy
+import json
 import os
+import sys
+import time
 from pathlib import Path
 
+# Bibliothèque du dossier (lod_export.py)
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from build_cache import EXPORT_SCRIPT, fresh_record, model_export_step, save_record
+from export_profiles import DEFAULT_PROFILE, PROFILES, file_report
+from lod_export import base_level, export_lods, export_selected, write_manifest
+
 # Configuration
 EXPORT_PATH = Path.home() / "Desktop" / "Hearst Qatar" / "public" / "models"
 EXPORT_PATH.mkdir(parents=True, exist_ok=True)
 
+# Niveaux de détail: ratios de décimation (LOD1, LOD2...), puis imposteur boîte.
+# Surcharge par modèle avec la clé "lod_ratios" ([] = pas de LOD décimé).
+LOD_RATIOS = (0.5, 0.2)
+LOD_IMPOSTOR = True
+LOD_MANIFEST = EXPORT_PATH / "lod_manifest.json"
+
+# Profil de compression (export_profiles.py: web-fast, web-balanced, web-small, archival)
+EXPORT_PROFILE = DEFAULT_PROFILE
+
 # Liste des objets à exporter avec leurs noms de fichiers
 MODELS_TO_EXPORT = [
     {
@@ -40,12 +72,19 @@ MODELS_TO_EXPORT = [
     },
 ]
 
-def export_model(object_name, filename, scale=None):
-    """Exporte un objet en GLB"""
+def export_model(object_name, filename, scale=None, lod_ratios=LOD_RATIOS, export_dir=EXPORT_PATH,
+                 profile=EXPORT_PROFILE):
+    """
+    Exporte un objet en GLB, puis ses niveaux de détail (profil de compression profile)
+
+    Returns:
+        (rapport du GLB {bytes, compression, decode_ms}, niveaux pour le manifeste LOD),
+        None si l'objet est absent
+    """
     # Sélectionner l'objet
     if object_name not in bpy.data.objects:
         print(f"⚠️  Objet '{object_name}' non trouvé dans la scène")
-        return False
+        return None
     
     obj = bpy.data.objects[object_name]
     
@@ -66,53 +105,151 @@ def export_model(object_name, filename, scale=None):
     obj.location = (0, 0, 0)
     
     # Chemin d'export
-    export_file = EXPORT_PATH / filename
+    export_file = Path(export_dir) / filename
     
     # Exporter en GLB
-    bpy.ops.export_scene.gltf(
-        filepath=str(export_file),
-        export_format='GLB',
-        export_selected=True,
-        export_yup=True,
-        export_apply=True,
-        export_materials='EXPORT',
-        export_colors=True,
-        export_cameras=False,
-        export_lights=False,
-    )
+    method = export_selected(obj, export_file, profile)
+    report = file_report(export_file, method)
     
     print(f"✅ Exporté : {filename} -> {export_file}")
-    return True
+
+    # Niveaux de détail (maillages uniquement: un groupe Empty n'a pas de géométrie propre)
+    if obj.type != 'MESH':
+        print(f"⚠️  '{object_name}' n'est pas un maillage: pas de LOD")
+        return report, []
+    levels = [base_level(obj, export_file, method)]
+    levels += export_lods(obj, export_dir, Path(filename).stem, lod_ratios, LOD_IMPOSTOR, profile)
+    for level in levels:
+        print(f"   LOD{level['level']}: {level['triangles']} triangles, {level['bytes'] / 1024:.1f} Ko, "
+              f"décodage ~{level['decode_ms']} ms ({level['file']})")
+    return report, levels
+
+def export_one(model, export_dir=EXPORT_PATH, use_cache=True, profile=EXPORT_PROFILE):
+    """
+    Exporte un modèle de MODELS_TO_EXPORT et renvoie son résultat:
+    {object_name, filename, ok, seconds, profile, bytes, compression, decode_ms,
+     levels, error, cached}
+
+    Cache (build_cache.py): l'export est ignoré si le .blend sauvegardé, le
+    modèle, le dossier d'export et les sources n'ont pas changé et que les
+    GLB produits sont intacts. use_cache=False pour une scène non sauvegardée
+    ou modifiée depuis son chargement (voir main).
+    """
+    start = time.perf_counter()
+    key, params = model_export_step(model, export_dir, profile)
+    blend = bpy.data.filepath
+    if use_cache:
+        record = fresh_record(key, [EXPORT_SCRIPT], params, [blend])
+        if record is not None:
+            print(f"⏭️  À jour (cache {record['built']}) : {model['filename']}")
+            return {**record["result"], "cached": True, "seconds": round(time.perf_counter() - start, 3)}
+
+    result = {"object_name": model["object_name"], "filename": model["filename"], "ok": False,
+              "cached": False, "profile": profile}
+    try:
+        exported = export_model(
+            model["object_name"],
+            model["filename"],
+            model.get("scale"),
+            model.get("lod_ratios", LOD_RATIOS),
+            export_dir,
+            profile
+        )
+        if exported is None:
+            result["error"] = "objet non trouvé dans la scène"
+        else:
+            report, levels = exported
+            result["ok"] = True
+            result.update(report)
+            result["levels"] = levels
+    except Exception as exc:
+        print(f"❌ Erreur : {exc}")
+        result["error"] = str(exc)
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    if result["ok"] and use_cache:
+        outputs = [Path(export_dir) / model["filename"]]
+        outputs += [Path(export_dir) / level["file"] for level in result["levels"] if level["level"] > 0]
+        save_record(key, [EXPORT_SCRIPT], params, [blend], outputs, result=result)
+    return result
+
+def print_size_report(results):
+    """Taille compressée et décodage estimé par fichier (modèle et niveaux LOD)"""
+    rows = []
+    for result in results:
+        if not result["ok"]:
+            continue
+        levels = result.get("levels") or [{"file": result["filename"], **result}]
+        rows += [(level["file"], level["bytes"], level["compression"], level["decode_ms"]) for level in levels]
+    if not rows:
+        return
+    print(f"{'Fichier':<32} {'Taille':>10} {'Compression':>12} {'Décodage ~':>11}")
+    for name, size, method, decode in rows:
+        print(f"{name:<32} {size / 1024:>8.1f} Ko {method:>12} {decode:>8.1f} ms")
+    print(f"{'Total':<32} {sum(r[1] for r in rows) / 1024:>8.1f} Ko {'':>12} {sum(r[3] for r in rows):>8.1f} ms\n")
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Export GLB des modèles de la scène")
+    parser.add_argument("--model", action="append", default=None,
+                        help="object_name à exporter (répétable, défaut: tous)")
+    parser.add_argument("--output", type=Path, default=EXPORT_PATH, help="Dossier d'export")
+    parser.add_argument("--result", type=Path, default=None,
+                        help="Résultats JSON (mode lot: pas d'écriture du manifeste LOD)")
+    parser.add_argument("--force", action="store_true", help="Ignore le cache de construction")
+    parser.add_argument("--profile", choices=list(PROFILES), default=EXPORT_PROFILE,
+                        help="Profil de compression (export_profiles.py)")
+    return parser.parse_args(argv)
 
 def main():
     """Fonction principale"""
+    # Arguments du script: après "--" sur la ligne de commande de Blender
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    args = parse_args(argv)
+    models = MODELS_TO_EXPORT
+    if args.model:
+        models = [m for m in MODELS_TO_EXPORT if m["object_name"] in args.model]
+        unknown = sorted(set(args.model) - {m["object_name"] for m in models})
+        if unknown:
+            print(f"ERREUR: modèle(s) absent(s) de MODELS_TO_EXPORT: {', '.join(unknown)}")
+            return 1
+    args.output.mkdir(parents=True, exist_ok=True)
+    # Cache seulement si la scène correspond au .blend sauvegardé (vérifié avant
+    # le premier export: export_model applique les échelles dans la scène)
+    use_cache = not args.force and bool(bpy.data.filepath) and not bpy.data.is_dirty
+
     print("🚀 Début de l'export automatique des modèles...")
-    print(f"📁 Destination : {EXPORT_PATH}\n")
+    print(f"📁 Destination : {args.output}")
+    print(f"🗜️  Profil : {args.profile} ({PROFILES[args.profile]['description']})\n")
     
-    exported = 0
-    failed = 0
+    results = []
+    manifest = {}
     
-    for model in MODELS_TO_EXPORT:
+    for model in models:
         print(f"📦 Export de {model['object_name']}...")
-        if export_model(
-            model["object_name"],
-            model["filename"],
-            model.get("scale")
-        ):
-            exported += 1
-        else:
-            failed += 1
+        result = export_one(model, args.output, use_cache, args.profile)
+        results.append(result)
+        if result["ok"] and result["levels"]:
+            manifest[Path(model["filename"]).stem] = {"object": model["object_name"], "levels": result["levels"]}
         print()
+    exported = sum(1 for r in results if r["ok"])
+    failed = len(results) - exported
+    
+    if args.result:
+        args.result.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+    elif manifest:
+        manifest_path = args.output / LOD_MANIFEST.name
+        write_manifest(manifest_path, manifest)
+        print(f"📁 Manifeste LOD : {manifest_path}\n")
     
+    print_size_report(results)
     print("=" * 50)
-    print(f"✅ Exportés avec succès : {exported}/{len(MODELS_TO_EXPORT)}")
+    print(f"✅ Exportés avec succès : {exported}/{len(models)}")
     if failed > 0:
         print(f"❌ Échecs : {failed}")
     print("=" * 50)
     
-    if exported == len(MODELS_TO_EXPORT):
+    if exported == len(models):
         print("\n🎉 Tous les modèles ont été exportés avec succès !")
-        print(f"📁 Fichiers dans : {EXPORT_PATH}")
+        print(f"📁 Fichiers dans : {args.output}")
         print("\n💡 Prochaines étapes :")
         print("   1. Vérifiez les fichiers dans /public/models/")
         print("   2. Lancez : npm run dev")
@@ -121,6 +258,10 @@ def main():
         print("\n⚠️  Certains modèles n'ont pas pu être exportés")
         print("   Vérifiez que les objets existent dans votre scène Blender")
         print("   et que leurs noms correspondent à ceux dans le script")
+    return 1 if failed else 0
 
 if __name__ == "__main__":
-    main()
+    status = main()
+    # Code de sortie en mode -b uniquement (sys.exit fermerait l'interface)
+    if bpy.app.background:
+        sys.exit(status)
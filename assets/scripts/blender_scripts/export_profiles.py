@@ -0,0 +1,139 @@
+"""
+Profils de compression pour l'export GLB
+=========================================
+
+Un profil fixe la compression des maillages et la quantification des
+attributs, pour arbitrer entre taille de téléchargement et temps de
+décodage côté client:
+
+- web-fast: meshopt (EXT_meshopt_compression) + quantification
+  (KHR_mesh_quantization), décodage quasi instantané; export Blender non
+  compressé puis gltfpack (l'exporteur Blender n'écrit pas meshopt)
+- web-balanced: Draco niveau 6 (ancien réglage de export_glb), profil par défaut
+- web-small: Draco niveau 10, quantification réduite, fichiers les plus petits
+- archival: aucune compression ni quantification
+
+Les estimations de décodage (decode_ms) sont des ordres de grandeur pour un
+mobile milieu de gamme (DECODE_MB_PER_S), pas des mesures.
+
+Sans dépendance à Blender: utilisable par le pilote batch_export_models.py.
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+DEFAULT_PROFILE = "web-balanced"
+
+# Bits de quantification par attribut: position, normal, texcoord, color
+PROFILES = {
+    "web-fast": {
+        "description": "meshopt + quantification, décodage le plus rapide",
+        "method": "meshopt",
+        "quantization": {"position": 14, "normal": 8, "texcoord": 12, "color": 8},
+    },
+    "web-balanced": {
+        "description": "Draco niveau 6, quantification par défaut de Blender",
+        "method": "draco",
+        "draco_level": 6,
+        "quantization": {"position": 14, "normal": 10, "texcoord": 12, "color": 10},
+    },
+    "web-small": {
+        "description": "Draco niveau 10, quantification réduite, taille minimale",
+        "method": "draco",
+        "draco_level": 10,
+        "quantization": {"position": 11, "normal": 8, "texcoord": 10, "color": 8},
+    },
+    "archival": {
+        "description": "sans compression ni quantification",
+        "method": "none",
+    },
+}
+
+# Débit de décodage estimé (Mo compressés par seconde, mobile milieu de gamme)
+DECODE_MB_PER_S = {
+    "draco": 20,
+    "meshopt": 400,
+    "none": 1000,
+}
+
+# Exécutable gltfpack (meshoptimizer) pour le profil meshopt
+GLTFPACK = os.environ.get("GLTFPACK", "gltfpack")
+
+
+def get_profile(name):
+    """Profil par nom (ValueError si inconnu)"""
+    if name not in PROFILES:
+        raise ValueError(f"profil d'export inconnu: {name} (profils: {', '.join(PROFILES)})")
+    return PROFILES[name]
+
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+def gltf_options(name):
+    """Paramètres de bpy.ops.export_scene.gltf pour le profil"""
+    profile = get_profile(name)
+    if profile["method"] != "draco":
+        return {"export_draco_mesh_compression_enable": False}
+    bits = profile["quantization"]
+    return {
+        "export_draco_mesh_compression_enable": True,
+        "export_draco_mesh_compression_level": profile["draco_level"],
+        "export_draco_position_quantization": bits["position"],
+        "export_draco_normal_quantization": bits["normal"],
+        "export_draco_texcoord_quantization": bits["texcoord"],
+        "export_draco_color_quantization": bits["color"],
+    }
+
+
+def gltfpack_command(name, source, target):
+    """Commande gltfpack (meshopt + quantification) pour le profil"""
+    bits = get_profile(name)["quantization"]
+    return [
+        GLTFPACK, "-i", str(source), "-o", str(target), "-c", "-kn", "-km",
+        "-vp", str(bits["position"]), "-vn", str(bits["normal"]),
+        "-vt", str(bits["texcoord"]), "-vc", str(bits["color"]),
+    ]
+
+
+def postprocess(name, path):
+    """
+    Passe de compression après l'export Blender (profil meshopt: gltfpack).
+
+    Returns:
+        Méthode effectivement appliquée au fichier ("none" si gltfpack est absent)
+    """
+    method = get_profile(name)["method"]
+    if method != "meshopt":
+        return method
+    if shutil.which(GLTFPACK) is None:
+        print(f"⚠️  gltfpack introuvable: {Path(path).name} reste non compressé")
+        return "none"
+    path = Path(path)
+    with tempfile.TemporaryDirectory(prefix="gltfpack_") as work_dir:
+        target = Path(work_dir) / path.name
+        process = subprocess.run(gltfpack_command(name, path, target), capture_output=True, text=True)
+        if process.returncode != 0:
+            print(f"⚠️  gltfpack a échoué ({process.stderr.strip()}): {path.name} reste non compressé")
+            return "none"
+        shutil.move(str(target), str(path))
+    return method
+
+
+# ============================================================================
+# RAPPORT
+# ============================================================================
+
+def decode_ms(size, method):
+    """Temps de décodage estimé (ms) d'un fichier de size octets"""
+    return round(size / 1e6 / DECODE_MB_PER_S[method] * 1000, 1)
+
+
+def file_report(path, method):
+    """Taille et décodage estimé d'un fichier exporté"""
+    size = Path(path).stat().st_size
+    return {"bytes": size, "compression": method, "decode_ms": decode_ms(size, method)}
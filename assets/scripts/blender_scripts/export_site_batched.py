@@ -0,0 +1,388 @@
+"""
+Script Blender - Export d'un site en lots statiques fusionnés
+=============================================================
+
+Fusionne toute la géométrie statique d'un site (scène de generate_site.py
+ou substation_200MW.blend) en quelques grands maillages: un par matériau
+et par tuile (grille de TILE_SIZE mètres au sol). Le viewer dessine alors
+le site en autant d'appels que de lots, au lieu d'un appel par container,
+transformateur ou switchgear.
+
+Chaque sommet porte l'indice de son élément dans l'attribut _ELEMENT_ID
+(exporté en attribut glTF _ELEMENT_ID): le picking lit l'indice au point
+touché et le résout dans le JSON écrit à côté du GLB
+(elements[indice] -> id, kind, phase).
+
+La fusion travaille par tableaux NumPy: pour chaque maillage source (les
+duplicatas liés partagent le même), les sommets de chaque matériau sont
+extraits une fois puis transformés par toutes les matrices des objets qui
+l'utilisent, sans accès Python par sommet.
+
+Les cartes UV, les attributs de couleur (dont "Col" de vertex_paint.py,
+convertis au domaine CORNER) et le lissage des faces sont recopiés dans les
+lots ; un lot dont seuls certains maillages portent un attribut le
+complète (UV nulles, couleur blanche). Les normales personnalisées et les
+autres attributs ne sont pas conservés: un avertissement liste, par
+maillage, ce qui est perdu.
+
+Usage (headless):
+    blender -b site_600mw.blend -P export_site_batched.py -- --output public/models/site_batched.glb
+    blender -b site_600mw.blend -P export_site_batched.py -- --tile-size 100 --profile web-small
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from pathlib import Path
+
+import bpy
+import numpy as np
+
+# Bibliothèque du dossier (lod_export.py, export_profiles.py)
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from export_profiles import DEFAULT_PROFILE, PROFILES, file_report
+from lod_export import export_selected
+
+# Côté des tuiles de regroupement (m)
+TILE_SIZE = 250
+
+# Attribut d'élément par sommet (préfixe _ obligatoire pour un attribut glTF personnalisé)
+ELEMENT_ATTRIBUTE = "_ELEMENT_ID"
+
+# Préfixe des objets de lot créés par l'export (supprimés après export)
+BATCH_PREFIX = "Batch"
+
+# Attributs intégrés reconstruits par la fusion (les noms en "." sont internes)
+BUILTIN_ATTRIBUTES = {"position", "material_index", "sharp_face"}
+
+# Valeur d'un attribut par boucle absent d'un maillage du lot
+MISSING_VALUES = {"uv": (0.0, 0.0), "color": (1.0, 1.0, 1.0, 1.0)}
+
+
+# ============================================================================
+# ÉLÉMENTS
+# ============================================================================
+
+def site_objects():
+    """Objets maillage de la scène (visibles au rendu), hors lots d'un export précédent"""
+    return [obj for obj in bpy.context.scene.objects
+            if obj.type == 'MESH' and not obj.hide_render and not obj.name.startswith(BATCH_PREFIX)]
+
+
+def element_info(obj):
+    """Élément d'un objet: propriétés de generate_site.py, sinon nom de l'objet"""
+    return {
+        "id": obj.get("element_id", obj.name),
+        "kind": obj.get("kind", obj.data.name),
+        "phase": int(obj.get("phase", 1)),
+    }
+
+
+def tile_of(location, tile_size):
+    """Nom "ix_iy" de la tuile d'une position au sol"""
+    return f"{math.floor(location[0] / tile_size)}_{math.floor(location[1] / tile_size)}"
+
+
+def grid_tiles(tile_size=TILE_SIZE):
+    """Partition en grille: fonction (objet, élément) -> tuile"""
+    return lambda obj, info: tile_of(obj.matrix_world.translation, tile_size)
+
+
+# ============================================================================
+# LECTURE DES MAILLAGES SOURCES
+# ============================================================================
+
+def _read(collection, attribute, dtype, components=1):
+    """foreach_get d'un attribut de toute une collection"""
+    values = np.empty(len(collection) * components, dtype=dtype)
+    collection.foreach_get(attribute, values)
+    return values.reshape(-1, components) if components > 1 else values
+
+
+def corner_attributes(mesh, loop_vertices):
+    """
+    Attributs par boucle conservés dans les lots: cartes UV et attributs de
+    couleur (domaine POINT ramené aux boucles par leur sommet).
+
+    Returns:
+        {(genre "uv"/"color", nom): (type de donnée, valeurs (boucles, composantes))}
+    """
+    attributes = {}
+    for layer in mesh.uv_layers:
+        attributes[("uv", layer.name)] = ("FLOAT2", _read(layer.data, "uv", np.float32, 2))
+    for attribute in mesh.color_attributes:
+        values = _read(attribute.data, "color", np.float32, 4)
+        if attribute.domain == 'POINT':
+            values = values[loop_vertices]
+        attributes[("color", attribute.name)] = (attribute.data_type, values)
+    return attributes
+
+
+def dropped_attributes(mesh):
+    """Données d'un maillage que la fusion ne conserve pas (normales personnalisées, autres attributs)"""
+    kept = {layer.name for layer in mesh.uv_layers} | {attribute.name for attribute in mesh.color_attributes}
+    dropped = sorted(attribute.name for attribute in mesh.attributes
+                     if not attribute.name.startswith(".") and attribute.name not in BUILTIN_ATTRIBUTES
+                     and attribute.name not in kept)
+    if mesh.has_custom_normals:
+        dropped.append("normales personnalisées")
+    return dropped
+
+
+def material_parts(mesh):
+    """
+    Découpe un maillage par indice de matériau.
+
+    Returns:
+        Liste de (matériau, sommets (n, 3), boucles -> sommet local, nombre de boucles par polygone,
+        lissage par polygone, attributs par boucle {clé: (type, valeurs)} voir corner_attributes)
+    """
+    co = _read(mesh.vertices, "co", np.float32, 3)
+    loop_vertices = _read(mesh.loops, "vertex_index", np.int32)
+    loop_totals = _read(mesh.polygons, "loop_total", np.int32)
+    material_indices = _read(mesh.polygons, "material_index", np.int32)
+    smooth = _read(mesh.polygons, "use_smooth", bool)
+    loop_materials = np.repeat(material_indices, loop_totals)
+    corners = corner_attributes(mesh, loop_vertices)
+
+    parts = []
+    for index in np.unique(material_indices):
+        material = mesh.materials[index] if index < len(mesh.materials) else None
+        loop_mask = loop_materials == index
+        polygon_mask = material_indices == index
+        used, local_loops = np.unique(loop_vertices[loop_mask], return_inverse=True)
+        attributes = {key: (data_type, values[loop_mask]) for key, (data_type, values) in corners.items()}
+        parts.append((material, co[used], local_loops.astype(np.int32), loop_totals[polygon_mask],
+                      smooth[polygon_mask], attributes))
+    return parts
+
+
+def transform(co, matrices):
+    """Sommets (n, 3) transformés par k matrices monde (k, 4, 4): tableau (k * n, 3)"""
+    rotated = np.einsum("kij,nj->kni", matrices[:, :3, :3], co)
+    return (rotated + matrices[:, None, :3, 3]).reshape(-1, 3)
+
+
+# ============================================================================
+# FUSION
+# ============================================================================
+
+def collect_batches(objects, tile_key, first_index=0):
+    """
+    Regroupe la géométrie des objets par (tuile, matériau).
+
+    Args:
+        tile_key: Fonction (objet, élément) -> nom de tuile (ex. grid_tiles())
+        first_index: Indice du premier élément (lots construits par morceaux)
+
+    Returns:
+        (lots {(tuile, nom du matériau): {material, chunks}}, éléments [{id, kind, phase, tile}])
+    """
+    elements = []
+    by_mesh = {}
+    for obj in objects:
+        info = element_info(obj)
+        info["tile"] = tile_key(obj, info)
+        elements.append(info)
+        by_mesh.setdefault(obj.data.name, (obj.data, []))[1].append((len(elements) - 1, obj))
+
+    batches = {}
+    for mesh, users in by_mesh.values():
+        dropped = dropped_attributes(mesh)
+        if dropped:
+            print(f"   ⚠️ {mesh.name}: non conservé dans les lots: {', '.join(dropped)}")
+        parts = material_parts(mesh)
+        # Objets du maillage regroupés par tuile
+        by_tile = {}
+        for element_index, obj in users:
+            by_tile.setdefault(elements[element_index]["tile"], []).append(
+                (element_index, np.array(obj.matrix_world, dtype=np.float64)))
+        for tile, instances in by_tile.items():
+            ids = np.array([first_index + index for index, _ in instances], dtype=np.int32)
+            matrices = np.stack([matrix for _, matrix in instances])
+            for material, co, local_loops, loop_totals, smooth, attributes in parts:
+                key = (tile, material.name if material else "")
+                batch = batches.setdefault(key, {"material": material, "chunks": []})
+                batch["chunks"].append((transform(co, matrices), len(co), local_loops, loop_totals, smooth,
+                                        attributes, ids))
+    return batches, elements
+
+
+def merge_chunks(chunks):
+    """
+    Concatène les morceaux d'un lot: sommets, boucles, polygones, lissage,
+    élément par sommet et attributs par boucle (union des attributs des
+    morceaux, valeurs MISSING_VALUES là où un morceau ne l'a pas)
+    """
+    co, loops, totals, smooth, element_ids = [], [], [], [], []
+    types = {}
+    for chunk in chunks:
+        for key, (data_type, _) in chunk[5].items():
+            types.setdefault(key, data_type)
+    corners = {key: [] for key in types}
+    offset = 0
+    for world_co, vertex_count, local_loops, loop_totals, chunk_smooth, attributes, ids in chunks:
+        instances = len(ids)
+        co.append(world_co)
+        loops.append((local_loops[None, :] + (offset + np.arange(instances) * vertex_count)[:, None]).ravel())
+        totals.append(np.tile(loop_totals, instances))
+        smooth.append(np.tile(chunk_smooth, instances))
+        element_ids.append(np.repeat(ids, vertex_count))
+        for key, values in corners.items():
+            if key in attributes:
+                values.append(np.tile(attributes[key][1], (instances, 1)))
+            else:
+                values.append(np.tile(np.array(MISSING_VALUES[key[0]], dtype=np.float32),
+                                      (instances * len(local_loops), 1)))
+        offset += instances * vertex_count
+    corner_data = {key: (types[key], np.concatenate(values)) for key, values in corners.items()}
+    return (np.concatenate(co).astype(np.float32), np.concatenate(loops).astype(np.int32),
+            np.concatenate(totals).astype(np.int32), np.concatenate(smooth), np.concatenate(element_ids),
+            corner_data)
+
+
+def build_batch_mesh(name, co, loop_vertices, loop_totals, smooth, element_ids, corners, material):
+    """Maillage d'un lot par écritures foreach_set (pas de from_pydata sur des listes Python)"""
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(co))
+    mesh.loops.add(len(loop_vertices))
+    mesh.polygons.add(len(loop_totals))
+    mesh.vertices.foreach_set("co", co.ravel())
+    mesh.loops.foreach_set("vertex_index", loop_vertices)
+    loop_starts = np.zeros(len(loop_totals), dtype=np.int32)
+    np.cumsum(loop_totals[:-1], out=loop_starts[1:])
+    mesh.polygons.foreach_set("loop_start", loop_starts)
+    if bpy.app.version < (4, 0, 0):
+        # loop_total est calculé à partir de loop_start depuis Blender 4.0
+        mesh.polygons.foreach_set("loop_total", loop_totals)
+    mesh.polygons.foreach_set("use_smooth", smooth)
+    mesh.update(calc_edges=True)
+    attribute = mesh.attributes.new(ELEMENT_ATTRIBUTE, 'FLOAT', 'POINT')
+    attribute.data.foreach_set("value", element_ids.astype(np.float32))
+    for (kind, attribute_name), (data_type, values) in corners.items():
+        if kind == "uv":
+            mesh.uv_layers.new(name=attribute_name).data.foreach_set("uv", values.ravel())
+        else:
+            color = mesh.color_attributes.new(name=attribute_name, type=data_type, domain='CORNER')
+            color.data.foreach_set("color", values.ravel())
+            if mesh.color_attributes.active_color is None:
+                mesh.color_attributes.active_color = color
+    if material is not None:
+        mesh.materials.append(material)
+    return mesh
+
+
+def build_batches(objects, tile_key=None, first_index=0):
+    """
+    Crée les objets de lot (un par tuile et matériau) dans la collection
+    de la scène.
+
+    Args:
+        tile_key: Partition des objets (défaut: grille de TILE_SIZE m)
+        first_index: Indice du premier élément dans _ELEMENT_ID
+
+    Returns:
+        (objets de lot, éléments, description des lots avec boîte englobante)
+    """
+    batches, elements = collect_batches(objects, tile_key or grid_tiles(), first_index)
+    batch_objects, summary = [], []
+    for (tile, material_name), batch in sorted(batches.items()):
+        co, loops, totals, smooth, element_ids, corners = merge_chunks(batch["chunks"])
+        name = f"{BATCH_PREFIX}_{tile}_{material_name or 'NoMaterial'}"
+        mesh = build_batch_mesh(name, co, loops, totals, smooth, element_ids, corners, batch["material"])
+        obj = bpy.data.objects.new(name, mesh)
+        bpy.context.scene.collection.objects.link(obj)
+        obj["tile"] = tile
+        batch_objects.append(obj)
+        summary.append({
+            "name": name,
+            "tile": tile,
+            "material": material_name,
+            "vertices": len(co),
+            "triangles": int((totals - 2).sum()),
+            "elements": int(len(np.unique(element_ids))),
+            "bbox": {"min": co.min(axis=0).tolist(), "max": co.max(axis=0).tolist()},
+        })
+    return batch_objects, elements, summary
+
+
+def remove_batches(batch_objects):
+    """Supprime les objets et maillages de lot (la scène source reste intacte)"""
+    for obj in batch_objects:
+        mesh = obj.data
+        bpy.data.objects.remove(obj)
+        bpy.data.meshes.remove(mesh)
+
+
+# ============================================================================
+# SCRIPT PRINCIPAL
+# ============================================================================
+
+def parse_args(argv):
+    """Arguments du script (après "--" sur la ligne de commande de Blender)"""
+    parser = argparse.ArgumentParser(description="Export d'un site en lots fusionnés par matériau et par tuile")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Fichier GLB (défaut: <fichier .blend>_batched.glb à côté du .blend)")
+    parser.add_argument("--tile-size", type=float, default=TILE_SIZE, help="Côté des tuiles (m)")
+    parser.add_argument("--profile", choices=list(PROFILES), default=DEFAULT_PROFILE,
+                        help="Profil de compression (export_profiles.py)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Fonction principale"""
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    args = parse_args(argv)
+    if args.output is None:
+        if not bpy.data.filepath:
+            print("ERREUR: scène non sauvegardée: préciser --output")
+            return 1
+        args.output = Path(bpy.data.filepath).with_name(f"{Path(bpy.data.filepath).stem}_batched.glb")
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+
+    objects = site_objects()
+    if not objects:
+        print("ERREUR: aucun objet maillage dans la scène")
+        return 1
+
+    start = time.perf_counter()
+    batch_objects, elements, summary = build_batches(objects, grid_tiles(args.tile_size))
+    merge_time = time.perf_counter() - start
+    try:
+        method = export_selected(batch_objects, args.output, args.profile, export_attributes=True)
+    finally:
+        remove_batches(batch_objects)
+
+    index = {
+        "file": args.output.name,
+        "tile_size": args.tile_size,
+        "attribute": ELEMENT_ATTRIBUTE,
+        **file_report(args.output, method),
+        "batches": summary,
+        "elements": [{"index": i, "id": e["id"], "kind": e["kind"], "phase": e["phase"],
+                      "tile": e["tile"]} for i, e in enumerate(elements)],
+    }
+    index_path = args.output.with_suffix(".json")
+    index_path.write_text(json.dumps(index, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    print("\n" + "=" * 60)
+    print(f"✅ {len(objects)} objets fusionnés en {len(summary)} lots en {merge_time:.2f} s "
+          f"({sum(b['triangles'] for b in summary)} triangles)")
+    print(f"📁 GLB: {args.output} ({index['bytes'] / 1024:.1f} Ko, décodage ~{index['decode_ms']} ms)")
+    print(f"📁 Éléments: {index_path}")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    status = main()
+    # Code de sortie en mode -b uniquement (sys.exit fermerait l'interface)
+    if bpy.app.background:
+        sys.exit(status)
@@ -0,0 +1,192 @@
+"""
+Script Blender - Export d'un site en tuiles pour le streaming
+=============================================================
+
+Découpe la scène d'un site (generate_site.py, substation_200MW.blend) en
+tuiles et exporte chaque tuile dans son propre GLB, en lots fusionnés par
+matériau (export_site_batched.py: attribut _ELEMENT_ID par sommet). Un
+index JSON (tiles.json) décrit les tuiles pour le client web:
+- fichier, boîte englobante, ids des éléments, triangles, taille et
+  décodage estimé de chaque tuile
+- table des éléments (indice _ELEMENT_ID -> id, kind, phase, tile)
+
+Le client charge l'index, puis seulement les tuiles visibles: le temps de
+chargement initial ne dépend plus de la taille du site.
+
+Découpage (--by):
+- grid: grille de --tile-size mètres au sol
+- powerblock: un Power Block par tuile (préfixe PBn des ids, voir
+  public/models/structure-data.json), éléments communs dans la tuile "shared"
+- phase: une tuile par phase de construction (layout du configurateur)
+
+Boîtes englobantes dans le repère glTF (Y vers le haut, Z = -Y Blender),
+celui du client three.js.
+
+Usage (headless):
+    blender -b site_2000mw.blend -P export_site_tiles.py -- --output public/models/tiles --tile-size 200
+    blender -b substation_200MW.blend -P export_site_tiles.py -- --by powerblock --profile web-fast
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+import bpy
+
+# Bibliothèque du dossier (export_site_batched.py, lod_export.py, export_profiles.py)
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from export_profiles import DEFAULT_PROFILE, PROFILES, file_report
+from export_site_batched import (ELEMENT_ATTRIBUTE, TILE_SIZE, build_batches, element_info, grid_tiles,
+                                 remove_batches, site_objects)
+from lod_export import export_selected
+
+INDEX_NAME = "tiles.json"
+
+# Tuile des éléments sans Power Block (substation, routes communes...)
+SHARED_TILE = "shared"
+
+# Préfixe Power Block d'un id d'élément (PB1, PB1_TR01, PB1_TR01_HD5_A)
+POWERBLOCK_PATTERN = re.compile(r"^(PB\d+)(?:_|$)")
+
+
+# ============================================================================
+# DÉCOUPAGE
+# ============================================================================
+
+def powerblock_tiles():
+    """Partition par Power Block: fonction (objet, élément) -> tuile"""
+    def tile_key(obj, info):
+        match = POWERBLOCK_PATTERN.match(str(info["id"]))
+        return match.group(1) if match else SHARED_TILE
+    return tile_key
+
+
+def phase_tiles():
+    """Partition par phase de construction: fonction (objet, élément) -> tuile"""
+    return lambda obj, info: f"phase_{info['phase']}"
+
+
+def partition(objects, tile_key):
+    """Objets regroupés par tuile {tuile: [objets]} (ordre de la scène conservé)"""
+    tiles = {}
+    for obj in objects:
+        tiles.setdefault(tile_key(obj, element_info(obj)), []).append(obj)
+    return tiles
+
+
+def gltf_bbox(summary):
+    """Boîte englobante des lots d'une tuile, convertie en repère glTF (Y haut)"""
+    low = [min(batch["bbox"]["min"][axis] for batch in summary) for axis in range(3)]
+    high = [max(batch["bbox"]["max"][axis] for batch in summary) for axis in range(3)]
+    # Blender (x, y, z) -> glTF (x, z, -y)
+    return {"min": [low[0], low[2], -high[1]], "max": [high[0], high[2], -low[1]]}
+
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+def export_tiles(objects, tile_key, output_dir, profile=DEFAULT_PROFILE):
+    """
+    Exporte une tuile à la fois (mémoire bornée par la plus grande tuile)
+
+    Returns:
+        (tuiles de l'index, éléments)
+    """
+    tiles, elements = [], []
+    for name, tile_objects in sorted(partition(objects, tile_key).items()):
+        batch_objects, tile_elements, summary = build_batches(tile_objects, lambda obj, info: name,
+                                                              first_index=len(elements))
+        filepath = Path(output_dir) / f"tile_{name}.glb"
+        try:
+            method = export_selected(batch_objects, filepath, profile, export_attributes=True)
+        finally:
+            remove_batches(batch_objects)
+        tiles.append({
+            "name": name,
+            "file": filepath.name,
+            "bbox": gltf_bbox(summary),
+            "elements": [element["id"] for element in tile_elements],
+            "element_range": [len(elements), len(elements) + len(tile_elements)],
+            "batches": len(summary),
+            "triangles": sum(batch["triangles"] for batch in summary),
+            **file_report(filepath, method),
+        })
+        elements += tile_elements
+        print(f"   🧩 {filepath.name}: {len(tile_elements)} éléments, {len(summary)} lots, "
+              f"{tiles[-1]['bytes'] / 1024:.1f} Ko")
+    return tiles, elements
+
+
+def parse_args(argv):
+    """Arguments du script (après "--" sur la ligne de commande de Blender)"""
+    parser = argparse.ArgumentParser(description="Export d'un site en tuiles GLB + index JSON")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Dossier des tuiles (défaut: <fichier .blend>_tiles à côté du .blend)")
+    parser.add_argument("--by", choices=("grid", "powerblock", "phase"), default="grid",
+                        help="Découpage des tuiles")
+    parser.add_argument("--tile-size", type=float, default=TILE_SIZE, help="Côté des tuiles en mode grid (m)")
+    parser.add_argument("--profile", choices=list(PROFILES), default=DEFAULT_PROFILE,
+                        help="Profil de compression (export_profiles.py)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Fonction principale"""
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    args = parse_args(argv)
+    if args.output is None:
+        if not bpy.data.filepath:
+            print("ERREUR: scène non sauvegardée: préciser --output")
+            return 1
+        args.output = Path(bpy.data.filepath).with_name(f"{Path(bpy.data.filepath).stem}_tiles")
+    args.output.mkdir(parents=True, exist_ok=True)
+
+    objects = site_objects()
+    if not objects:
+        print("ERREUR: aucun objet maillage dans la scène")
+        return 1
+    tile_key = {"grid": lambda: grid_tiles(args.tile_size),
+                "powerblock": powerblock_tiles,
+                "phase": phase_tiles}[args.by]()
+
+    start = time.perf_counter()
+    print(f"🚀 Export en tuiles ({args.by}) de {len(objects)} objets -> {args.output}")
+    tiles, elements = export_tiles(objects, tile_key, args.output, args.profile)
+
+    index = {
+        "tiling": args.by,
+        "tile_size": args.tile_size if args.by == "grid" else None,
+        "up_axis": "Y",
+        "attribute": ELEMENT_ATTRIBUTE,
+        "profile": args.profile,
+        "tiles": tiles,
+        "elements": [{"index": i, "id": e["id"], "kind": e["kind"], "phase": e["phase"], "tile": e["tile"]}
+                     for i, e in enumerate(elements)],
+    }
+    index_path = args.output / INDEX_NAME
+    index_path.write_text(json.dumps(index, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    total = sum(tile["bytes"] for tile in tiles)
+    largest = max(tiles, key=lambda tile: tile["bytes"])
+    print("\n" + "=" * 60)
+    print(f"✅ {len(tiles)} tuiles, {len(elements)} éléments en {time.perf_counter() - start:.2f} s")
+    print(f"   Total {total / 1024:.1f} Ko, plus grande tuile {largest['name']} ({largest['bytes'] / 1024:.1f} Ko)")
+    print(f"📁 Index: {index_path}")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    status = main()
+    # Code de sortie en mode -b uniquement (sys.exit fermerait l'interface)
+    if bpy.app.background:
+        sys.exit(status)
@@ -1,20 +1,175 @@
 """
 Script Blender pour générer automatiquement les 48 containers Bitmain ANTSPACE HD5
 Usage: Exécuter dans Blender (Scripting workspace > New > Coller le script > Run)
+
+Mode instancié (par défaut, USE_INSTANCING = True): la géométrie d'un HD5
+est construite une seule fois (maillage prototype HD5_Prototype_Mesh) avec
+un jeu de matériaux partagé, puis chaque container est un duplicata lié
+(objet qui référence ce même maillage). Le temps de génération, la taille
+du .blend et celle du GLB (maillage exporté une fois, réutilisé par tous les
+nœuds) ne dépendent plus du nombre de containers.
+
+Mode détaillé (USE_INSTANCING = False): un groupe d'objets séparés par
+container (portes, coffret, grilles... sélectionnables individuellement),
+avec les mêmes matériaux partagés.
 """
 
+import os
+import sys
+import time
+
 import bpy
-import bmesh
-from mathutils import Vector
+
+# Bibliothèque de géométrie du dossier (mesh_primitives.py)
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from mesh_primitives import MeshBuilder, add_object, get_material
 
 # Dimensions exactes du Bitmain ANTSPACE HD5 (en mètres)
 HD5_LENGTH = 12.196
 HD5_WIDTH = 2.438
 HD5_HEIGHT = 2.896
 
+# Containers en duplicatas liés d'un prototype unique (False: objets séparés)
+USE_INSTANCING = True
+
+# Nom du maillage prototype partagé par tous les containers instanciés
+HD5_MESH_NAME = "HD5_Prototype_Mesh"
+
+# Matériaux partagés: nom -> (couleur de base, metallic, roughness, alpha)
+HD5_MATERIALS = {
+    "HD5_Container_Material": ((0.3, 0.3, 0.35, 1.0), 0.3, 0.6, 1.0),      # Gris/vert
+    "HD5_Handle_Material": ((0.12, 0.12, 0.15, 1.0), 0.8, 0.3, 1.0),       # Métal foncé
+    "HD5_Electrical_Material": ((0.98, 0.75, 0.14, 1.0), 0.4, 0.5, 1.0),   # Jaune sécurité
+    "HD5_Vent_Material": ((0.12, 0.12, 0.15, 1.0), 0.5, 0.4, 0.7),         # Semi-transparent
+    "HD5_Pipe_Material": ((0.9, 0.9, 0.92, 1.0), 0.9, 0.2, 1.0),           # Inox
+}
+
+
+# ============================================================================
+# MATÉRIAUX ET GÉOMÉTRIE PARTAGÉS
+# ============================================================================
+
+def get_hd5_materials():
+    """
+    Jeu de matériaux HD5 partagé (créé au premier appel, réutilisé ensuite,
+    y compris d'une exécution du script à l'autre)
+
+    Returns:
+        Dictionnaire nom -> matériau
+    """
+    return {mat_name: get_material(mat_name, *params) for mat_name, params in HD5_MATERIALS.items()}
+
+
+def hd5_parts():
+    """
+    Éléments d'un container HD5, en coordonnées locales au container
+
+    Returns:
+        Liste de (suffixe du nom, primitive, position, dimensions, rotation,
+        nom du matériau). Dimensions selon la primitive: 'BOX' (x, y, z),
+        'CYLINDER' (rayon, profondeur), 'GROOVED_PANEL' arguments de
+        MeshBuilder.add_grooved_panel (taille, rainures, pas, taille d'une
+        rainure, décalage de la première, écart à la face)
+    """
+    # Structure principale (container 40ft) et rainures industrielles sur le côté
+    parts = [("Container", 'GROOVED_PANEL', (0, 0, 0),
+              ((HD5_LENGTH, HD5_HEIGHT, HD5_WIDTH), 8, 1.5, (0.1, HD5_HEIGHT * 0.8, 0.05), 0.5, 0.01),
+              (0, 0, 0), "HD5_Container_Material")]
+
+    # Portes arrière (2 portes)
+    parts.append(("Doors_Rear", 'BOX', (HD5_LENGTH/2 - 0.1, 0, 0),
+                  (0.2, HD5_HEIGHT * 0.9, HD5_WIDTH * 0.9), (0, 0, 0), "HD5_Container_Material"))
+
+    # Poignées de portes
+    for i in range(2):
+        parts.append((f"Handle_{i+1}", 'BOX', (HD5_LENGTH/2 - 0.05, -0.5 + i * 1, HD5_WIDTH/2 + 0.05),
+                      (0.1, 0.3, 0.1), (0, 0, 0), "HD5_Handle_Material"))
+
+    # Coffret électrique latéral
+    parts.append(("ElectricalBox", 'BOX', (-HD5_LENGTH/2 + 0.4, HD5_HEIGHT/2 - 0.3, HD5_WIDTH/2 + 0.1),
+                  (0.8, 0.6, 0.4), (0, 0, 0), "HD5_Electrical_Material"))
+
+    # Grilles de ventilation
+    for i in range(6):
+        parts.append((f"Vent_{i+1}", 'BOX', (-HD5_LENGTH/2 + 1 + i * 2, HD5_HEIGHT/2 - 0.2, HD5_WIDTH/2 + 0.01),
+                      (0.3, 0.3, 0.05), (0, 0, 0), "HD5_Vent_Material"))
+
+    # Pipes hydrauliques (entrée et sortie), rotation 90° sur X
+    parts.append(("Pipe_In", 'CYLINDER', (-HD5_LENGTH/2 + 1, -HD5_HEIGHT/2 + 0.2, HD5_WIDTH/2 + 0.15),
+                  (0.075, 0.5), (1.5708, 0, 0), "HD5_Pipe_Material"))
+    parts.append(("Pipe_Out", 'CYLINDER', (-HD5_LENGTH/2 + 1, -HD5_HEIGHT/2 + 0.2, -HD5_WIDTH/2 - 0.15),
+                  (0.075, 0.5), (1.5708, 0, 0), "HD5_Pipe_Material"))
+    return parts
+
+
+def add_part_geometry(builder, primitive, location, size, rotation, material_index=0):
+    """Ajoute la géométrie d'un élément de hd5_parts() au builder"""
+    if primitive == 'CYLINDER':
+        radius, depth = size
+        builder.add_cylinder(radius, depth, location, rotation, material_index)
+    elif primitive == 'GROOVED_PANEL':
+        panel_size, grooves, pitch, groove_size, first_offset, face_gap = size
+        builder.add_grooved_panel(panel_size, grooves, pitch, groove_size, first_offset,
+                                  location, face_gap, material_index)
+    else:
+        builder.add_box(size, location, rotation, material_index)
+    return builder
+
+
+def get_hd5_prototype_mesh():
+    """
+    Maillage prototype d'un container HD5 (origine au centre du container),
+    construit une seule fois: tous les éléments dans un maillage
+    multi-matériaux (un slot par matériau partagé, dans l'ordre de
+    HD5_MATERIALS).
+    """
+    mesh = bpy.data.meshes.get(HD5_MESH_NAME)
+    if mesh is not None:
+        return mesh
+
+    materials = get_hd5_materials()
+    slots = list(HD5_MATERIALS)
+    builder = MeshBuilder()
+    for _, primitive, location, size, rotation, mat_name in hd5_parts():
+        add_part_geometry(builder, primitive, location, size, rotation, slots.index(mat_name))
+    return builder.to_mesh(HD5_MESH_NAME, [materials[mat_name] for mat_name in slots])
+
+
+# ============================================================================
+# CRÉATION DES CONTAINERS
+# ============================================================================
+
+def add_interface_points(name, container):
+    """Points d'interface PowerIn et CoolingIn (Empty objects) d'un container"""
+    for suffix in ("PowerIn", "CoolingIn"):
+        point = add_object(f"{name}_{suffix}", None, location=(-HD5_LENGTH/2 + 1, -HD5_HEIGHT/2, 0),
+                           parent=container)
+        point.empty_display_type = 'ARROWS'
+
+
+def create_hd5_instance(name, position, parent=None, mesh=None):
+    """
+    Crée un container HD5 en duplicata lié du prototype (aucune géométrie
+    ni matériau créé: l'objet référence le maillage partagé)
+
+    Args:
+        name: Nom du container (ex: "PB1_TR01_HD5_A")
+        position: Position (x, y, z) en mètres
+        parent: Objet parent (transformateur)
+        mesh: Maillage prototype (par défaut get_hd5_prototype_mesh())
+    """
+    container = add_object(name, mesh or get_hd5_prototype_mesh(), location=position, parent=parent)
+    add_interface_points(name, container)
+    return container
+
+
 def create_hd5_container(name, position, parent=None):
     """
-    Crée un container HD5 complet avec tous ses éléments
+    Crée un container HD5 complet avec tous ses éléments en objets séparés
+    (mode détaillé, matériaux partagés)
     
     Args:
         name: Nom du container (ex: "PB1_TR01_HD5_A")
@@ -22,170 +177,33 @@ def create_hd5_container(name, position, parent=None):
         parent: Objet parent (transformateur)
     """
     # Créer le groupe principal
-    container_group = bpy.data.objects.new(name, None)
+    container_group = add_object(name, None, location=position, parent=parent)
     container_group.empty_display_type = 'PLAIN_AXES'
-    container_group.location = position
-    bpy.context.collection.objects.link(container_group)
-    
-    if parent:
-        container_group.parent = parent
-    
-    # Structure principale du container
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=(0, 0, 0)
-    )
-    container_main = bpy.context.active_object
-    container_main.name = f"{name}_Container"
-    container_main.scale = (HD5_LENGTH, HD5_HEIGHT, HD5_WIDTH)
-    container_main.parent = container_group
     
-    # Matériau container
-    mat_container = bpy.data.materials.new(name=f"{name}_Material")
-    mat_container.use_nodes = True
-    bsdf = mat_container.node_tree.nodes["Principled BSDF"]
-    bsdf.inputs["Base Color"].default_value = (0.3, 0.3, 0.35, 1.0)  # Gris/vert
-    bsdf.inputs["Metallic"].default_value = 0.3
-    bsdf.inputs["Roughness"].default_value = 0.6
-    container_main.data.materials.append(mat_container)
-    
-    # Rainures industrielles sur les côtés
-    for i in range(8):
-        bpy.ops.mesh.primitive_cube_add(
-            size=1,
-            location=(0, 0, HD5_WIDTH/2 + 0.01)
-        )
-        groove = bpy.context.active_object
-        groove.name = f"{name}_Groove_{i+1}"
-        groove.scale = (0.1, HD5_HEIGHT * 0.8, 0.05)
-        groove.location.x = -HD5_LENGTH/2 + 0.5 + i * 1.5
-        groove.parent = container_group
-        groove.data.materials.append(mat_container)
-    
-    # Portes arrière (2 portes)
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=(HD5_LENGTH/2 - 0.1, 0, 0)
-    )
-    doors = bpy.context.active_object
-    doors.name = f"{name}_Doors_Rear"
-    doors.scale = (0.2, HD5_HEIGHT * 0.9, HD5_WIDTH * 0.9)
-    doors.parent = container_group
-    doors.data.materials.append(mat_container)
-    
-    # Poignées de portes
-    for i in range(2):
-        bpy.ops.mesh.primitive_cube_add(
-            size=1,
-            location=(HD5_LENGTH/2 - 0.05, -0.5 + i * 1, HD5_WIDTH/2 + 0.05)
-        )
-        handle = bpy.context.active_object
-        handle.name = f"{name}_Handle_{i+1}"
-        handle.scale = (0.1, 0.3, 0.1)
-        handle.parent = container_group
-        
-        mat_handle = bpy.data.materials.new(name=f"{name}_Handle_Material")
-        mat_handle.use_nodes = True
-        bsdf = mat_handle.node_tree.nodes["Principled BSDF"]
-        bsdf.inputs["Base Color"].default_value = (0.12, 0.12, 0.15, 1.0)
-        bsdf.inputs["Metallic"].default_value = 0.8
-        bsdf.inputs["Roughness"].default_value = 0.3
-        handle.data.materials.append(mat_handle)
-    
-    # Coffret électrique latéral
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=(-HD5_LENGTH/2 + 0.4, HD5_HEIGHT/2 - 0.3, HD5_WIDTH/2 + 0.1)
-    )
-    electrical_box = bpy.context.active_object
-    electrical_box.name = f"{name}_ElectricalBox"
-    electrical_box.scale = (0.8, 0.6, 0.4)
-    electrical_box.parent = container_group
-    
-    mat_electrical = bpy.data.materials.new(name=f"{name}_Electrical_Material")
-    mat_electrical.use_nodes = True
-    bsdf = mat_electrical.node_tree.nodes["Principled BSDF"]
-    bsdf.inputs["Base Color"].default_value = (0.98, 0.75, 0.14, 1.0)  # Jaune sécurité
-    bsdf.inputs["Metallic"].default_value = 0.4
-    bsdf.inputs["Roughness"].default_value = 0.5
-    electrical_box.data.materials.append(mat_electrical)
-    
-    # Grilles de ventilation
-    for i in range(6):
-        bpy.ops.mesh.primitive_cube_add(
-            size=1,
-            location=(-HD5_LENGTH/2 + 1 + i * 2, HD5_HEIGHT/2 - 0.2, HD5_WIDTH/2 + 0.01)
-        )
-        vent = bpy.context.active_object
-        vent.name = f"{name}_Vent_{i+1}"
-        vent.scale = (0.3, 0.3, 0.05)
-        vent.parent = container_group
-        
-        mat_vent = bpy.data.materials.new(name=f"{name}_Vent_Material")
-        mat_vent.use_nodes = True
-        bsdf = mat_vent.node_tree.nodes["Principled BSDF"]
-        bsdf.inputs["Base Color"].default_value = (0.12, 0.12, 0.15, 1.0)
-        bsdf.inputs["Metallic"].default_value = 0.5
-        bsdf.inputs["Roughness"].default_value = 0.4
-        bsdf.inputs["Alpha"].default_value = 0.7
-        mat_vent.blend_method = 'BLEND'
-        vent.data.materials.append(mat_vent)
-    
-    # Pipes hydrauliques
-    # Pipe entrée
-    bpy.ops.mesh.primitive_cylinder_add(
-        radius=0.075,
-        depth=0.5,
-        location=(-HD5_LENGTH/2 + 1, -HD5_HEIGHT/2 + 0.2, HD5_WIDTH/2 + 0.15)
-    )
-    pipe_in = bpy.context.active_object
-    pipe_in.name = f"{name}_Pipe_In"
-    pipe_in.rotation_euler = (1.5708, 0, 0)  # Rotation 90° sur X
-    pipe_in.parent = container_group
-    
-    # Pipe sortie
-    bpy.ops.mesh.primitive_cylinder_add(
-        radius=0.075,
-        depth=0.5,
-        location=(-HD5_LENGTH/2 + 1, -HD5_HEIGHT/2 + 0.2, -HD5_WIDTH/2 - 0.15)
-    )
-    pipe_out = bpy.context.active_object
-    pipe_out.name = f"{name}_Pipe_Out"
-    pipe_out.rotation_euler = (1.5708, 0, 0)
-    pipe_out.parent = container_group
-    
-    mat_pipe = bpy.data.materials.new(name=f"{name}_Pipe_Material")
-    mat_pipe.use_nodes = True
-    bsdf = mat_pipe.node_tree.nodes["Principled BSDF"]
-    bsdf.inputs["Base Color"].default_value = (0.9, 0.9, 0.92, 1.0)  # Inox
-    bsdf.inputs["Metallic"].default_value = 0.9
-    bsdf.inputs["Roughness"].default_value = 0.2
-    pipe_in.data.materials.append(mat_pipe)
-    pipe_out.data.materials.append(mat_pipe)
-    
-    # Points d'interface (Empty objects)
-    power_in = bpy.data.objects.new(f"{name}_PowerIn", None)
-    power_in.empty_display_type = 'ARROWS'
-    power_in.location = (-HD5_LENGTH/2 + 1, -HD5_HEIGHT/2, 0)
-    power_in.parent = container_group
-    bpy.context.collection.objects.link(power_in)
-    
-    cooling_in = bpy.data.objects.new(f"{name}_CoolingIn", None)
-    cooling_in.empty_display_type = 'ARROWS'
-    cooling_in.location = (-HD5_LENGTH/2 + 1, -HD5_HEIGHT/2, 0)
-    cooling_in.parent = container_group
-    bpy.context.collection.objects.link(cooling_in)
+    materials = get_hd5_materials()
+    for suffix, primitive, location, size, rotation, mat_name in hd5_parts():
+        part_name = f"{name}_{suffix}"
+        builder = add_part_geometry(MeshBuilder(), primitive, (0, 0, 0), size, (0, 0, 0))
+        add_object(part_name, builder.to_mesh(part_name, [materials[mat_name]]),
+                   location=location, rotation=rotation, parent=container_group)
     
+    add_interface_points(name, container_group)
     return container_group
 
 
-def generate_all_hd5_containers():
+def generate_all_hd5_containers(use_instancing=USE_INSTANCING):
     """
     Génère tous les 48 containers HD5 selon la structure:
     - 4 Power Blocks
     - 6 Transformateurs par Power Block
     - 2 HD5 par Transformateur
+
+    Args:
+        use_instancing: Duplicatas liés du prototype (sinon objets séparés)
     """
+    start = time.perf_counter()
+    mesh = get_hd5_prototype_mesh() if use_instancing else None
+
     # Positions des Power Blocks
     pb_positions = [
         (-60, -40, 0),  # PB1
@@ -217,12 +235,18 @@ def generate_all_hd5_containers():
             
             # Note: Dans un vrai script, vous devriez trouver le parent transformateur
             # Ici on crée sans parent pour l'exemple
-            create_hd5_container(hd5_a_name, hd5_a_pos)
-            create_hd5_container(hd5_b_name, hd5_b_pos)
+            if use_instancing:
+                create_hd5_instance(hd5_a_name, hd5_a_pos, mesh=mesh)
+                create_hd5_instance(hd5_b_name, hd5_b_pos, mesh=mesh)
+            else:
+                create_hd5_container(hd5_a_name, hd5_a_pos)
+                create_hd5_container(hd5_b_name, hd5_b_pos)
             
             containers_created += 2
     
-    print(f"✅ {containers_created} containers HD5 créés avec succès!")
+    mode = "instanciés (maillage partagé)" if use_instancing else "détaillés"
+    print(f"✅ {containers_created} containers HD5 {mode} créés avec succès! "
+          f"({time.perf_counter() - start:.2f} s)")
     return containers_created
 
 
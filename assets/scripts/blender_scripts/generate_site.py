@@ -0,0 +1,330 @@
+"""
+Script Blender - Génération d'un site complet piloté par le layout
+==================================================================
+
+Génère toute la scène d'un site (containers HD5, transformateurs, routes,
+gazon) en une passe, à partir:
+- du layout du configurateur Excel (generate_layout() de
+  scripts/layout_engine.py) pour une configuration et une puissance, ou
+- de public/models/structure-data.json (PowerBlocks, transformateurs,
+  switchgears, containers, substation)
+
+Chaque type d'élément a un maillage prototype unique (mesh_primitives) et
+des matériaux partagés ; chaque élément est un duplicata lié, mis à
+l'échelle de son emprise. Le coût de génération est celui de la création
+d'objets, pas de la géométrie : des sites de 200 MW à 2 GW sans modifier
+les scripts.
+
+Coordonnées: X Blender = x du layout, Y Blender = -y du layout (les lignes
+du layout descendent vers -Y), éléments posés sur le sol (Z = 0).
+
+Usage (headless):
+    blender -b -P assets/scripts/blender_scripts/generate_site.py -- --config mining_configurator_full_v2.json --power 600
+    blender -b -P assets/scripts/blender_scripts/generate_site.py -- --structure public/models/structure-data.json
+    blender -b -P assets/scripts/blender_scripts/generate_site.py -- --power 2000 --phase 1 --output site_phase1.blend
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from pathlib import Path
+
+import bpy
+
+# Bibliothèque de géométrie du dossier (mesh_primitives.py)
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from mesh_primitives import MeshBuilder, add_object, get_material
+from generate_hd5_containers import HD5_HEIGHT, HD5_LENGTH, HD5_WIDTH, get_hd5_prototype_mesh
+
+# Racine du projet et scripts du configurateur (layout_engine, config_loader)
+PROJECT_ROOT = Path(SCRIPTS_DIR).resolve().parents[2]
+CONFIGURATOR_DIR = PROJECT_ROOT / "scripts"
+
+# Hauteurs (m): transformateur (cuve et socle, comme create_transformers.py)
+# et éléments plats
+TRANSFORMER_HEIGHT = 5
+ROAD_THICKNESS = 0.05
+GRASS_THICKNESS = 0.02
+
+# Type du layout (onglet LAYOUT) -> type d'élément du site
+LAYOUT_KINDS = {
+    "Container": "container",
+    "Transformateur": "transformer",
+    "Route": "road",
+    "Gazon": "grass",
+}
+
+# Matériaux partagés du site: nom -> (couleur de base, metallic, roughness)
+SITE_MATERIALS = {
+    "Site_Concrete_Material": ((0.6, 0.6, 0.65, 1.0), 0.0, 0.7),       # Béton
+    "Site_Transformer_Material": ((0.02, 0.59, 0.41, 1.0), 0.2, 0.5),  # Vert industriel
+    "Site_Radiator_Material": ((0.42, 0.45, 0.50, 1.0), 0.7, 0.4),     # Métal gris
+    "Site_Bushing_Material": ((1.0, 1.0, 1.0, 1.0), 0.0, 0.2),         # Porcelaine blanche
+    "Site_Switchgear_Material": ((0.5, 0.52, 0.55, 1.0), 0.5, 0.6),    # Gris RAL 7035
+    "Site_Panel_Material": ((0.1, 0.1, 0.1, 1.0), 0.0, 0.8),           # Plastique noir
+    "Site_Road_Material": ((0.2, 0.2, 0.22, 1.0), 0.0, 0.9),           # Enrobé
+    "Site_Grass_Material": ((0.2, 0.45, 0.15, 1.0), 0.0, 1.0),         # Gazon
+}
+
+
+# ============================================================================
+# ÉLÉMENTS DU SITE
+# ============================================================================
+#
+# Élément: dict id, kind, x, y (centre au sol, coordonnées Blender),
+# size (longueur X, largeur Y, hauteur Z), rotation (degrés autour de Z),
+# phase
+
+def layout_elements(config_path, power_mw=None):
+    """
+    Éléments du layout du configurateur pour une puissance (défaut:
+    project_input.power_target_mw)
+
+    Returns:
+        (liste d'éléments, puissance utilisée)
+    """
+    if str(CONFIGURATOR_DIR) not in sys.path:
+        sys.path.insert(0, str(CONFIGURATOR_DIR))
+    from config_loader import load_config
+    from layout_checks import footprint
+    from layout_engine import generate_layout
+
+    config = load_config(str(config_path))
+    if power_mw is None:
+        power_mw = config["project_input"].get("power_target_mw", 0)
+    heights = {
+        "container": HD5_HEIGHT,
+        "transformer": TRANSFORMER_HEIGHT,
+        "road": ROAD_THICKNESS,
+        "grass": GRASS_THICKNESS,
+    }
+
+    elements = []
+    for item in generate_layout(config, power_mw):
+        kind = LAYOUT_KINDS.get(item["type"])
+        if kind is None:
+            continue
+        # Centre de l'empreinte (rotation autour du coin (x, y) dans le layout);
+        # Y du layout inversé dans Blender, donc sens de rotation inversé aussi
+        rotation = item.get("rotation", 0)
+        x0, y0, x1, y1 = footprint(item["x"], item["y"], item["length"], item["width"], rotation)
+        elements.append({
+            "id": item["id"],
+            "kind": kind,
+            "x": (x0 + x1) / 2,
+            "y": -(y0 + y1) / 2,
+            "size": (item["length"], item["width"], heights[kind]),
+            "rotation": -rotation,
+            "phase": item.get("phase", 1),
+        })
+    return elements, power_mw
+
+
+def structure_elements(structure_path):
+    """Éléments de public/models/structure-data.json (positions = centres au sol)"""
+    data = json.loads(Path(structure_path).read_text(encoding="utf-8"))
+    elements = []
+
+    substation = data.get("substation")
+    if substation:
+        x, y, _ = substation["position"]
+        elements.append({"id": "Substation", "kind": "substation", "x": x, "y": y,
+                         "size": tuple(substation["dimensions"]), "rotation": 0, "phase": 1})
+    for pb in data.get("powerBlocks", []):
+        elements.append({"id": pb["id"], "kind": "powerblock", "x": pb["x"], "y": pb["y"],
+                         "size": (15, 8, 10), "rotation": 0, "phase": 1})
+    for key, kind in (("transformers", "transformer"), ("switchgears", "switchgear"), ("containers", "container")):
+        for item in data.get(key, []):
+            x, y, _ = item["position"]
+            elements.append({"id": item["id"], "kind": kind, "x": x, "y": y,
+                             "size": tuple(item["dimensions"]), "rotation": 0, "phase": 1})
+    return elements
+
+
+# ============================================================================
+# PROTOTYPES
+# ============================================================================
+
+def site_materials():
+    """Matériaux partagés du site (nom -> matériau)"""
+    return {name: get_material(name, *params) for name, params in SITE_MATERIALS.items()}
+
+
+def transformer_mesh(materials):
+    """Transformateur 4 x 3 x 5 m: socle, cuve, radiateurs, bushings HT"""
+    slots = ["Site_Concrete_Material", "Site_Transformer_Material",
+             "Site_Radiator_Material", "Site_Bushing_Material"]
+    builder = MeshBuilder()
+    builder.add_box((4.2, 3.2, 0.3), (0, 0, 0.15), material_index=0)
+    builder.add_box((3.4, 3.0, 4.0), (-0.3, 0, 2.3), material_index=1)
+    for i in range(6):
+        builder.add_box((0.6, 0.08, 3.2), (1.7, -1.25 + i * 0.5, 2.2), material_index=2)
+    for i in range(3):
+        builder.add_cylinder(0.15, 0.7, (-1.3 + i * 1.0, 0, 4.65), material_index=3)
+    return builder.to_mesh("Site_Transformer_Mesh", [materials[name] for name in slots])
+
+
+def switchgear_mesh(materials):
+    """Switchgear 2 x 2 x 1.5 m: boîtier et panneau de contrôle avant"""
+    builder = MeshBuilder()
+    builder.add_box((2, 1.9, 1.5), (0, 0.05, 0.75), material_index=0)
+    builder.add_box((1.8, 0.1, 1.3), (0, -0.95, 0.75), material_index=1)
+    return builder.to_mesh("Site_Switchgear_Mesh",
+                           [materials["Site_Switchgear_Material"], materials["Site_Panel_Material"]])
+
+
+def powerblock_mesh(materials):
+    """PowerBlock 15 x 8 x 10 m: structure et panneaux électriques latéraux"""
+    builder = MeshBuilder()
+    builder.add_box((14.6, 8, 10), (0, 0, 5), material_index=0)
+    for side in (-1, 1):
+        builder.add_box((0.2, 6, 8), (side * 7.4, 0, 4), material_index=1)
+    return builder.to_mesh("Site_PowerBlock_Mesh",
+                           [materials["Site_Concrete_Material"], materials["Site_Switchgear_Material"]])
+
+
+def slab_mesh(name, material):
+    """Dalle unitaire 1 x 1 x 1 m posée sur le sol (routes, gazon, substation)"""
+    return MeshBuilder().add_box((1, 1, 1), (0, 0, 0.5)).to_mesh(name, [material])
+
+
+def build_prototypes():
+    """
+    Prototype de chaque type d'élément: maillage, dimensions nominales
+    (longueur, largeur, hauteur), rotation de base, décalage Z et axes
+    locaux (X, Y, Z) -> indice dans size.
+    """
+    materials = site_materials()
+    upright = {"rotation": (0, 0, 0), "z_offset": 0.0, "axes": (0, 1, 2)}
+    return {
+        # Le prototype HD5 a sa hauteur selon Y local: redressé de 90° sur X
+        "container": {"mesh": get_hd5_prototype_mesh(), "nominal": (HD5_LENGTH, HD5_WIDTH, HD5_HEIGHT),
+                      "rotation": (math.pi / 2, 0, 0), "z_offset": HD5_HEIGHT / 2, "axes": (0, 2, 1)},
+        "transformer": {"mesh": transformer_mesh(materials), "nominal": (4, 3, 5), **upright},
+        "switchgear": {"mesh": switchgear_mesh(materials), "nominal": (2, 2, 1.5), **upright},
+        "powerblock": {"mesh": powerblock_mesh(materials), "nominal": (15, 8, 10), **upright},
+        "substation": {"mesh": slab_mesh("Site_Substation_Mesh", materials["Site_Concrete_Material"]),
+                       "nominal": (1, 1, 1), **upright},
+        "road": {"mesh": slab_mesh("Site_Road_Mesh", materials["Site_Road_Material"]),
+                 "nominal": (1, 1, 1), **upright},
+        "grass": {"mesh": slab_mesh("Site_Grass_Mesh", materials["Site_Grass_Material"]),
+                  "nominal": (1, 1, 1), **upright},
+    }
+
+
+# ============================================================================
+# GÉNÉRATION DE LA SCÈNE
+# ============================================================================
+
+def reset_scene():
+    """Scène vide en unités métriques"""
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    bpy.context.scene.unit_settings.system = 'METRIC'
+    bpy.context.scene.unit_settings.length_unit = 'METERS'
+
+
+def generate_site(elements, site_name, max_phase=None):
+    """
+    Crée un duplicata lié par élément, rangé dans une collection par type
+    sous la collection site_name
+
+    Args:
+        elements: Éléments du site (layout_elements / structure_elements)
+        max_phase: Ne génère que les éléments des phases 1..max_phase
+
+    Returns:
+        Nombre d'objets créés par type
+    """
+    prototypes = build_prototypes()
+    site = bpy.data.collections.new(site_name)
+    bpy.context.scene.collection.children.link(site)
+    collections = {}
+    counts = {}
+
+    for element in elements:
+        if max_phase is not None and element["phase"] > max_phase:
+            continue
+        kind = element["kind"]
+        prototype = prototypes[kind]
+        collection = collections.get(kind)
+        if collection is None:
+            collection = bpy.data.collections.new(f"{site_name}_{kind}")
+            site.children.link(collection)
+            collections[kind] = collection
+
+        rx, ry, rz = prototype["rotation"]
+        obj = add_object(element["id"], prototype["mesh"],
+                         location=(element["x"], element["y"], prototype["z_offset"]),
+                         rotation=(rx, ry, rz + math.radians(element["rotation"])),
+                         collection=collection)
+        obj.scale = tuple(element["size"][axis] / prototype["nominal"][axis] for axis in prototype["axes"])
+        obj["element_id"] = element["id"]
+        obj["kind"] = kind
+        obj["phase"] = element["phase"]
+        counts[kind] = counts.get(kind, 0) + 1
+
+    return counts
+
+
+def parse_args(argv):
+    """Arguments du script (après "--" sur la ligne de commande de Blender)"""
+    parser = argparse.ArgumentParser(description="Génération d'un site complet dans Blender")
+    parser.add_argument("--config", type=Path, default=PROJECT_ROOT.parent / "mining_configurator_full_v2.json",
+                        help="Fichier JSON de configuration du configurateur")
+    parser.add_argument("--power", type=float, default=None,
+                        help="Puissance IT (MW), défaut: project_input.power_target_mw")
+    parser.add_argument("--structure", type=Path, default=None,
+                        help="public/models/structure-data.json au lieu du layout du configurateur")
+    parser.add_argument("--phase", type=int, default=None,
+                        help="Ne génère que les éléments des phases 1..N (project_input.phasing)")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Fichier .blend (défaut: assets/scripts/site_<puissance>MW.blend)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Fonction principale"""
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    args = parse_args(argv)
+    start = time.perf_counter()
+
+    if args.structure is not None:
+        if not args.structure.exists():
+            print(f"ERREUR: Fichier introuvable: {args.structure}")
+            return 1
+        elements = structure_elements(args.structure)
+        site_name = f"Site_{args.structure.stem}"
+    else:
+        if not args.config.exists():
+            print(f"ERREUR: Fichier JSON introuvable: {args.config}")
+            return 1
+        elements, power_mw = layout_elements(args.config, args.power)
+        site_name = f"Site_{power_mw:g}MW"
+    layout_time = time.perf_counter() - start
+
+    reset_scene()
+    counts = generate_site(elements, site_name, max_phase=args.phase)
+    generation_time = time.perf_counter() - start - layout_time
+
+    output = args.output or Path(SCRIPTS_DIR).parent / f"{site_name.lower()}.blend"
+    bpy.ops.wm.save_as_mainfile(filepath=str(Path(output).resolve()))
+
+    print("\n" + "=" * 60)
+    print(f"✅ {site_name}: {sum(counts.values())} objets en {generation_time:.2f} s "
+          f"(layout {layout_time:.2f} s)")
+    for kind, count in sorted(counts.items()):
+        print(f"   - {kind}: {count}")
+    print(f"📁 Fichier sauvegardé: {output}")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""
+Chaîne de LOD pour l'export GLB
+================================
+
+Pour un objet maillage, exporte des niveaux de détail décroissants en GLB
+séparés, à côté du modèle complet:
+- LOD1..LODn: copie de l'objet avec un modificateur Decimate (COLLAPSE)
+  au ratio demandé, appliqué à l'export
+- dernier niveau: imposteur boîte (12 triangles) aux dimensions de la
+  boîte englobante de l'objet, avec son premier matériau
+
+Le manifeste JSON (write_manifest) donne, par modèle, le fichier, le ratio,
+le nombre de triangles, la taille et le décodage estimé de chaque niveau:
+le viewer peut charger les niveaux bas d'abord puis remplacer par les
+niveaux détaillés.
+
+export_selected() est l'export GLB commun aux scripts: paramètres glTF
+communs et compression du profil choisi (export_profiles.py).
+
+Les copies sont supprimées après export: l'objet d'origine n'est pas modifié.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import bpy
+import numpy as np
+
+# Bibliothèque de géométrie du dossier (mesh_primitives.py)
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from export_profiles import DEFAULT_PROFILE, file_report, gltf_options, postprocess
+from mesh_primitives import add_object, box_mesh
+
+# Ratios de décimation par défaut (LOD1, LOD2), suivis de l'imposteur boîte
+DEFAULT_LOD_RATIOS = (0.5, 0.2)
+
+# Paramètres glTF communs à tous les exports (compression: voir le profil)
+GLTF_EXPORT_OPTIONS = {
+    "export_format": 'GLB',
+    "use_selection": True,
+    "export_yup": True,
+    "export_apply": True,
+    "export_materials": 'EXPORT',
+    "export_colors": True,
+    "export_cameras": False,
+    "export_lights": False,
+}
+
+
+# ============================================================================
+# MESURES
+# ============================================================================
+
+def triangle_count(obj):
+    """Triangles de l'objet évalué (modificateurs appliqués)"""
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    evaluated = obj.evaluated_get(depsgraph)
+    mesh = evaluated.to_mesh()
+    try:
+        loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("loop_total", loop_totals)
+        return int((loop_totals - 2).sum())
+    finally:
+        evaluated.to_mesh_clear()
+
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+def export_selected(obj, filepath, profile=DEFAULT_PROFILE, **options):
+    """
+    Exporte uniquement obj (un objet ou une liste d'objets) en GLB avec le
+    profil de compression donné; options: paramètres glTF supplémentaires
+
+    Returns:
+        Méthode de compression appliquée (draco, meshopt, none)
+    """
+    objects = list(obj) if isinstance(obj, (list, tuple)) else [obj]
+    bpy.ops.object.select_all(action='DESELECT')
+    for selected in objects:
+        selected.select_set(True)
+    bpy.context.view_layer.objects.active = objects[0]
+    bpy.ops.export_scene.gltf(filepath=str(filepath), **{**GLTF_EXPORT_OPTIONS, **gltf_options(profile), **options})
+    return postprocess(profile, filepath)
+
+
+# ============================================================================
+# NIVEAUX
+# ============================================================================
+
+
+def _remove(obj):
+    """Supprime un objet temporaire et son maillage"""
+    mesh = obj.data
+    bpy.data.objects.remove(obj)
+    if mesh is not None and mesh.users == 0:
+        bpy.data.meshes.remove(mesh)
+
+
+def decimated_copy(obj, ratio):
+    """Copie de obj (maillage copié) avec un modificateur Decimate au ratio donné"""
+    lod = obj.copy()
+    lod.data = obj.data.copy()
+    lod.name = f"{obj.name}_LOD_{ratio:g}"
+    bpy.context.scene.collection.objects.link(lod)
+    modifier = lod.modifiers.new(name="LOD_Decimate", type='DECIMATE')
+    modifier.decimate_type = 'COLLAPSE'
+    modifier.ratio = ratio
+    return lod
+
+
+def box_impostor(obj):
+    """Imposteur: boîte englobante de obj (repère local), premier matériau de obj"""
+    corners = np.array([tuple(corner) for corner in obj.bound_box])
+    low, high = corners.min(axis=0), corners.max(axis=0)
+    material = obj.active_material
+    mesh = box_mesh(f"{obj.name}_Impostor", tuple(high - low), center=tuple((low + high) / 2), material=material)
+    impostor = add_object(mesh.name, mesh, collection=bpy.context.scene.collection)
+    impostor.matrix_world = obj.matrix_world.copy()
+    return impostor
+
+
+def export_lods(obj, directory, stem, ratios=DEFAULT_LOD_RATIOS, impostor=True, profile=DEFAULT_PROFILE):
+    """
+    Exporte les niveaux LOD1.. de obj dans directory/{stem}_lod{n}.glb
+
+    Args:
+        obj: Objet maillage (modèle complet, déjà exporté en LOD0)
+        ratios: Ratios de décimation (décroissants), un niveau par ratio
+        impostor: Ajoute l'imposteur boîte comme dernier niveau
+        profile: Profil de compression (export_profiles.py)
+
+    Returns:
+        Liste de niveaux {level, file, ratio, triangles, bytes, compression, decode_ms}
+        (ratio None pour l'imposteur)
+    """
+    directory = Path(directory)
+    levels = []
+    builders = [(ratio, lambda ratio=ratio: decimated_copy(obj, ratio)) for ratio in ratios]
+    if impostor:
+        builders.append((None, lambda: box_impostor(obj)))
+
+    for level, (ratio, build) in enumerate(builders, 1):
+        lod = build()
+        try:
+            filepath = directory / f"{stem}_lod{level}.glb"
+            method = export_selected(lod, filepath, profile)
+            levels.append({
+                "level": level,
+                "file": filepath.name,
+                "ratio": ratio,
+                "triangles": triangle_count(lod),
+                **file_report(filepath, method),
+            })
+        finally:
+            _remove(lod)
+    return levels
+
+
+def base_level(obj, filepath, method):
+    """Entrée LOD0 du manifeste pour le modèle complet déjà exporté (compression method)"""
+    filepath = Path(filepath)
+    return {
+        "level": 0,
+        "file": filepath.name,
+        "ratio": 1.0,
+        "triangles": triangle_count(obj),
+        **file_report(filepath, method),
+    }
+
+
+def write_manifest(path, models):
+    """
+    Manifeste des LOD: {"models": {nom: {"object": ..., "levels": [...]}}}.
+    Les entrées d'un manifeste existant sont conservées (mise à jour par modèle).
+    """
+    path = Path(path)
+    manifest = {"models": {}}
+    if path.exists():
+        try:
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            pass
+    manifest.setdefault("models", {}).update(models)
+    path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+    return manifest
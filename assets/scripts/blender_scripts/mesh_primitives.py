@@ -0,0 +1,222 @@
+"""
+Bibliothèque de géométrie pour les scripts Blender
+===================================================
+
+Construit les maillages directement par l'API de données (mesh.from_pydata
++ foreach_set) au lieu de bpy.ops.mesh.primitive_*_add: pas de surcoût
+d'opérateur, pas de vérification de contexte, pas de mise à jour du
+depsgraph à chaque primitive. Les dimensions, positions et rotations sont
+intégrées aux sommets (pas de transform_apply).
+
+- MeshBuilder: accumule boîtes, cylindres, plans et panneaux rainurés
+  (avec un indice de matériau par face) puis crée un seul maillage
+- box_mesh(), cylinder_mesh(), plane_mesh(), grooved_panel_mesh():
+  maillage d'une seule primitive
+- add_object(): objet référençant un maillage, lié à une collection
+- get_material(): matériau PBR partagé (créé une fois, réutilisé par nom)
+
+Conventions (identiques aux primitives Blender):
+- boîte: size = dimensions (x, y, z), centrée sur center
+- cylindre: axe Z local, profondeur depth, 32 segments
+- plan: dans le plan XY local, normale +Z
+- rotation: angles d'Euler XYZ en radians, autour de center
+
+Usage dans un script du dossier:
+    from mesh_primitives import MeshBuilder, add_object, box_mesh
+"""
+
+import math
+
+try:
+    import bpy
+except ImportError:  # Hors de Blender: construction des sommets/faces seulement
+    bpy = None
+
+# Segments des cylindres (valeur par défaut de primitive_cylinder_add)
+CYLINDER_SEGMENTS = 32
+
+# Faces d'une boîte (normales sortantes), sur les sommets de _box_corners()
+BOX_FACES = (
+    (0, 3, 2, 1),  # -Z
+    (4, 5, 6, 7),  # +Z
+    (0, 1, 5, 4),  # -Y
+    (2, 3, 7, 6),  # +Y
+    (0, 4, 7, 3),  # -X
+    (1, 2, 6, 5),  # +X
+)
+
+
+# ============================================================================
+# TRANSFORMATIONS
+# ============================================================================
+
+def rotate_euler(point, rotation):
+    """Rotation d'un point par des angles d'Euler XYZ (ordre de Blender: X, puis Y, puis Z)"""
+    x, y, z = point
+    rx, ry, rz = rotation
+    if rx:
+        c, s = math.cos(rx), math.sin(rx)
+        y, z = c * y - s * z, s * y + c * z
+    if ry:
+        c, s = math.cos(ry), math.sin(ry)
+        x, z = c * x + s * z, -s * x + c * z
+    if rz:
+        c, s = math.cos(rz), math.sin(rz)
+        x, y = c * x - s * y, s * x + c * y
+    return (x, y, z)
+
+
+def _box_corners(size):
+    """8 sommets d'une boîte centrée à l'origine"""
+    hx, hy, hz = size[0] / 2, size[1] / 2, size[2] / 2
+    return [(-hx, -hy, -hz), (hx, -hy, -hz), (hx, hy, -hz), (-hx, hy, -hz),
+            (-hx, -hy, hz), (hx, -hy, hz), (hx, hy, hz), (-hx, hy, hz)]
+
+
+# ============================================================================
+# CONSTRUCTION DES MAILLAGES
+# ============================================================================
+
+class MeshBuilder:
+    """
+    Accumulateur de géométrie: chaque add_*() ajoute ses sommets et faces
+    (avec un indice de matériau), to_mesh() crée le maillage en un appel.
+    Les méthodes renvoient le builder (appels chaînables).
+    """
+
+    def __init__(self):
+        self.vertices = []
+        self.faces = []
+        self.material_indices = []
+
+    def _add(self, local_vertices, faces, center, rotation, material_index):
+        """Ajoute une primitive: sommets locaux tournés puis translatés en center"""
+        offset = len(self.vertices)
+        cx, cy, cz = center
+        if any(rotation):
+            local_vertices = [rotate_euler(v, rotation) for v in local_vertices]
+        self.vertices.extend((x + cx, y + cy, z + cz) for x, y, z in local_vertices)
+        self.faces.extend(tuple(offset + i for i in face) for face in faces)
+        self.material_indices.extend([material_index] * len(faces))
+        return self
+
+    def add_box(self, size, center=(0, 0, 0), rotation=(0, 0, 0), material_index=0):
+        """Boîte de dimensions size (x, y, z)"""
+        return self._add(_box_corners(size), BOX_FACES, center, rotation, material_index)
+
+    def add_cylinder(self, radius, depth, center=(0, 0, 0), rotation=(0, 0, 0),
+                     material_index=0, segments=CYLINDER_SEGMENTS):
+        """Cylindre fermé d'axe Z local"""
+        half = depth / 2
+        ring = [(radius * math.cos(2 * math.pi * i / segments),
+                 radius * math.sin(2 * math.pi * i / segments)) for i in range(segments)]
+        vertices = [(x, y, -half) for x, y in ring] + [(x, y, half) for x, y in ring]
+        faces = [(i, (i + 1) % segments, segments + (i + 1) % segments, segments + i)
+                 for i in range(segments)]
+        faces.append(tuple(range(segments, 2 * segments)))      # Couvercle +Z
+        faces.append(tuple(range(segments - 1, -1, -1)))        # Fond -Z
+        return self._add(vertices, faces, center, rotation, material_index)
+
+    def add_plane(self, size, center=(0, 0, 0), rotation=(0, 0, 0), material_index=0):
+        """Plan de dimensions size (x, y), normale +Z locale"""
+        hx, hy = size[0] / 2, size[1] / 2
+        vertices = [(-hx, -hy, 0), (hx, -hy, 0), (hx, hy, 0), (-hx, hy, 0)]
+        return self._add(vertices, [(0, 1, 2, 3)], center, rotation, material_index)
+
+    def add_grooved_panel(self, size, grooves, pitch, groove_size, first_offset,
+                          center=(0, 0, 0), face_gap=0.0, material_index=0, groove_material_index=None):
+        """
+        Panneau (boîte) avec des rainures en relief sur sa face +Z, réparties
+        selon X: rainure i centrée à -size_x/2 + first_offset + i * pitch.
+
+        Args:
+            size: Dimensions du panneau (x, y, z)
+            grooves: Nombre de rainures
+            pitch: Espacement des rainures selon X (m)
+            groove_size: Dimensions d'une rainure (x, y, z)
+            first_offset: Distance du bord -X au centre de la première rainure (m)
+            face_gap: Décalage des rainures au-delà de la face +Z (m)
+            groove_material_index: Matériau des rainures (défaut: celui du panneau)
+        """
+        if groove_material_index is None:
+            groove_material_index = material_index
+        cx, cy, cz = center
+        self.add_box(size, center, material_index=material_index)
+        for i in range(grooves):
+            groove_center = (cx - size[0] / 2 + first_offset + i * pitch, cy, cz + size[2] / 2 + face_gap)
+            self.add_box(groove_size, groove_center, material_index=groove_material_index)
+        return self
+
+    def to_mesh(self, name, materials=()):
+        """
+        Crée le maillage Blender (un seul from_pydata, indices de matériau
+        par foreach_set) et lui ajoute les slots de matériaux.
+        """
+        mesh = bpy.data.meshes.new(name)
+        mesh.from_pydata(self.vertices, [], self.faces)
+        for material in materials:
+            mesh.materials.append(material)
+        if any(self.material_indices):
+            mesh.polygons.foreach_set("material_index", self.material_indices)
+        mesh.update()
+        return mesh
+
+
+def box_mesh(name, size, center=(0, 0, 0), rotation=(0, 0, 0), material=None):
+    """Maillage d'une boîte de dimensions size (x, y, z)"""
+    return MeshBuilder().add_box(size, center, rotation).to_mesh(name, [material] if material else ())
+
+
+def cylinder_mesh(name, radius, depth, center=(0, 0, 0), rotation=(0, 0, 0), material=None,
+                  segments=CYLINDER_SEGMENTS):
+    """Maillage d'un cylindre d'axe Z local"""
+    builder = MeshBuilder().add_cylinder(radius, depth, center, rotation, segments=segments)
+    return builder.to_mesh(name, [material] if material else ())
+
+
+def plane_mesh(name, size, center=(0, 0, 0), rotation=(0, 0, 0), material=None):
+    """Maillage d'un plan de dimensions size (x, y)"""
+    return MeshBuilder().add_plane(size, center, rotation).to_mesh(name, [material] if material else ())
+
+
+def grooved_panel_mesh(name, size, grooves, pitch, groove_size, first_offset, face_gap=0.0, material=None):
+    """Maillage d'un panneau rainuré (voir MeshBuilder.add_grooved_panel)"""
+    builder = MeshBuilder().add_grooved_panel(size, grooves, pitch, groove_size, first_offset, face_gap=face_gap)
+    return builder.to_mesh(name, [material] if material else ())
+
+
+# ============================================================================
+# OBJETS ET MATÉRIAUX
+# ============================================================================
+
+def get_material(name, color, metallic, roughness, alpha=1.0):
+    """
+    Matériau PBR partagé: créé au premier appel, réutilisé ensuite par son
+    nom (y compris d'une exécution de script à l'autre)
+    """
+    mat = bpy.data.materials.get(name)
+    if mat is None:
+        mat = bpy.data.materials.new(name=name)
+        mat.use_nodes = True
+        bsdf = mat.node_tree.nodes["Principled BSDF"]
+        bsdf.inputs["Base Color"].default_value = color
+        bsdf.inputs["Metallic"].default_value = metallic
+        bsdf.inputs["Roughness"].default_value = roughness
+        if alpha < 1.0:
+            bsdf.inputs["Alpha"].default_value = alpha
+            mat.blend_method = 'BLEND'
+    return mat
+
+
+def add_object(name, mesh, location=(0, 0, 0), rotation=(0, 0, 0), parent=None, collection=None):
+    """
+    Crée un objet référençant mesh (None: Empty) et le lie à la collection
+    (par défaut la collection active). La position est relative au parent.
+    """
+    obj = bpy.data.objects.new(name, mesh)
+    obj.location = location
+    obj.rotation_euler = rotation
+    if parent:
+        obj.parent = parent
+    (collection or bpy.context.collection).objects.link(obj)
+    return obj
@@ -1,14 +1,37 @@
 """
 Script maître pour exécuter tous les scripts de génération dans l'ordre
+
+Cache de construction (build_cache.py): une étape n'est réexécutée que si
+son empreinte a changé (source de son script, des scripts des étapes
+précédentes et des modules importés) ou si ses objets manquent dans le
+.blend. Une étape réexécutée supprime d'abord les objets qu'elle avait
+créés, puis entraîne les étapes suivantes (parents recréés). Le .blend
+n'est sauvegardé que si une étape a été réexécutée.
 """
 
 import bpy
 import os
+import sys
 
 # Chemin du fichier blend
 blend_file = os.path.join(os.path.dirname(__file__), '..', 'substation_200MW.blend')
 blend_file = os.path.abspath(blend_file)
 
+# Exécuter les scripts dans l'ordre
+scripts_dir = os.path.dirname(os.path.abspath(__file__))
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
+
+from build_cache import fresh_record, load_record, save_record
+
+# Étapes: (clé du cache, script, libellé)
+BUILD_STEPS = [
+    ("blend/power_blocks", "create_power_blocks.py", "Power Blocks"),
+    ("blend/transformers", "create_transformers.py", "Transformateurs"),
+    ("blend/switchgears", "create_switchgears.py", "Switchgears"),
+    ("blend/hd5_containers", "generate_hd5_containers.py", "Containers HD5"),
+]
+
 # Charger le fichier blend
 if os.path.exists(blend_file):
     bpy.ops.wm.open_mainfile(filepath=blend_file)
@@ -16,38 +39,68 @@ if os.path.exists(blend_file):
 else:
     print("⚠️  Fichier blend non trouvé, création d'une nouvelle scène...")
     # Exécuter setup si le fichier n'existe pas
-    exec(open(os.path.join(os.path.dirname(__file__), 'setup_scene.py')).read())
+    exec(open(os.path.join(scripts_dir, 'setup_scene.py')).read())
+
+
+def run_script(path):
+    """Exécute un script de génération comme s'il était lancé seul"""
+    with open(path) as source:
+        exec(compile(source.read(), path, "exec"), {"__name__": "__main__", "__file__": path})
+
+
+def remove_objects(names):
+    """Supprime les objets d'une construction précédente et les données orphelines"""
+    for name in names:
+        obj = bpy.data.objects.get(name)
+        if obj is not None:
+            bpy.data.objects.remove(obj, do_unlink=True)
+    # Matériaux et maillages libérés: leurs noms redeviennent disponibles
+    bpy.data.orphans_purge(do_recursive=True)
 
-# Exécuter les scripts dans l'ordre
-scripts_dir = os.path.dirname(__file__)
 
 print("\n" + "="*50)
 print("🚀 Génération automatique de tous les éléments")
 print("="*50 + "\n")
 
-# 1. Power Blocks
-print("📦 Étape 1/4: Création des Power Blocks...")
-exec(open(os.path.join(scripts_dir, 'create_power_blocks.py')).read())
+scripts = []
+pending_records = []
+rebuild = False
 
-# 2. Transformateurs
-print("\n📦 Étape 2/4: Création des Transformateurs...")
-exec(open(os.path.join(scripts_dir, 'create_transformers.py')).read())
+for index, (key, script, label) in enumerate(BUILD_STEPS, 1):
+    path = os.path.join(scripts_dir, script)
+    scripts.append(path)
+    print(f"📦 Étape {index}/{len(BUILD_STEPS)}: {label}...")
 
-# 3. Switchgears
-print("\n📦 Étape 3/4: Création des Switchgears...")
-exec(open(os.path.join(scripts_dir, 'create_switchgears.py')).read())
+    record = None if rebuild else fresh_record(key, scripts)
+    if record is not None and all(name in bpy.data.objects for name in record.get("objects", [])):
+        print(f"   ⏭️  À jour (cache {record['built']}), étape ignorée")
+        continue
 
-# 4. Containers HD5
-print("\n📦 Étape 4/4: Création des Containers HD5...")
-exec(open(os.path.join(scripts_dir, 'generate_hd5_containers.py')).read())
+    # Étape périmée: reconstruire celle-ci et toutes les suivantes
+    rebuild = True
+    previous = load_record(key)
+    if previous:
+        remove_objects(previous.get("objects", []))
+    before = set(bpy.data.objects.keys())
+    run_script(path)
+    created = sorted(set(bpy.data.objects.keys()) - before)
+    pending_records.append((key, list(scripts), created))
 
-# Sauvegarder
-bpy.ops.wm.save_as_mainfile(filepath=blend_file)
+if rebuild:
+    # Sauvegarder, puis enregistrer les étapes (le cache ne décrit que des .blend sauvegardés)
+    bpy.ops.wm.save_as_mainfile(filepath=blend_file)
+    for key, step_scripts, created in pending_records:
+        save_record(key, step_scripts, objects=created)
 
-print("\n" + "="*50)
-print("✅ TOUS LES ÉLÉMENTS CRÉÉS AVEC SUCCÈS!")
-print("="*50)
-print(f"📁 Fichier sauvegardé: {blend_file}")
+    print("\n" + "="*50)
+    print("✅ TOUS LES ÉLÉMENTS CRÉÉS AVEC SUCCÈS!")
+    print("="*50)
+    print(f"📁 Fichier sauvegardé: {blend_file}")
+else:
+    print("\n" + "="*50)
+    print("✅ Toutes les étapes sont à jour: fichier non modifié")
+    print("="*50)
+    print(f"📁 Fichier: {blend_file}")
 print("\n📊 Résumé:")
 print("   - 1 Substation (à modéliser manuellement)")
 print("   - 4 Power Blocks")
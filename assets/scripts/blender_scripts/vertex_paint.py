@@ -0,0 +1,140 @@
+"""
+Couleurs de vertex vectorisées (NumPy) pour les scripts Blender
+================================================================
+
+Toutes les fonctions travaillent par tableaux: lecture en bloc des sommets,
+des boucles (loop -> sommet) et des polygones par foreach_get, calcul des
+zones par masques NumPy, puis une seule écriture foreach_set dans l'attribut
+de couleur (domaine CORNER). Aucun accès Python par polygone ou par boucle:
+la peinture d'un maillage fusionné de tout un site (millions de sommets)
+prend quelques millisecondes.
+
+- ensure_color_attribute(): attribut de couleur actif du maillage
+- paint_polygons(): une couleur par polygone
+- paint_by_height(): couleur selon la hauteur du centre de chaque polygone
+- paint_by_material(): couleur selon l'indice de matériau (maillage de site
+  fusionné: les indices de matériau sont conservés par la fusion)
+- paint_vertices(): couleur sur un ensemble de sommets
+
+NumPy est fourni avec Blender.
+"""
+
+import numpy as np
+
+# Nom de l'attribut de couleur créé par défaut (exporté en COLOR_0 par glTF)
+COLOR_ATTRIBUTE = "Col"
+
+
+# ============================================================================
+# LECTURE EN BLOC
+# ============================================================================
+
+def _read(collection, attribute, dtype, components=1):
+    """foreach_get d'un attribut de toute une collection (vertices, loops, polygons)"""
+    values = np.empty(len(collection) * components, dtype=dtype)
+    collection.foreach_get(attribute, values)
+    return values.reshape(-1, components) if components > 1 else values
+
+
+def loop_polygon_index(mesh):
+    """Indice du polygone de chaque boucle (boucles contiguës par polygone)"""
+    loop_totals = _read(mesh.polygons, "loop_total", np.int32)
+    return np.repeat(np.arange(len(loop_totals), dtype=np.int32), loop_totals)
+
+
+def polygon_centers(mesh, axis=None):
+    """
+    Centre (moyenne des sommets) de chaque polygone: tableau (n, 3), ou
+    (n,) pour une seule coordonnée (axis 0, 1 ou 2)
+    """
+    coords = _read(mesh.vertices, "co", np.float32, 3)
+    if axis is not None:
+        coords = coords[:, axis]
+    loop_vertices = _read(mesh.loops, "vertex_index", np.int32)
+    loop_starts = _read(mesh.polygons, "loop_start", np.int32)
+    loop_totals = _read(mesh.polygons, "loop_total", np.int32)
+    sums = np.add.reduceat(coords[loop_vertices].astype(np.float64), loop_starts, axis=0)
+    return sums / (loop_totals if axis is not None else loop_totals[:, None])
+
+
+# ============================================================================
+# ATTRIBUT DE COULEUR
+# ============================================================================
+
+def ensure_color_attribute(mesh, name=COLOR_ATTRIBUTE):
+    """Attribut de couleur par coin (BYTE_COLOR), créé si besoin et rendu actif"""
+    attribute = mesh.color_attributes.get(name)
+    if attribute is None:
+        attribute = mesh.color_attributes.new(name=name, type='BYTE_COLOR', domain='CORNER')
+    mesh.color_attributes.active_color = attribute
+    return attribute
+
+
+def _color_property(attribute):
+    """
+    Propriété écrite: color_srgb si disponible (mêmes valeurs que l'ancien
+    mesh.vertex_colors, exprimées en sRGB), sinon color
+    """
+    if len(attribute.data) and hasattr(attribute.data[0], "color_srgb"):
+        return "color_srgb"
+    return "color"
+
+
+def write_loop_colors(mesh, loop_colors, name=COLOR_ATTRIBUTE):
+    """Écrit un tableau (n_boucles, 4) dans l'attribut de couleur, en un foreach_set"""
+    attribute = ensure_color_attribute(mesh, name)
+    attribute.data.foreach_set(_color_property(attribute),
+                               np.ascontiguousarray(loop_colors, dtype=np.float32).ravel())
+    mesh.update()
+    return attribute
+
+
+def read_loop_colors(mesh, name=COLOR_ATTRIBUTE):
+    """Couleurs actuelles de l'attribut, tableau (n_boucles, 4)"""
+    attribute = ensure_color_attribute(mesh, name)
+    return _read(attribute.data, _color_property(attribute), np.float32, 4)
+
+
+# ============================================================================
+# PEINTURE
+# ============================================================================
+
+def paint_polygons(mesh, polygon_colors, name=COLOR_ATTRIBUTE):
+    """Une couleur RGBA par polygone (tableau (n_polygones, 4)), étendue aux boucles"""
+    polygon_colors = np.asarray(polygon_colors, dtype=np.float32)
+    return write_loop_colors(mesh, polygon_colors[loop_polygon_index(mesh)], name)
+
+
+def paint_by_height(mesh, thresholds, colors, name=COLOR_ATTRIBUTE):
+    """
+    Couleur selon la hauteur Z du centre de chaque polygone.
+
+    Args:
+        thresholds: Seuils Z croissants (k valeurs)
+        colors: k + 1 couleurs RGBA: colors[i] pour thresholds[i-1] <= z < thresholds[i]
+            (colors[0] sous le premier seuil, colors[k] au-dessus du dernier)
+    """
+    zones = np.searchsorted(np.asarray(thresholds, dtype=np.float64), polygon_centers(mesh, axis=2), side="right")
+    return paint_polygons(mesh, np.asarray(colors, dtype=np.float32)[zones], name)
+
+
+def paint_by_material(mesh, colors, name=COLOR_ATTRIBUTE):
+    """Couleur selon l'indice de matériau de chaque polygone (colors[i] pour l'indice i)"""
+    material_indices = _read(mesh.polygons, "material_index", np.int32)
+    return paint_polygons(mesh, np.asarray(colors, dtype=np.float32)[material_indices], name)
+
+
+def paint_vertices(mesh, color, vertex_indices=None, name=COLOR_ATTRIBUTE):
+    """
+    Peint en color les boucles des sommets donnés (tous si None); les
+    autres boucles gardent leur couleur.
+    """
+    if vertex_indices is None:
+        loop_colors = np.empty((len(mesh.loops), 4), dtype=np.float32)
+        loop_colors[:] = color
+        return write_loop_colors(mesh, loop_colors, name)
+    selected = np.zeros(len(mesh.vertices), dtype=bool)
+    selected[np.asarray(list(vertex_indices), dtype=np.int64)] = True
+    loop_colors = read_loop_colors(mesh, name)
+    loop_colors[selected[_read(mesh.loops, "vertex_index", np.int32)]] = color
+    return write_loop_colors(mesh, loop_colors, name)
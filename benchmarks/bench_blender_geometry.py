@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de construction de géométrie dans Blender (containers HD5).
+
+Compare, pour 48, 500 et 5 000 containers HD5 détaillés (21 éléments
+chacun), le temps de génération :
+- ops      : bpy.ops.mesh.primitive_*_add + active_object + échelle
+             (ancienne construction des scripts Blender)
+- data     : mesh_primitives (from_pydata + foreach_set), mode détaillé
+             de generate_hd5_containers.py
+- instanced: duplicatas liés du maillage prototype (mode par défaut)
+
+Chaque mesure part d'une scène vide. À exécuter dans Blender :
+    blender -b --factory-startup -P benchmarks/bench_blender_geometry.py -- --counts 48,500,5000
+    blender -b --factory-startup -P benchmarks/bench_blender_geometry.py -- --methods data,instanced --output report.json
+
+La méthode ops croît plus vite que linéairement (chaque opérateur met à jour
+le depsgraph d'une scène de plus en plus grande) : à 5 000 containers elle
+peut prendre plusieurs dizaines de minutes.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+import bpy
+
+BLENDER_SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "assets" / "scripts" / "blender_scripts"
+sys.path.insert(0, str(BLENDER_SCRIPTS_DIR))
+
+from generate_hd5_containers import (create_hd5_container, create_hd5_instance,  # noqa: E402
+                                     get_hd5_materials, get_hd5_prototype_mesh, hd5_parts)
+
+DEFAULT_COUNTS = [48, 500, 5000]
+METHODS = ("ops", "data", "instanced")
+
+# Espacement des containers sur la grille de placement (m)
+GRID_PITCH_X = 16
+GRID_PITCH_Y = 6
+GRID_COLUMNS = 50
+
+
+# ============================================================================
+# MÉTHODES DE CONSTRUCTION
+# ============================================================================
+
+def container_position(index):
+    """Position du container index sur une grille de GRID_COLUMNS colonnes"""
+    return ((index % GRID_COLUMNS) * GRID_PITCH_X, (index // GRID_COLUMNS) * GRID_PITCH_Y, 0)
+
+
+def add_primitive_ops(name, primitive, location, size, rotation, parent, material):
+    """Un élément par opérateur: primitive_*_add puis active_object, échelle, parent"""
+    if primitive == 'CYLINDER':
+        bpy.ops.mesh.primitive_cylinder_add(radius=size[0], depth=size[1], location=location)
+    else:
+        bpy.ops.mesh.primitive_cube_add(size=1, location=location)
+    part = bpy.context.active_object
+    part.name = name
+    if primitive == 'BOX':
+        part.scale = size
+    part.rotation_euler = rotation
+    part.parent = parent
+    part.data.materials.append(material)
+
+
+def create_hd5_container_ops(name, position):
+    """Container HD5 détaillé construit par opérateurs (référence ops, 21 opérateurs)"""
+    group = bpy.data.objects.new(name, None)
+    group.location = position
+    bpy.context.collection.objects.link(group)
+    materials = get_hd5_materials()
+    for suffix, primitive, location, size, rotation, mat_name in hd5_parts():
+        material = materials[mat_name]
+        if primitive == 'GROOVED_PANEL':
+            # Corps puis une primitive par rainure, comme les anciens scripts
+            panel_size, grooves, pitch, groove_size, first_offset, face_gap = size
+            add_primitive_ops(f"{name}_{suffix}", 'BOX', location, panel_size, rotation, group, material)
+            for i in range(grooves):
+                groove_location = (location[0] - panel_size[0] / 2 + first_offset + i * pitch, location[1],
+                                   location[2] + panel_size[2] / 2 + face_gap)
+                add_primitive_ops(f"{name}_Groove_{i+1}", 'BOX', groove_location, groove_size, rotation,
+                                  group, material)
+        else:
+            add_primitive_ops(f"{name}_{suffix}", primitive, location, size, rotation, group, material)
+    return group
+
+
+def build(method, count):
+    """Génère count containers avec la méthode donnée"""
+    if method == "instanced":
+        mesh = get_hd5_prototype_mesh()
+    for i in range(count):
+        name = f"HD5_{i:05d}"
+        if method == "ops":
+            create_hd5_container_ops(name, container_position(i))
+        elif method == "data":
+            create_hd5_container(name, container_position(i))
+        else:
+            create_hd5_instance(name, container_position(i), mesh=mesh)
+    # Évaluation finale de la scène (incluse dans la mesure)
+    bpy.context.view_layer.update()
+
+
+def run(method, count):
+    """Mesure d'une méthode sur une scène vide"""
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    start = time.perf_counter()
+    build(method, count)
+    elapsed = time.perf_counter() - start
+    return {
+        "method": method,
+        "containers": count,
+        "seconds": round(elapsed, 3),
+        "objects": len(bpy.data.objects),
+        "meshes": len(bpy.data.meshes),
+    }
+
+
+# ============================================================================
+# RAPPORT
+# ============================================================================
+
+def print_table(results, counts, methods):
+    """Tableau des durées et accélération par rapport à ops"""
+    by_key = {(r["method"], r["containers"]): r for r in results}
+    print(f"\n{'Containers':>10} " + " ".join(f"{m:>12}" for m in methods) + "   Accélération / ops")
+    for count in counts:
+        row = [f"{by_key[(m, count)]['seconds']:>11.2f}s" for m in methods]
+        speedups = []
+        ops = by_key.get(("ops", count))
+        for m in methods:
+            if ops and m != "ops" and by_key[(m, count)]["seconds"] > 0:
+                speedups.append(f"{m} x{ops['seconds'] / by_key[(m, count)]['seconds']:.1f}")
+        print(f"{count:>10} " + " ".join(row) + "   " + ", ".join(speedups))
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Benchmark de construction de géométrie Blender (HD5)")
+    parser.add_argument("--counts", default=",".join(map(str, DEFAULT_COUNTS)),
+                        help="Nombres de containers, séparés par des virgules")
+    parser.add_argument("--methods", default=",".join(METHODS),
+                        help=f"Méthodes à mesurer parmi {','.join(METHODS)}")
+    parser.add_argument("--output", type=Path, default=None, help="Rapport JSON")
+    return parser.parse_args(argv)
+
+
+def main():
+    # Arguments du script: après "--" sur la ligne de commande de Blender
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    args = parse_args(argv)
+    counts = [int(c) for c in args.counts.split(",")]
+    methods = [m for m in args.methods.split(",") if m]
+    unknown = [m for m in methods if m not in METHODS]
+    if unknown:
+        print(f"ERREUR: méthode(s) inconnue(s): {', '.join(unknown)}")
+        return 1
+
+    results = []
+    for count in counts:
+        for method in methods:
+            result = run(method, count)
+            print(f"{method:>10} {count:>6} containers: {result['seconds']:.2f} s "
+                  f"({result['objects']} objets, {result['meshes']} maillages)")
+            results.append(result)
+
+    print_table(results, counts, methods)
+
+    if args.output:
+        report = {
+            "blender": bpy.app.version_string,
+            "platform": platform.platform(),
+            "results": results,
+        }
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nRapport écrit: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
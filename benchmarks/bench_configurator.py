@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark du configurateur Excel (scripts/generate_excel_configurator.py).
+
+Génère des configurations synthétiques de 5 MW à 2 GW et des bibliothèques
+de 10 à 10 000 équipements, puis mesure pour chaque scénario :
+- la durée de chaque phase (lecture JSON, chaque create_*_sheet,
+  génération du layout, remplissage LAYOUT, sauvegarde)
+- le pic de mémoire (RSS) du processus
+- la taille du fichier .xlsx produit
+
+Chaque scénario tourne dans un processus neuf pour que le pic RSS lui soit
+propre. Le rapport JSON peut être sauvegardé comme référence puis comparé
+aux exécutions suivantes pour détecter les régressions.
+
+Usage:
+    python3 benchmarks/bench_configurator.py --output report.json
+    python3 benchmarks/bench_configurator.py --save-baseline benchmarks/baseline.json
+    python3 benchmarks/bench_configurator.py --baseline benchmarks/baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+DEFAULT_POWERS_MW = [5, 25, 100, 500, 1000, 2000]
+DEFAULT_LIBRARY_SIZES = [10, 100, 1000, 10000]
+
+# Seuils de régression : relatif ET absolu (évite le bruit sur les phases courtes)
+DEFAULT_TOLERANCE = 0.25
+MIN_TIME_DELTA_S = 0.05
+MIN_RSS_DELTA_KB = 10 * 1024
+
+
+# ============================================================================
+# CONFIGURATIONS SYNTHÉTIQUES
+# ============================================================================
+
+def make_config(power_mw: float, library_size: int) -> Dict[str, Any]:
+    """
+    Construit une configuration complète au format mining_configurator_full_v2.json.
+
+    Le premier équipement de chaque bibliothèque est celui utilisé par les
+    calculs (HD5, TR_5MW, PB_25MW) ; les suivants sont des variantes.
+    """
+    containers = [{
+        "id": "HD5", "name": "HD5-1.6MW-400V-Mining-Container", "power_mw": 1.6,
+        "current_a": 2300, "cooling": ["air", "immersion"], "capex_usd": 420000,
+        "dimensions_m": {"length": 12, "width": 2.5}, "foundation": "RC40"
+    }]
+    transformers = [{
+        "id": "TR_5MW", "name": "TR-5MW-MT-BT", "power_mw": 5, "capex_usd": 180000,
+        "dimensions_m": {"length": 5, "width": 4}, "foundation": "RC40"
+    }]
+    powerblocks = [{
+        "id": "PB_25MW", "name": "PB-25MW", "power_mw": 25, "transformers": 5,
+        "redundancy_transformers": 1, "capex_usd": 1200000,
+        "dimensions_m": {"length": 20, "width": 10}, "foundation": "RC40"
+    }]
+    for i in range(1, library_size):
+        containers.append({
+            "id": f"CT_{i}", "name": f"Container variante {i}", "power_mw": round(1 + (i % 20) * 0.1, 2),
+            "current_a": 1500 + i % 1000, "cooling": ["air"] if i % 2 else ["immersion"],
+            "capex_usd": 300000 + i * 10, "dimensions_m": {"length": 12, "width": 2.5},
+            "foundation": "RC40"
+        })
+        transformers.append({
+            "id": f"TR_{i}", "name": f"Transformateur variante {i}", "power_mw": 2 + i % 8,
+            "capex_usd": 100000 + i * 10, "dimensions_m": {"length": 5, "width": 4},
+            "foundation": "RC40"
+        })
+        powerblocks.append({
+            "id": f"PB_{i}", "name": f"PowerBlock variante {i}", "power_mw": 10 + i % 40,
+            "transformers": 2 + i % 8, "redundancy_transformers": i % 2,
+            "capex_usd": 800000 + i * 10, "dimensions_m": {"length": 20, "width": 10},
+            "foundation": "RC40"
+        })
+
+    return {
+        "project_input": {
+            "project_name": f"Benchmark {power_mw} MW", "country": "QA",
+            "power_target_mw": power_mw, "future_power_mw": power_mw * 2,
+            "energy_type": "grid", "mining_type": "air", "surface_limit_m2": None,
+            "phasing": [{"power_mw": power_mw / 2}, {"power_mw": power_mw / 2}]
+        },
+        "equipment_library": {
+            "containers": containers,
+            "transformers": transformers,
+            "powerblocks": powerblocks
+        },
+        "energy_sources": {
+            "grid": {"buffer_required": False, "opex_usd_per_mwh": 50},
+            "generator": {"buffer_required": False, "opex_usd_per_mwh": 120},
+            "solar": {"buffer_required": True, "opex_usd_per_mwh": 10},
+            "wind": {"buffer_required": True, "opex_usd_per_mwh": 15},
+            "flare_gas": {"buffer_required": True, "opex_usd_per_mwh": 30},
+            "biogas": {"buffer_required": True, "opex_usd_per_mwh": 35}
+        },
+        "standards": {
+            "civil_work": {"layers": [
+                {"type": "gravel", "name": "Gravier", "thickness_cm": 20},
+                {"type": "sand", "name": "Sable", "thickness_cm": 10},
+                {"type": "concrete", "name": "Béton armé RC40", "thickness_cm": 30}
+            ]},
+            "rules": {
+                "container_atomic_unit": True,
+                "container_power_mw": 1.6,
+                "no_powerblock_below_mw": 20,
+                "powerblock_size_mw": 25,
+                "transformer_size_mw": 5,
+                "max_containers_per_transformer": 3,
+                "fuses_location": "container",
+                "bt_upstream_equipment": "switchgear"
+            }
+        },
+        "layout_engine": {
+            "defaults": {
+                "container_spacing_m": 3, "row_spacing_m": 10,
+                "road_width_m": 6, "grass_strip_width_m": 6
+            },
+            "rules": {
+                "road_around_each_container": True,
+                "road_around_each_row": True,
+                "grass_between_rows": True
+            },
+            "elements_dimensions": {
+                "HD5": {"length": 12.196, "width": 2.438},
+                "TR_5MW": {"length": 5, "width": 4}
+            }
+        }
+    }
+
+
+# ============================================================================
+# EXÉCUTION D'UN SCÉNARIO
+# ============================================================================
+
+def run_scenario(power_mw: float, library_size: int, streaming: bool) -> Dict[str, Any]:
+    """Exécute un scénario complet (appelé dans un processus dédié)"""
+    import generate_excel_configurator as gec
+
+    timings: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "config.json"
+        output_path = Path(tmp) / "configurator.xlsx"
+        json_path.write_text(json.dumps(make_config(power_mw, library_size)), encoding="utf-8")
+
+        total_start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            with gec.timed(timings, "read_json_config"):
+                config = gec.read_json_config(str(json_path))
+            wb = gec.build_workbook(config, streaming=streaming, timings=timings)
+            with gec.timed(timings, "save"):
+                wb.save(str(output_path))
+        total = time.perf_counter() - total_start
+        file_size = output_path.stat().st_size
+
+    elements = len(gec.compute_layout(config, gec.layout_power_target(config)))
+    return {
+        "power_mw": power_mw,
+        "library_size": library_size,
+        "streaming": streaming,
+        "layout_elements": elements,
+        "phases_s": {phase: round(value, 4) for phase, value in timings.items()},
+        "total_s": round(total, 4),
+        # ru_maxrss est en Ko sous Linux, en octets sous macOS
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // (1024 if sys.platform == "darwin" else 1),
+        "file_size_bytes": file_size
+    }
+
+
+def _run_scenario_args(args):
+    return run_scenario(*args)
+
+
+def run_all(powers: List[float], library_sizes: List[int], streaming: bool) -> Dict[str, Any]:
+    """Exécute tous les scénarios, un processus neuf par scénario"""
+    import openpyxl
+
+    scenarios = [(p, lib, streaming) for lib in library_sizes for p in powers]
+    results = []
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(processes=1, maxtasksperchild=1) as pool:
+        for result in pool.imap(_run_scenario_args, scenarios):
+            print(f"  {result['power_mw']:>6} MW | lib {result['library_size']:>5} | "
+                  f"{result['layout_elements']:>6} éléments | {result['total_s']:7.2f} s | "
+                  f"{result['peak_rss_kb'] / 1024:7.1f} Mo | {result['file_size_bytes'] / 1024:8.1f} Ko")
+            results.append(result)
+
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "openpyxl": openpyxl.__version__,
+            "platform": platform.platform(),
+            "streaming": streaming
+        },
+        "scenarios": results
+    }
+
+
+# ============================================================================
+# COMPARAISON AVEC LA RÉFÉRENCE
+# ============================================================================
+
+def compare_reports(report: Dict[str, Any], baseline: Dict[str, Any],
+                    tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """Retourne la liste des régressions du rapport par rapport à la référence"""
+    def key(scenario):
+        return (scenario["power_mw"], scenario["library_size"], scenario["streaming"])
+
+    reference = {key(s): s for s in baseline["scenarios"]}
+    regressions = []
+    for scenario in report["scenarios"]:
+        ref = reference.get(key(scenario))
+        if ref is None:
+            continue
+        label = f"{scenario['power_mw']} MW / lib {scenario['library_size']}"
+
+        checks = [("total_s", scenario["total_s"], ref["total_s"], MIN_TIME_DELTA_S, "s")]
+        for phase, value in scenario["phases_s"].items():
+            if phase in ref["phases_s"]:
+                checks.append((phase, value, ref["phases_s"][phase], MIN_TIME_DELTA_S, "s"))
+        checks.append(("peak_rss_kb", scenario["peak_rss_kb"], ref["peak_rss_kb"], MIN_RSS_DELTA_KB, "Ko"))
+        checks.append(("file_size_bytes", scenario["file_size_bytes"], ref["file_size_bytes"], 0, "o"))
+
+        for name, value, ref_value, min_delta, unit in checks:
+            if value > ref_value * (1 + tolerance) and value - ref_value > min_delta:
+                regressions.append(f"{label}: {name} {ref_value} -> {value} {unit} "
+                                   f"(+{(value / ref_value - 1) * 100 if ref_value else float('inf'):.0f}%)")
+    return regressions
+
+
+def parse_list(text: str, cast):
+    return [cast(value) for value in text.split(",") if value]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du configurateur Excel")
+    parser.add_argument("--powers", default=",".join(str(p) for p in DEFAULT_POWERS_MW),
+                        help="Puissances cibles en MW, séparées par des virgules")
+    parser.add_argument("--libraries", default=",".join(str(n) for n in DEFAULT_LIBRARY_SIZES),
+                        help="Tailles de bibliothèque d'équipements, séparées par des virgules")
+    parser.add_argument("--streaming", action="store_true", help="Mesure le mode --streaming")
+    parser.add_argument("--output", type=Path, help="Écrit le rapport JSON")
+    parser.add_argument("--save-baseline", type=Path, help="Écrit le rapport comme référence")
+    parser.add_argument("--baseline", type=Path, help="Compare le rapport à une référence")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Dégradation relative tolérée (0.25 = +25%%)")
+    args = parser.parse_args()
+
+    powers = parse_list(args.powers, float)
+    library_sizes = parse_list(args.libraries, int)
+
+    print(f"Benchmark configurateur: {len(powers) * len(library_sizes)} scénarios"
+          + (" (streaming)" if args.streaming else ""))
+    report = run_all(powers, library_sizes, args.streaming)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+            print(f"Rapport écrit: {path}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare_reports(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n⚠ {len(regressions)} régression(s) par rapport à {args.baseline}:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"\n✓ Aucune régression par rapport à {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark du stylage des cellules du configurateur Excel.
+
+Compare l'ancienne approche (un dictionnaire Font/Border/Side/PatternFill
+alloué puis appliqué par setattr pour chaque cellule) aux styles nommés
+enregistrés une fois par workbook (SheetWriter / apply_style).
+Chaque mesure inclut écriture des valeurs, stylage et sauvegarde.
+
+Usage: python3 benchmarks/bench_styles.py [--rows 20000]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Border, PatternFill, Side
+
+import generate_excel_configurator as gec
+
+COLUMNS = 9
+
+
+def legacy_cell_style():
+    """Style de cellule tel qu'il était construit avant le registre (une allocation par appel)"""
+    return {
+        'border': Border(
+            left=Side(style='thin'),
+            right=Side(style='thin'),
+            top=Side(style='thin'),
+            bottom=Side(style='thin')
+        ),
+        'alignment': Alignment(vertical="center")
+    }
+
+
+def legacy_editable_style():
+    """Style des cellules modifiables tel qu'il était construit avant le registre"""
+    return {
+        'fill': PatternFill(start_color="E2EFDA", end_color="E2EFDA", fill_type="solid"),
+        'border': Border(
+            left=Side(style='thin'),
+            right=Side(style='thin'),
+            top=Side(style='thin'),
+            bottom=Side(style='thin')
+        )
+    }
+
+
+def layout_rows(count: int):
+    """Lignes au format de l'onglet LAYOUT"""
+    for i in range(count):
+        yield [f"HD5-{i + 1}", "Container", i * 15.196, 6.0, 0, 1, 12.196, 2.438, '']
+
+
+def save(wb: Workbook) -> None:
+    """Sauvegarde dans un fichier temporaire (inclus dans la mesure)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        wb.save(str(Path(tmp) / "bench.xlsx"))
+
+
+def bench_legacy(rows: int) -> float:
+    """Stylage cellule par cellule avec des objets de style neufs"""
+    wb = Workbook()
+    ws = wb.active
+    start = time.perf_counter()
+    for row, values in enumerate(layout_rows(rows), start=6):
+        for col, value in enumerate(values, start=1):
+            ws.cell(row=row, column=col, value=value)
+        for col in (3, 4, 5):
+            cell = ws.cell(row=row, column=col)
+            for key, value in legacy_editable_style().items():
+                setattr(cell, key, value)
+        for col in (1, 2, 6, 7, 8, 9):
+            cell = ws.cell(row=row, column=col)
+            for key, value in legacy_cell_style().items():
+                setattr(cell, key, value)
+    save(wb)
+    return time.perf_counter() - start
+
+
+def bench_named(rows: int, streaming: bool = False) -> float:
+    """Stylage par styles nommés via SheetWriter.append_rows"""
+    wb = Workbook(write_only=streaming)
+    ws = wb.create_sheet("LAYOUT")
+    start = time.perf_counter()
+    writer = gec.SheetWriter(ws, start_row=6)
+    writer.append_rows(layout_rows(rows), style=gec.STYLE_CELL,
+                       styles={3: gec.STYLE_EDITABLE, 4: gec.STYLE_EDITABLE, 5: gec.STYLE_EDITABLE})
+    save(wb)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Débit de stylage des cellules (cellules/s)")
+    parser.add_argument("--rows", type=int, default=20000, help="Nombre de lignes LAYOUT")
+    args = parser.parse_args()
+
+    cells = args.rows * COLUMNS
+    results = [
+        ("avant  (dict par cellule)", bench_legacy(args.rows)),
+        ("après  (styles nommés)", bench_named(args.rows)),
+        ("après  (styles nommés, streaming)", bench_named(args.rows, streaming=True)),
+    ]
+
+    print(f"{args.rows} lignes x {COLUMNS} colonnes = {cells} cellules")
+    baseline = results[0][1]
+    for label, elapsed in results:
+        print(f"  {label:<36} {elapsed:7.2f} s  {cells / elapsed:>10,.0f} cellules/s  x{baseline / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Raccordement des containers aux transformateurs et longueurs de câbles BT
+
+Le layout place un transformateur par bloc de containers sans dire quel
+transformateur alimente quel container. Ce module affecte chaque container
+à un transformateur (au plus max_containers_per_transformer containers par
+transformateur) en minimisant la longueur totale de câble BT :
+
+1. Paires candidates: les CANDIDATES transformateurs les plus proches de
+   chaque container, par un KD-tree en distance de Manhattan
+   (scipy.spatial.cKDTree) ; sans SciPy, recherche exhaustive (par blocs
+   NumPy, ou en Python)
+2. Affectation de coût minimal sur ces paires: couplage biparti de poids
+   minimal (scipy.sparse.csgraph.min_weight_full_bipartite_matching) entre
+   les containers et les places des transformateurs ; sans SciPy,
+   affectation gloutonne par longueur croissante
+3. Tant que des containers restent sans place alors que des
+   transformateurs en ont: leurs CANDIDATES transformateurs libres les plus
+   proches sont ajoutés à leurs candidats et l'affectation est recalculée
+
+Phasage: un container n'est raccordé qu'à un transformateur construit au
+plus tard dans sa phase (candidats cherchés, phase par phase, parmi les
+transformateurs des phases 1..k). Un container n'est laissé non raccordé
+que si la capacité de ces transformateurs est insuffisante.
+
+Tracé des câbles: en L le long de la grille orthogonale des routes (le long
+de la ligne puis en travers), du centre du container au centre du
+transformateur, soit la distance de Manhattan entre les deux.
+
+Usage: python3 scripts/cable_engine.py --config <fichier.json> [--power 600]
+"""
+
+import argparse
+import heapq
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy optionnel: recherche et affectation en Python
+    np = None
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+    from scipy.spatial import cKDTree
+except ImportError:  # SciPy optionnel: recherche exhaustive et affectation gloutonne
+    cKDTree = None
+
+from config_loader import ConfigError, load_config
+from layout_checks import footprint
+from layout_engine import TYPE_CONTAINER, TYPE_TRANSFORMER, compute_layout
+from layout_geometry import PRECISION, footprint_array
+
+# Transformateurs candidats par container (les plus proches)
+CANDIDATES = 16
+
+# Containers par bloc de la recherche exhaustive NumPy (mémoire: bloc x transformateurs)
+BRUTE_FORCE_CHUNK = 1024
+
+# Point (x, y) en mètres
+Point = Tuple[float, float]
+
+
+# ============================================================================
+# EXTRÉMITÉS DES CÂBLES
+# ============================================================================
+
+def element_centres(layout: Sequence, element_type: str) -> Tuple[List[int], List[Point], List[int]]:
+    """(indices dans le layout, centres des empreintes, phases) des éléments d'un type"""
+    data = getattr(layout, "data", None)
+    if data is not None:  # LayoutArray: sans construire de dicts
+        code = {"Container": TYPE_CONTAINER, "Transformateur": TYPE_TRANSFORMER}[element_type]
+        indices = np.flatnonzero(data["type"] == code)
+        boxes = footprint_array(data[indices])
+        centres = np.stack(((boxes[:, 0] + boxes[:, 2]) / 2, (boxes[:, 1] + boxes[:, 3]) / 2), axis=1)
+        return indices.tolist(), [tuple(point) for point in centres.tolist()], data["phase"][indices].tolist()
+    indices, centres, phases = [], [], []
+    for index, item in enumerate(layout):
+        if item["type"] == element_type:
+            x0, y0, x1, y1 = footprint(item["x"], item["y"], item["length"], item["width"], item["rotation"])
+            indices.append(index)
+            centres.append(((x0 + x1) / 2, (y0 + y1) / 2))
+            phases.append(item["phase"])
+    return indices, centres, phases
+
+
+def manhattan(a: Point, b: Point) -> float:
+    """Longueur d'un tracé en L entre deux points (m)"""
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+# ============================================================================
+# PAIRES CANDIDATES
+# ============================================================================
+
+def nearest_transformers(containers: List[Point], transformers: List[Point], k: int) -> List[List[Tuple[float, int]]]:
+    """
+    Pour chaque container, les k transformateurs les plus proches en distance
+    de Manhattan: liste de (longueur, indice du transformateur) triée
+    """
+    k = min(k, len(transformers))
+    if not containers or not k:
+        return [[] for _ in containers]
+    if np is None:
+        return [heapq.nsmallest(k, ((manhattan(point, target), t) for t, target in enumerate(transformers)))
+                for point in containers]
+
+    points, targets = np.array(containers), np.array(transformers)
+    if cKDTree is not None:
+        _, nearest = cKDTree(targets).query(points, k=k, p=1)
+        nearest = nearest.reshape(len(points), k)
+    else:
+        nearest = np.empty((len(points), k), dtype=np.int64)
+        for start in range(0, len(points), BRUTE_FORCE_CHUNK):
+            chunk = points[start:start + BRUTE_FORCE_CHUNK]
+            distances = (np.abs(chunk[:, None, 0] - targets[None, :, 0])
+                         + np.abs(chunk[:, None, 1] - targets[None, :, 1]))
+            nearest[start:start + len(chunk)] = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    # Longueurs recalculées comme manhattan() (mêmes valeurs quel que soit le chemin)
+    lengths = (np.abs(points[:, None, 0] - targets[nearest, 0])
+               + np.abs(points[:, None, 1] - targets[nearest, 1]))
+    return [sorted(zip(row_lengths, row_nearest))
+            for row_lengths, row_nearest in zip(lengths.tolist(), nearest.tolist())]
+
+
+def phase_candidates(containers: List[Point], container_phases: List[int], transformers: List[Point],
+                     transformer_phases: List[int], k: int,
+                     allowed: Sequence[int] = None) -> List[List[Tuple[float, int]]]:
+    """
+    nearest_transformers() restreint, pour chaque container, aux
+    transformateurs de phase inférieure ou égale à la sienne (et de allowed
+    si fourni): une recherche par phase de containers
+    """
+    allowed = range(len(transformers)) if allowed is None else allowed
+    candidates: List[List[Tuple[float, int]]] = [[] for _ in containers]
+    by_phase: Dict[int, List[int]] = {}
+    for c, phase in enumerate(container_phases):
+        by_phase.setdefault(phase, []).append(c)
+    for phase, members in by_phase.items():
+        admissible = [t for t in allowed if transformer_phases[t] <= phase]
+        rows = nearest_transformers([containers[c] for c in members], [transformers[t] for t in admissible], k)
+        for c, row in zip(members, rows):
+            candidates[c] = [(length, admissible[t]) for length, t in row]
+    return candidates
+
+
+# ============================================================================
+# AFFECTATION
+# ============================================================================
+
+def _optimal_assignment(candidates: List[List[Tuple[float, int]]], capacity: int,
+                        num_transformers: int) -> List[int]:
+    """
+    Affectation de longueur totale minimale sur les paires candidates
+    (SciPy): couplage biparti de poids minimal entre containers et places
+    (capacity places par transformateur). Chaque container dispose aussi
+    d'une place "non raccordé" propre, plus chère que toute chaîne de
+    réaffectations: le nombre de containers raccordés est maximal.
+    """
+    count = len(candidates)
+    slots = num_transformers * capacity
+    lengths = np.array([length for row in candidates for length, _ in row])
+    nearest = np.array([t for row in candidates for _, t in row], dtype=np.int64)
+    rows = np.repeat(np.arange(count), [len(row) for row in candidates])
+    penalty = (float(lengths.max(initial=0.0)) + 1) * (count + 1)
+    matrix = csr_matrix((
+        # +1: un poids nul serait une arête absente de la matrice creuse (chaque
+        # container étant couplé une fois, le décalage ne change pas l'optimum)
+        np.concatenate((np.repeat(lengths, capacity), np.full(count, penalty))) + 1,
+        (np.concatenate((np.repeat(rows, capacity), np.arange(count))),
+         np.concatenate(((nearest[:, None] * capacity + np.arange(capacity)).ravel(),
+                         slots + np.arange(count))))
+    ), shape=(count, slots + count))
+    matched_rows, matched = min_weight_full_bipartite_matching(matrix)
+    feeders = np.full(count, -1, dtype=np.int64)
+    feeders[matched_rows] = np.where(matched < slots, matched // capacity, -1)
+    return feeders.tolist()
+
+
+def _greedy_assignment(candidates: List[List[Tuple[float, int]]], capacity: int,
+                       num_transformers: int) -> List[int]:
+    """Affectation gloutonne: paires candidates par longueur croissante, si le transformateur a une place"""
+    feeders = [-1] * len(candidates)
+    load = [0] * num_transformers
+    pairs = sorted((length, container, t) for container, row in enumerate(candidates) for length, t in row)
+    for _, container, t in pairs:
+        if feeders[container] < 0 and load[t] < capacity:
+            feeders[container] = t
+            load[t] += 1
+    return feeders
+
+
+def assign_transformers(containers: List[Point], transformers: List[Point], capacity: int,
+                        candidates: int = CANDIDATES, container_phases: List[int] = None,
+                        transformer_phases: List[int] = None) -> Tuple[List[int], str]:
+    """
+    Transformateur (indice dans transformers, -1: non raccordé) de chaque
+    container, au plus capacity containers par transformateur, de phase
+    inférieure ou égale à celle du container (phases omises: toutes égales).
+
+    Returns:
+        (transformateur de chaque container, méthode: "optimale" ou "gloutonne")
+    """
+    method = "optimale" if cKDTree is not None else "gloutonne"
+    if not containers or not transformers or capacity < 1:
+        return [-1] * len(containers), method
+    container_phases = container_phases or [1] * len(containers)
+    transformer_phases = transformer_phases or [1] * len(transformers)
+    assign = _optimal_assignment if cKDTree is not None else _greedy_assignment
+    pairs = phase_candidates(containers, container_phases, transformers, transformer_phases, candidates)
+    while True:
+        feeders = assign(pairs, capacity, len(transformers))
+        load = [0] * len(transformers)
+        for t in feeders:
+            if t >= 0:
+                load[t] += 1
+        unassigned = [container for container, t in enumerate(feeders) if t < 0]
+        free = [t for t in range(len(transformers)) if load[t] < capacity]
+        if not unassigned or not free:
+            return feeders, method
+        # Un transformateur libre candidat aurait été affecté: chaque passe
+        # ajoute des paires, jusqu'à ce qu'aucun container non raccordé n'ait
+        # de transformateur libre de sa phase hors de ses candidats
+        extra = phase_candidates([containers[c] for c in unassigned], [container_phases[c] for c in unassigned],
+                                 transformers, transformer_phases, candidates, free)
+        added = False
+        for container, row in zip(unassigned, extra):
+            known = {t for _, t in pairs[container]}
+            new = [(length, t) for length, t in row if t not in known]
+            if new:
+                pairs[container] = sorted(pairs[container] + new)
+                added = True
+        if not added:
+            return feeders, method
+
+
+# ============================================================================
+# PLAN DE CÂBLAGE
+# ============================================================================
+
+def cable_plan(layout: Sequence, config: Dict[str, Any], candidates: int = CANDIDATES) -> Dict[str, Any]:
+    """
+    Raccordement des containers d'un layout et longueurs de câbles BT.
+
+    Returns:
+        Dictionnaire:
+        - containers: indices des containers dans le layout
+        - feeders: indice dans le layout du transformateur de chaque container
+          (-1: non raccordé)
+        - lengths: longueur de câble de chaque container (m, 0 si non raccordé)
+        - phases: phase de construction de chaque container
+        - total_m, max_m: longueur totale et plus long câble (m)
+        - connected, unassigned: nombre de containers raccordés / non raccordés
+        - transformers, capacity: transformateurs et containers par transformateur
+        - method: "optimale" (SciPy) ou "gloutonne"
+        - seconds: durée du calcul
+    """
+    start = time.perf_counter()
+    capacity = config["standards"]["rules"]["max_containers_per_transformer"]
+    container_indices, container_centres, phases = element_centres(layout, "Container")
+    transformer_indices, transformer_centres, transformer_phases = element_centres(layout, "Transformateur")
+
+    feeders, method = assign_transformers(container_centres, transformer_centres, capacity, candidates,
+                                          phases, transformer_phases)
+    lengths = [round(manhattan(point, transformer_centres[t]), PRECISION) if t >= 0 else 0.0
+               for point, t in zip(container_centres, feeders)]
+    connected = sum(1 for t in feeders if t >= 0)
+    return {
+        "containers": container_indices,
+        "feeders": [transformer_indices[t] if t >= 0 else -1 for t in feeders],
+        "lengths": lengths,
+        "phases": phases,
+        "total_m": round(sum(lengths), PRECISION),
+        "max_m": max(lengths, default=0.0),
+        "connected": connected,
+        "unassigned": len(feeders) - connected,
+        "transformers": len(transformer_indices),
+        "capacity": capacity,
+        "method": method,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def phase_cable_lengths(plan: Dict[str, Any], num_phases: int) -> List[float]:
+    """Longueur de câble (m) des containers de chaque phase (phases 1..num_phases)"""
+    totals = [0.0] * num_phases
+    for length, phase in zip(plan["lengths"], plan["phases"]):
+        totals[min(max(phase, 1), num_phases) - 1] += length
+    return [round(total, PRECISION) for total in totals]
+
+
+def cable_length(layout: Sequence, config: Dict[str, Any]) -> float:
+    """Longueur totale de câble BT d'un layout (m)"""
+    return cable_plan(layout, config)["total_m"]
+
+
+def print_summary(plan: Dict[str, Any]) -> None:
+    """Résumé lisible d'un plan de câblage"""
+    count = len(plan["containers"])
+    print(f"Containers: {count}, transformateurs: {plan['transformers']} "
+          f"({plan['capacity']} containers max par transformateur)")
+    print(f"Raccordés: {plan['connected']}, non raccordés: {plan['unassigned']}"
+          + (" (capacité insuffisante)" if plan["unassigned"] else ""))
+    mean = plan["total_m"] / plan["connected"] if plan["connected"] else 0.0
+    print(f"Câbles BT: {plan['total_m']:,.1f} m (moyenne {mean:.1f} m, max {plan['max_m']:.1f} m)")
+    print(f"Affectation {plan['method']} en {plan['seconds']:.3f} s")
+
+
+def main(argv: List[str] = None):
+    """Affiche le plan de câblage du layout d'une puissance"""
+    parser = argparse.ArgumentParser(description="Raccordement containers -> transformateurs et câbles BT")
+    parser.add_argument("--config", type=Path, required=True, help="Fichier JSON de configuration")
+    parser.add_argument("--power", type=float, default=None, help="Puissance IT (MW), défaut: project_input")
+    parser.add_argument("--candidates", type=int, default=CANDIDATES,
+                        help="Transformateurs candidats par container")
+    args = parser.parse_args(argv)
+
+    try:
+        config = load_config(str(args.config))
+    except ConfigError as exc:
+        print(f"ERREUR: {exc}")
+        return 1
+    power = args.power if args.power is not None else config["project_input"].get("power_target_mw", 50)
+
+    plan = cable_plan(compute_layout(config, power, merge=False), config, args.candidates)
+    print_summary(plan)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
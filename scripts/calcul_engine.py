@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Moteur de calcul du configurateur Mining
+
+Calcule en Python les mêmes grandeurs que l'onglet CALCUL_ENGINE
+(quantités, CAPEX, OPEX annuel) à partir de la configuration JSON, sans
+passer par Excel. La longueur de câbles BT vient du raccordement des
+containers aux transformateurs du layout (cable_engine). Les constantes
+ci-dessous sont aussi celles utilisées dans les formules de l'onglet.
+
+- calculate() : un scénario, dictionnaire de valeurs Python
+- calculate_batch() : plusieurs scénarios en une passe (tableaux NumPy si
+  disponible, sinon listes), mêmes valeurs que calculate()
+- calculate_phases() : puissance et CAPEX cumulés à la fin de chaque phase
+  de project_input.phasing
+
+Usage: python3 scripts/calcul_engine.py --config <fichier.json> [--power 100] [--energy grid]
+"""
+
+import argparse
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy optionnel: repli sur calculate() scénario par scénario
+    np = None
+
+from cable_engine import cable_plan
+from config_loader import get_equipment, load_config
+from layout_engine import compute_layout
+from layout_geometry import cumulative_surfaces, layout_surfaces
+
+# Coût du génie civil (USD par m² de surface au sol du layout)
+CIVIL_COST_USD_PER_M2 = 100
+
+# Coût des câbles BT transformateur -> container (USD par mètre de tracé,
+# conducteurs en parallèle et pose compris)
+CABLE_COST_USD_PER_M = 350
+
+# Maintenance annuelle (fraction du CAPEX total)
+MAINTENANCE_RATE = 0.02
+
+# Heures de fonctionnement par an
+HOURS_PER_YEAR = 8760
+
+# Types de mining proposés dans INPUT_PROJECT
+MINING_TYPES = ("air", "immersion")
+
+
+# ============================================================================
+# SÉLECTION DES ÉQUIPEMENTS
+# ============================================================================
+
+def select_container(config: Dict[str, Any], mining_type: str = None) -> Dict[str, Any]:
+    """Premier container compatible avec le type de refroidissement (à défaut, le premier de la bibliothèque)"""
+    containers = config["equipment_library"]["containers"]
+    if mining_type:
+        for container in containers:
+            if mining_type in container.get("cooling", []):
+                return container
+    return containers[0]
+
+
+# ============================================================================
+# CALCULS
+# ============================================================================
+
+def layout_surface(layout: Sequence) -> float:
+    """Surface totale du layout (m²): union des empreintes, zones communes comptées une fois (LAYOUT!B1)"""
+    return layout_surfaces(layout)["Total"]
+
+
+def layout_phase_surfaces(layout: Sequence, num_phases: int) -> List[float]:
+    """
+    Surface (m²) ajoutée par chaque phase (phases 1..num_phases): leur cumul
+    jusqu'à la phase k est la surface de l'union des éléments des phases 1..k
+    """
+    cumulative = cumulative_surfaces(layout, num_phases)
+    return [surface - (cumulative[k - 1] if k else 0.0) for k, surface in enumerate(cumulative)]
+
+
+def calculate_quantities(config: Dict[str, Any], power_mw: float) -> Dict[str, int]:
+    """Quantités de containers, transformateurs et PowerBlocks (bloc CALCULS QUANTITÉS)"""
+    rules = config["standards"]["rules"]
+    if power_mw < rules["no_powerblock_below_mw"]:
+        powerblocks = 0
+    else:
+        powerblocks = math.ceil(power_mw / rules["powerblock_size_mw"])
+    return {
+        "containers": math.ceil(power_mw / rules["container_power_mw"]),
+        "transformers": math.ceil(power_mw / rules["transformer_size_mw"]),
+        "powerblocks": powerblocks,
+    }
+
+
+def calculate(config: Dict[str, Any], power_mw: float = None, energy_type: str = None,
+              mining_type: str = None, surface_m2: float = None,
+              cable_length_m: float = None) -> Dict[str, Any]:
+    """
+    Calcule un scénario complet (équivalent des valeurs de CALCUL_ENGINE).
+
+    Args:
+        config: Configuration JSON
+        power_mw, energy_type, mining_type: Paramètres du scénario (par défaut
+            ceux de project_input)
+        surface_m2: Surface du layout si déjà connue (sinon le layout est généré)
+        cable_length_m: Longueur de câbles BT si déjà connue (sinon calculée
+            sur le layout, voir cable_engine)
+
+    Returns:
+        Dictionnaire plat: paramètres, quantités, lignes CAPEX et OPEX (USD)
+    """
+    project_input = config["project_input"]
+    if power_mw is None:
+        power_mw = project_input.get("power_target_mw", 0)
+    if energy_type is None:
+        energy_type = project_input.get("energy_type", "grid")
+    if mining_type is None:
+        mining_type = project_input.get("mining_type", "air")
+    if surface_m2 is None or cable_length_m is None:
+        layout = compute_layout(config, power_mw, merge=False)
+        if surface_m2 is None:
+            surface_m2 = layout_surface(layout)
+        if cable_length_m is None:
+            cable_length_m = cable_plan(layout, config)["total_m"]
+
+    quantities = calculate_quantities(config, power_mw)
+
+    capex_containers = quantities["containers"] * select_container(config, mining_type)["capex_usd"]
+    capex_transformers = quantities["transformers"] * get_equipment(config, "transformers")["capex_usd"]
+    capex_powerblocks = quantities["powerblocks"] * get_equipment(config, "powerblocks")["capex_usd"]
+    capex_civil = surface_m2 * CIVIL_COST_USD_PER_M2
+    capex_cables = cable_length_m * CABLE_COST_USD_PER_M
+    capex_total = capex_containers + capex_transformers + capex_powerblocks + capex_civil + capex_cables
+
+    opex_electricity = power_mw * HOURS_PER_YEAR * config["energy_sources"][energy_type]["opex_usd_per_mwh"]
+    opex_maintenance = capex_total * MAINTENANCE_RATE
+
+    return {
+        "power_mw": power_mw,
+        "energy_type": energy_type,
+        "mining_type": mining_type,
+        **quantities,
+        "surface_m2": surface_m2,
+        "cable_length_m": cable_length_m,
+        "capex_containers": capex_containers,
+        "capex_transformers": capex_transformers,
+        "capex_powerblocks": capex_powerblocks,
+        "capex_civil": capex_civil,
+        "capex_cables": capex_cables,
+        "capex_total": capex_total,
+        "opex_electricity": opex_electricity,
+        "opex_maintenance": opex_maintenance,
+        "opex_total": opex_electricity + opex_maintenance,
+    }
+
+
+def calculate_batch(config: Dict[str, Any], power_mw: Sequence[float], energy_type: Sequence[str],
+                    mining_type: Sequence[str], surface_m2: Sequence[float],
+                    cable_length_m: Sequence[float]) -> Dict[str, Sequence]:
+    """
+    Calcule n scénarios en une passe (arguments de même longueur n).
+
+    Returns:
+        Mêmes clés que calculate(), chaque valeur étant une séquence de n
+        éléments (tableau NumPy si disponible, sinon liste)
+    """
+    if np is None:
+        rows = [calculate(config, *scenario, surface_m2=surface, cable_length_m=cable)
+                for *scenario, surface, cable in zip(power_mw, energy_type, mining_type, surface_m2, cable_length_m)]
+        return {key: [row[key] for row in rows] for key in rows[0]} if rows else {}
+
+    rules = config["standards"]["rules"]
+    power = np.asarray(power_mw, dtype=np.float64)
+    surface = np.asarray(surface_m2, dtype=np.float64)
+    cable = np.asarray(cable_length_m, dtype=np.float64)
+
+    # Prix par scénario: table de correspondance type -> valeur, puis indexation
+    energy_names, energy_index = np.unique(np.asarray(energy_type, dtype=object).astype(str), return_inverse=True)
+    mining_names, mining_index = np.unique(np.asarray(mining_type, dtype=object).astype(str), return_inverse=True)
+    energy_opex = np.array([config["energy_sources"][name]["opex_usd_per_mwh"] for name in energy_names])[energy_index]
+    container_capex = np.array([select_container(config, name)["capex_usd"] for name in mining_names])[mining_index]
+
+    containers = np.ceil(power / rules["container_power_mw"]).astype(np.int64)
+    transformers = np.ceil(power / rules["transformer_size_mw"]).astype(np.int64)
+    powerblocks = np.where(power < rules["no_powerblock_below_mw"], 0,
+                           np.ceil(power / rules["powerblock_size_mw"])).astype(np.int64)
+
+    capex_containers = containers * container_capex
+    capex_transformers = transformers * get_equipment(config, "transformers")["capex_usd"]
+    capex_powerblocks = powerblocks * get_equipment(config, "powerblocks")["capex_usd"]
+    capex_civil = surface * CIVIL_COST_USD_PER_M2
+    capex_cables = cable * CABLE_COST_USD_PER_M
+    # Même ordre d'addition que calculate() (résultats identiques au bit près)
+    capex_total = capex_containers + capex_transformers + capex_powerblocks + capex_civil + capex_cables
+
+    opex_electricity = power * HOURS_PER_YEAR * energy_opex
+    opex_maintenance = capex_total * MAINTENANCE_RATE
+
+    return {
+        "power_mw": np.asarray(power_mw),
+        "energy_type": energy_names[energy_index],
+        "mining_type": mining_names[mining_index],
+        "containers": containers,
+        "transformers": transformers,
+        "powerblocks": powerblocks,
+        "surface_m2": surface,
+        "cable_length_m": cable,
+        "capex_containers": capex_containers,
+        "capex_transformers": capex_transformers,
+        "capex_powerblocks": capex_powerblocks,
+        "capex_civil": capex_civil,
+        "capex_cables": capex_cables,
+        "capex_total": capex_total,
+        "opex_electricity": opex_electricity,
+        "opex_maintenance": opex_maintenance,
+        "opex_total": opex_electricity + opex_maintenance,
+    }
+
+
+def batch_rows(batch: Dict[str, Sequence]) -> List[Dict[str, Any]]:
+    """Résultat de calculate_batch() en liste de dicts (valeurs Python natives)"""
+    columns = {key: values.tolist() if hasattr(values, "tolist") else list(values)
+               for key, values in batch.items()}
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def calculate_phases(config: Dict[str, Any], phase_surfaces: Sequence[float],
+                     phase_cables: Sequence[float]) -> List[Dict[str, Any]]:
+    """
+    Évolution par phase (project_input.phasing), en une passe.
+
+    Le CAPEX cumulé de la phase k est celui du site à la fin de la phase k:
+    puissance cumulée des phases 1..k, surface et câbles BT des éléments de
+    ces phases (phase_surfaces, phase_cables: valeurs par phase, voir
+    layout_phase_surfaces et cable_engine.phase_cable_lengths).
+
+    Returns:
+        Une entrée par phase: phase, power_mw, cumulative_power_mw,
+        capex_usd (CAPEX de la phase) et cumulative_capex_usd
+    """
+    phasing = config["project_input"].get("phasing") or []
+    if not phasing:
+        return []
+    project_input = config["project_input"]
+    powers = [phase["power_mw"] for phase in phasing]
+    cumulative_powers, cumulative_surfaces, cumulative_cables = [], [], []
+    power_total = surface_total = cable_total = 0
+    for power, surface, cable in zip(powers, phase_surfaces, phase_cables):
+        power_total += power
+        surface_total += surface
+        cable_total += cable
+        cumulative_powers.append(power_total)
+        cumulative_surfaces.append(surface_total)
+        cumulative_cables.append(cable_total)
+
+    count = len(cumulative_powers)
+    batch = calculate_batch(config, cumulative_powers,
+                            [project_input.get("energy_type", "grid")] * count,
+                            [project_input.get("mining_type", "air")] * count,
+                            cumulative_surfaces, cumulative_cables)
+    cumulative_capex = list(batch["capex_total"])
+    return [
+        {
+            "phase": k + 1,
+            "power_mw": powers[k],
+            "cumulative_power_mw": cumulative_powers[k],
+            "capex_usd": float(cumulative_capex[k] - (cumulative_capex[k - 1] if k else 0)),
+            "cumulative_capex_usd": float(cumulative_capex[k]),
+        }
+        for k in range(count)
+    ]
+
+
+def main(argv: List[str] = None):
+    """Affiche les valeurs de CALCUL_ENGINE d'un scénario au format JSON"""
+    parser = argparse.ArgumentParser(description="Valeurs CALCUL_ENGINE d'un scénario (JSON)")
+    parser.add_argument("--config", type=Path, required=True, help="Fichier JSON de configuration")
+    parser.add_argument("--power", type=float, default=None, help="Puissance IT (MW), défaut: project_input")
+    parser.add_argument("--energy", default=None, help="Type d'énergie, défaut: project_input")
+    parser.add_argument("--mining", default=None, help="Type mining, défaut: project_input")
+    args = parser.parse_args(argv)
+
+    config = load_config(str(args.config))
+    print(json.dumps(calculate(config, args.power, args.energy, args.mining), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Chargement de la configuration du configurateur Mining
+
+load_config() lit le JSON, valide le schéma une seule fois et construit des
+index par id (containers, transformateurs, PowerBlocks, sources d'énergie,
+dimensions du layout). Le résultat compilé est mis en cache sur disque
+(pickle), sous l'empreinte SHA-256 du fichier : les exécutions suivantes
+sur le même fichier sautent le parsing et la validation.
+
+Le cache est placé dans $MINING_CONFIG_CACHE_DIR (par défaut
+~/.cache/mining_configurator). Il ne contient que des configurations
+compilées localement ; le supprimer est sans risque.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from numbers import Real
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Version du format compilé: à incrémenter si LoadedConfig ou la validation
+# changent, pour invalider les caches existants
+CACHE_VERSION = 2
+
+# Bibliothèques d'équipements indexées par id
+LIBRARIES = ("containers", "transformers", "powerblocks")
+
+# Règles numériques strictement positives de standards.rules
+POSITIVE_RULES = ("container_power_mw", "transformer_size_mw", "powerblock_size_mw",
+                  "max_containers_per_transformer")
+
+
+class ConfigError(ValueError):
+    """Configuration invalide (la liste des erreurs est dans .errors)"""
+
+    def __init__(self, path: str, errors: List[str]):
+        self.errors = errors
+        super().__init__(f"{path}: configuration invalide\n" + "\n".join(f"  - {e}" for e in errors))
+
+
+class LoadedConfig(dict):
+    """
+    Configuration JSON (dict inchangé) accompagnée de ses index par id:
+    containers, transformers, powerblocks, energy_sources et
+    elements_dimensions (id -> entrée de la configuration).
+    """
+
+    def __init__(self, config: Dict[str, Any], source_hash: str = ""):
+        super().__init__(config)
+        self.source_hash = source_hash
+        self.index = build_index(self)
+
+
+# ============================================================================
+# VALIDATION
+# ============================================================================
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, Real) and not isinstance(value, bool)
+
+
+def validate_config(config: Dict[str, Any]) -> List[str]:
+    """Liste des erreurs de schéma (vide si la configuration est valide)"""
+    errors = []
+    for key in ("project_input", "equipment_library", "energy_sources", "standards", "layout_engine"):
+        if not isinstance(config.get(key), dict):
+            errors.append(f"section '{key}' manquante ou invalide")
+    if errors:
+        return errors
+
+    # Bibliothèques d'équipements
+    for library in LIBRARIES:
+        entries = config["equipment_library"].get(library)
+        if not isinstance(entries, list) or not entries:
+            errors.append(f"equipment_library.{library}: liste non vide attendue")
+            continue
+        seen = set()
+        for i, entry in enumerate(entries):
+            where = f"equipment_library.{library}[{i}]"
+            if not isinstance(entry, dict):
+                errors.append(f"{where}: objet attendu")
+                continue
+            equipment_id = entry.get("id")
+            if not isinstance(equipment_id, str) or not equipment_id:
+                errors.append(f"{where}: 'id' manquant")
+            elif equipment_id in seen:
+                errors.append(f"{where}: id '{equipment_id}' en double")
+            seen.add(equipment_id)
+            for field in ("power_mw", "capex_usd"):
+                if not _is_number(entry.get(field)):
+                    errors.append(f"{where}: '{field}' numérique attendu")
+            dimensions = entry.get("dimensions_m")
+            if not isinstance(dimensions, dict) or not all(_is_number(dimensions.get(d)) for d in ("length", "width")):
+                errors.append(f"{where}: 'dimensions_m' (length, width) attendu")
+
+    # Sources d'énergie
+    if not config["energy_sources"]:
+        errors.append("energy_sources: au moins une source attendue")
+    for energy_type, energy in config["energy_sources"].items():
+        if not isinstance(energy, dict) or not _is_number(energy.get("opex_usd_per_mwh")):
+            errors.append(f"energy_sources.{energy_type}: 'opex_usd_per_mwh' numérique attendu")
+        elif not isinstance(energy.get("buffer_required"), bool):
+            errors.append(f"energy_sources.{energy_type}: 'buffer_required' booléen attendu")
+
+    # Règles
+    rules = config["standards"].get("rules")
+    if not isinstance(rules, dict):
+        errors.append("standards.rules manquant")
+    else:
+        for rule in POSITIVE_RULES:
+            if not _is_number(rules.get(rule)) or rules[rule] <= 0:
+                errors.append(f"standards.rules.{rule}: nombre > 0 attendu")
+        if not _is_number(rules.get("no_powerblock_below_mw")):
+            errors.append("standards.rules.no_powerblock_below_mw: nombre attendu")
+
+    # Moteur de layout
+    layout_engine = config["layout_engine"]
+    defaults = layout_engine.get("defaults")
+    if not isinstance(defaults, dict):
+        errors.append("layout_engine.defaults manquant")
+    else:
+        for key in ("container_spacing_m", "row_spacing_m", "road_width_m", "grass_strip_width_m"):
+            if not _is_number(defaults.get(key)) or defaults[key] < 0:
+                errors.append(f"layout_engine.defaults.{key}: nombre >= 0 attendu")
+    if not isinstance(layout_engine.get("rules", {}), dict):
+        errors.append("layout_engine.rules: objet attendu")
+    dimensions = layout_engine.get("elements_dimensions")
+    if not isinstance(dimensions, dict):
+        errors.append("layout_engine.elements_dimensions manquant")
+    else:
+        for element_id, element in dimensions.items():
+            if not isinstance(element, dict) or not all(_is_number(element.get(d)) for d in ("length", "width")):
+                errors.append(f"layout_engine.elements_dimensions.{element_id}: length, width attendus")
+    arrangement = layout_engine.get("arrangement")
+    if arrangement is not None:
+        if not isinstance(arrangement, dict):
+            errors.append("layout_engine.arrangement: objet attendu")
+        else:
+            for key in ("containers_per_block", "blocks_per_row"):
+                value = arrangement.get(key, 1)
+                if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+                    errors.append(f"layout_engine.arrangement.{key}: entier >= 1 attendu")
+            if arrangement.get("rotation", 0) not in (0, 90):
+                errors.append("layout_engine.arrangement.rotation: 0 ou 90 attendu")
+
+    # Paramètres du projet
+    project_input = config["project_input"]
+    if "power_target_mw" in project_input and not _is_number(project_input["power_target_mw"]):
+        errors.append("project_input.power_target_mw: nombre attendu")
+    energy_type = project_input.get("energy_type")
+    if energy_type is not None and energy_type not in config["energy_sources"]:
+        errors.append(f"project_input.energy_type: '{energy_type}' absent de energy_sources")
+    for i, phase in enumerate(project_input.get("phasing", [])):
+        if not isinstance(phase, dict) or not _is_number(phase.get("power_mw")):
+            errors.append(f"project_input.phasing[{i}]: 'power_mw' numérique attendu")
+
+    return errors
+
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+def build_index(config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Index id -> entrée des bibliothèques, sources d'énergie et dimensions du layout"""
+    library = config["equipment_library"]
+    index = {name: {entry["id"]: entry for entry in library[name]} for name in LIBRARIES}
+    index["energy_sources"] = dict(config["energy_sources"])
+    index["elements_dimensions"] = dict(config["layout_engine"]["elements_dimensions"])
+    return index
+
+
+def config_index(config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Index de la configuration: celui de load_config() si présent, sinon construit à la volée"""
+    index = getattr(config, "index", None)
+    return index if index is not None else build_index(config)
+
+
+def get_equipment(config: Dict[str, Any], library: str, equipment_id: str = None) -> Dict[str, Any]:
+    """
+    Équipement d'une bibliothèque par id (O(1) sur une LoadedConfig).
+    Sans id: premier équipement de la bibliothèque (équipement par défaut).
+    """
+    if equipment_id is None:
+        return config["equipment_library"][library][0]
+    try:
+        return config_index(config)[library][equipment_id]
+    except KeyError:
+        raise KeyError(f"{library}: équipement '{equipment_id}' introuvable") from None
+
+
+# ============================================================================
+# CHARGEMENT ET CACHE
+# ============================================================================
+
+def cache_dir() -> Path:
+    """Répertoire du cache des configurations compilées"""
+    return Path(os.environ.get("MINING_CONFIG_CACHE_DIR", Path.home() / ".cache" / "mining_configurator"))
+
+
+def _cache_path(source_hash: str) -> Path:
+    return cache_dir() / f"config-v{CACHE_VERSION}-{source_hash}.pickle"
+
+
+def _read_cache(source_hash: str):
+    """Configuration compilée en cache, ou None (absente ou illisible)"""
+    try:
+        with open(_cache_path(source_hash), "rb") as f:
+            config = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    return config if isinstance(config, LoadedConfig) and config.source_hash == source_hash else None
+
+
+def _write_cache(config: LoadedConfig) -> None:
+    """Écriture atomique du cache (un échec d'écriture n'est pas bloquant)"""
+    path = _cache_path(config.source_hash)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(config, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        os.remove(tmp_path)
+
+
+def load_config(json_path: str, use_cache: bool = True) -> LoadedConfig:
+    """
+    Charge, valide et indexe la configuration JSON.
+
+    Args:
+        json_path: Fichier JSON de configuration
+        use_cache: Lit/écrit la configuration compilée dans le cache disque
+
+    Raises:
+        ConfigError: si la configuration ne respecte pas le schéma
+    """
+    raw = Path(json_path).read_bytes()
+    source_hash = hashlib.sha256(raw).hexdigest()
+
+    if use_cache:
+        cached = _read_cache(source_hash)
+        if cached is not None:
+            return cached
+
+    config = json.loads(raw.decode("utf-8"))
+    errors = validate_config(config) if isinstance(config, dict) else ["objet JSON attendu"]
+    if errors:
+        raise ConfigError(str(json_path), errors)
+
+    loaded = LoadedConfig(config, source_hash)
+    if use_cache:
+        _write_cache(loaded)
+    return loaded
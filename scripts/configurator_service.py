@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Service JSON local du configurateur Mining (asyncio, HTTP)
+
+Expose aux dashboards web (Next.js, visualiseur 3D) le layout et les
+calculs de CALCUL_ENGINE sans passer par le fichier Excel :
+
+- GET/POST /layout : éléments du layout (routes fusionnées), surfaces,
+  raccordement des containers (transformateur et câble de chaque container)
+  et nombre de conflits de positionnement
+- GET/POST /layout.bin : mêmes éléments au format binaire compact
+  (layout_binary.py), lus sans parsing par le viewer web
+- GET/POST /calculate : valeurs de CALCUL_ENGINE d'un scénario
+  (calcul_engine.calculate)
+- GET /health : état du service et statistiques du cache
+
+Paramètres en query string (GET) ou en objet JSON (POST), normalisés puis
+validés: deux requêtes équivalentes ("100" et 100.0, paramètres par défaut
+explicites ou non) partagent la même clé. Les réponses sont gardées dans un
+cache LRU en mémoire (corps JSON déjà encodé) ; une requête identique à une
+requête en cours attend son résultat au lieu de relancer le calcul. Les
+layouts de plus de POOL_MIN_CONTAINERS containers sont calculés dans un
+pool de processus (la boucle asyncio reste disponible), les petits
+directement.
+
+Serveur HTTP/1.1 minimal de la bibliothèque standard (keep-alive, CORS
+pour les dashboards servis sur un autre port) destiné à un usage local.
+
+Usage:
+    python3 scripts/configurator_service.py --config <fichier.json> [--port 8765]
+    curl "http://127.0.0.1:8765/calculate?power_mw=600&energy_type=solar"
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from cable_engine import cable_plan
+from calcul_engine import MINING_TYPES, calculate
+from config_loader import ConfigError, load_config
+from layout_checks import find_conflicts
+from layout_binary import encode_layout
+from layout_engine import ROTATIONS, compute_layout, default_arrangement
+from layout_geometry import layout_surfaces
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Réponses gardées en mémoire (entrées du cache LRU)
+CACHE_SIZE = 256
+
+# Layouts calculés dans le pool de processus au-delà de ce nombre de containers
+POOL_MIN_CONTAINERS = 250
+
+# Puissance maximale acceptée (MW): borne la taille d'un calcul
+MAX_POWER_MW = 20000
+
+# Taille maximale du corps d'une requête (octets) et délai d'inactivité
+# d'une connexion keep-alive (s)
+MAX_BODY_BYTES = 64 * 1024
+KEEPALIVE_TIMEOUT = 15
+
+STATUS_TEXT = {200: "OK", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type",
+}
+
+
+class ServiceError(Exception):
+    """Erreur renvoyée au client (code HTTP et message)"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# ============================================================================
+# NORMALISATION DES PARAMÈTRES
+# ============================================================================
+
+def _number(params: Dict[str, Any], key: str, default: float) -> float:
+    value = params.get(key, default)
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise ServiceError(400, f"{key}: nombre attendu") from None
+    if not math.isfinite(value):
+        raise ServiceError(400, f"{key}: nombre fini attendu")
+    return value
+
+
+def _integer(params: Dict[str, Any], key: str, default: int) -> int:
+    value = params.get(key, default)
+    if isinstance(value, bool):
+        raise ServiceError(400, f"{key}: entier attendu")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ServiceError(400, f"{key}: entier attendu") from None
+    if not number.is_integer():
+        raise ServiceError(400, f"{key}: entier attendu")
+    return int(number)
+
+
+def _boolean(params: Dict[str, Any], key: str, default: bool) -> bool:
+    value = params.get(key, default)
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("1", "true", "oui", "yes"):
+        return True
+    if text in ("0", "false", "non", "no"):
+        return False
+    raise ServiceError(400, f"{key}: booléen attendu")
+
+
+def _power(config: Dict[str, Any], params: Dict[str, Any]) -> float:
+    power = _number(params, "power_mw", config["project_input"].get("power_target_mw", 50))
+    if not 0 < power <= MAX_POWER_MW:
+        raise ServiceError(400, f"power_mw: valeur dans ]0, {MAX_POWER_MW}] attendue")
+    return power
+
+
+def _check_keys(params: Dict[str, Any], allowed: Tuple[str, ...]) -> None:
+    unknown = sorted(set(params) - set(allowed))
+    if unknown:
+        raise ServiceError(400, f"paramètre(s) inconnu(s): {', '.join(unknown)} (attendus: {', '.join(allowed)})")
+
+
+def normalize_layout(config: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """Paramètres de /layout complétés par les valeurs par défaut et validés"""
+    _check_keys(params, ("power_mw", "containers_per_block", "blocks_per_row", "rotation", "merge"))
+    arrangement = {**default_arrangement(config), **(config["layout_engine"].get("arrangement") or {})}
+    normalized = {"power_mw": _power(config, params), "merge": _boolean(params, "merge", True)}
+    for key in ("containers_per_block", "blocks_per_row"):
+        normalized[key] = _integer(params, key, arrangement[key])
+        if normalized[key] < 1:
+            raise ServiceError(400, f"{key}: entier >= 1 attendu")
+    normalized["rotation"] = _integer(params, "rotation", arrangement["rotation"])
+    if normalized["rotation"] not in ROTATIONS:
+        raise ServiceError(400, f"rotation: {' ou '.join(map(str, ROTATIONS))} attendu")
+    return normalized
+
+
+def normalize_calculate(config: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """Paramètres de /calculate complétés par les valeurs par défaut et validés"""
+    _check_keys(params, ("power_mw", "energy_type", "mining_type"))
+    project_input = config["project_input"]
+    energy_type = str(params.get("energy_type", project_input.get("energy_type", "grid")))
+    if energy_type not in config["energy_sources"]:
+        raise ServiceError(400, f"energy_type: une valeur parmi {', '.join(config['energy_sources'])} attendue")
+    mining_type = str(params.get("mining_type", project_input.get("mining_type", "air")))
+    if mining_type not in MINING_TYPES:
+        raise ServiceError(400, f"mining_type: une valeur parmi {', '.join(MINING_TYPES)} attendue")
+    return {"power_mw": _power(config, params), "energy_type": energy_type, "mining_type": mining_type}
+
+
+# ============================================================================
+# CALCULS (dans le processus du service ou dans le pool)
+# ============================================================================
+
+# Configuration du processus courant (transmise une fois par processus via
+# l'initialiseur du pool)
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _init_worker(config: Dict[str, Any]) -> None:
+    """Initialiseur du pool: mémorise la configuration dans le processus"""
+    _WORKER_STATE["config"] = config
+
+
+def _encode(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def layout_payload(config: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """Réponse de /layout: éléments, surfaces, raccordement et conflits du layout"""
+    arrangement = {key: params[key] for key in ("containers_per_block", "blocks_per_row", "rotation")}
+    layout = compute_layout(config, params["power_mw"], arrangement, merge=params["merge"])
+    elements = layout.to_dicts() if hasattr(layout, "to_dicts") else list(layout)
+    plan = cable_plan(layout, config)
+    for container, feeder, length in zip(plan["containers"], plan["feeders"], plan["lengths"]):
+        elements[container]["feeder"] = elements[feeder]["id"] if feeder >= 0 else None
+        elements[container]["cable_m"] = length
+    return {
+        "power_mw": params["power_mw"],
+        "arrangement": arrangement,
+        "elements": elements,
+        "surfaces": layout_surfaces(layout),
+        "cables": {key: plan[key] for key in ("total_m", "max_m", "connected", "unassigned",
+                                              "transformers", "capacity", "method")},
+        "conflicts": len(find_conflicts(layout, config)),
+    }
+
+
+def layout_binary_payload(config: Dict[str, Any], params: Dict[str, Any]) -> bytes:
+    """Réponse de /layout.bin: éléments du layout au format .hqlayout"""
+    arrangement = {key: params[key] for key in ("containers_per_block", "blocks_per_row", "rotation")}
+    layout = compute_layout(config, params["power_mw"], arrangement, merge=params["merge"])
+    return encode_layout(layout, source={"power_mw": params["power_mw"], "arrangement": arrangement})
+
+
+def calculate_payload(config: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """Réponse de /calculate: valeurs de CALCUL_ENGINE du scénario"""
+    return calculate(config, params["power_mw"], params["energy_type"], params["mining_type"])
+
+
+# Routes de calcul: chemin -> (normalisation, calcul de la réponse)
+ENDPOINTS: Dict[str, Tuple[Callable, Callable]] = {
+    "/layout": (normalize_layout, layout_payload),
+    "/layout.bin": (normalize_layout, layout_binary_payload),
+    "/calculate": (normalize_calculate, calculate_payload),
+}
+
+# Routes dont la réponse n'est pas du JSON
+CONTENT_TYPES = {"/layout.bin": "application/octet-stream"}
+
+
+def _body(payload) -> bytes:
+    """Corps de réponse: octets tels quels, sinon JSON encodé"""
+    return payload if isinstance(payload, bytes) else _encode(payload)
+
+
+def _run_endpoint(path: str, params: Dict[str, Any]) -> bytes:
+    """Calcul d'une route dans un processus du pool (réponse encodée sur place)"""
+    return _body(ENDPOINTS[path][1](_WORKER_STATE["config"], params))
+
+
+# ============================================================================
+# CACHE ET REGROUPEMENT DES REQUÊTES
+# ============================================================================
+
+class LRUCache:
+    """Cache LRU de réponses encodées (clé -> octets), borné en nombre d'entrées"""
+
+    def __init__(self, maxsize: int = CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: bytes) -> None:
+        if self.maxsize <= 0:
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+
+class ConfiguratorService:
+    """
+    Calculs du configurateur pour une configuration chargée: cache LRU,
+    regroupement des requêtes identiques en cours et pool de processus.
+    """
+
+    def __init__(self, config: Dict[str, Any], workers: int = None, cache_size: int = CACHE_SIZE):
+        self.config = config
+        self.cache = LRUCache(cache_size)
+        self.inflight: Dict[str, "asyncio.Future[bytes]"] = {}
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.pool = None
+        if self.workers > 0:
+            # Processus démarrés hors de la boucle (forkserver/spawn): un fork
+            # hériterait des sockets clients ouvertes et retarderait leur fermeture
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                            initargs=(config,), mp_context=multiprocessing.get_context(method))
+        self.stats = {"requests": 0, "hits": 0, "misses": 0, "coalesced": 0, "pool_jobs": 0, "errors": 0}
+        self.started = time.time()
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    def _heavy(self, params: Dict[str, Any]) -> bool:
+        """Calcul à confier au pool (layout de plus de POOL_MIN_CONTAINERS containers)"""
+        containers = math.ceil(params["power_mw"] / self.config["standards"]["rules"]["container_power_mw"])
+        return self.pool is not None and containers > POOL_MIN_CONTAINERS
+
+    async def _compute(self, path: str, params: Dict[str, Any]) -> bytes:
+        if self._heavy(params):
+            self.stats["pool_jobs"] += 1
+            return await asyncio.get_running_loop().run_in_executor(self.pool, _run_endpoint, path, params)
+        return _body(ENDPOINTS[path][1](self.config, params))
+
+    async def result(self, path: str, params: Dict[str, Any]) -> Tuple[bytes, str]:
+        """
+        Réponse encodée d'une route de calcul et sa provenance
+        ("hit": cache, "coalesced": requête identique en cours, "miss": calculée)
+        """
+        normalized = ENDPOINTS[path][0](self.config, params)
+        key = json.dumps([path, normalized], sort_keys=True)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats["hits"] += 1
+            return cached, "hit"
+        pending = self.inflight.get(key)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+            # shield: l'annulation d'un client en attente n'annule pas le calcul partagé
+            return await asyncio.shield(pending), "coalesced"
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        try:
+            body = await self._compute(path, normalized)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # Marquée lue si aucune requête n'attendait
+            raise
+        finally:
+            del self.inflight[key]
+        self.cache.put(key, body)
+        future.set_result(body)
+        return body, "miss"
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "config": getattr(self.config, "source_hash", ""),
+            "uptime_s": round(time.time() - self.started, 1),
+            "workers": self.workers,
+            "cache": {"entries": len(self.cache.entries), "maxsize": self.cache.maxsize},
+            "inflight": len(self.inflight),
+            **self.stats,
+        }
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, bytes, Dict[str, str]]:
+        """(code HTTP, corps, en-têtes supplémentaires) de la réponse à une requête"""
+        url = urlsplit(target)
+        if method == "OPTIONS":  # Pré-requête CORS
+            return 204, b"", {}
+        if url.path == "/health":
+            if method != "GET":
+                raise ServiceError(405, "méthode non autorisée (GET attendu)")
+            return 200, _encode(self.health()), {}
+        if url.path not in ENDPOINTS:
+            raise ServiceError(404, f"route inconnue: {url.path} (routes: /layout, /layout.bin, /calculate, /health)")
+        if method == "GET":
+            params = dict(parse_qsl(url.query))
+        elif method == "POST":
+            try:
+                params = json.loads(body or b"{}")
+            except ValueError:
+                raise ServiceError(400, "corps JSON invalide") from None
+            if not isinstance(params, dict):
+                raise ServiceError(400, "objet JSON attendu")
+        else:
+            raise ServiceError(405, "méthode non autorisée (GET ou POST attendu)")
+
+        self.stats["requests"] += 1
+        payload, source = await self.result(url.path, params)
+        headers = {"X-Cache": source}
+        if url.path in CONTENT_TYPES:
+            headers["Content-Type"] = CONTENT_TYPES[url.path]
+        return 200, payload, headers
+
+
+# ============================================================================
+# SERVEUR HTTP
+# ============================================================================
+
+def _response(status: int, body: bytes, headers: Dict[str, str], keep_alive: bool) -> bytes:
+    lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}"]
+    all_headers = {**CORS_HEADERS, **headers, "Content-Length": str(len(body)),
+                   "Connection": "keep-alive" if keep_alive else "close"}
+    if body:
+        all_headers.setdefault("Content-Type", "application/json; charset=utf-8")
+    lines += [f"{name}: {value}" for name, value in all_headers.items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, str, Dict[str, str], bytes]]:
+    """(méthode, cible, version, en-têtes, corps) de la requête suivante, None si la connexion est finie"""
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+        return None
+    request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+    parts = request_line.split(" ")
+    if len(parts) != 3:
+        raise ServiceError(400, "ligne de requête invalide")
+    headers = {}
+    for line in header_lines:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise ServiceError(400, "Content-Length invalide") from None
+    if length > MAX_BODY_BYTES:
+        raise ServiceError(413, f"corps de requête limité à {MAX_BODY_BYTES} octets")
+    body = await reader.readexactly(length) if length > 0 else b""
+    return parts[0].upper(), parts[1], parts[2], headers, body
+
+
+def connection_handler(service: ConfiguratorService) -> Callable[..., Awaitable[None]]:
+    """Gestionnaire de connexion asyncio.start_server (requêtes successives en keep-alive)"""
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await _read_request(reader)
+                    if request is None:
+                        break
+                    method, target, version, headers, body = request
+                    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                    status, payload, extra = await service.dispatch(method, target, body)
+                except ServiceError as exc:
+                    service.stats["errors"] += 1
+                    status, payload, extra = exc.status, _encode({"error": str(exc)}), {}
+                except asyncio.IncompleteReadError:
+                    break
+                except Exception as exc:  # Erreur de calcul: le service continue
+                    service.stats["errors"] += 1
+                    print(f"ERREUR: {type(exc).__name__}: {exc}")
+                    status, payload, extra = 500, _encode({"error": f"{type(exc).__name__}: {exc}"}), {}
+                writer.write(_response(status, payload, extra, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    return handle
+
+
+async def serve(config: Dict[str, Any], host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                workers: int = None, cache_size: int = CACHE_SIZE) -> None:
+    """Lance le service jusqu'à interruption"""
+    service = ConfiguratorService(config, workers, cache_size)
+    try:
+        server = await asyncio.start_server(connection_handler(service), host, port)
+        print(f"Service configurateur: http://{host}:{port} ({service.workers} processus, cache {cache_size})")
+        print("Routes: /layout, /layout.bin, /calculate, /health")
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv: List[str] = None):
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Service JSON local du configurateur (layout et calculs)")
+    parser.add_argument("--config", type=Path, required=True, help="Fichier JSON de configuration")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Adresse d'écoute")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port d'écoute")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processus du pool pour les grands layouts (défaut: un par cœur, 0: sans pool)")
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE, help="Réponses gardées en cache")
+    args = parser.parse_args(argv)
+
+    try:
+        config = load_config(str(args.config))
+    except ConfigError as exc:
+        print(f"ERREUR: {exc}")
+        return 1
+    try:
+        asyncio.run(serve(config, args.host, args.port, args.workers, args.cache_size))
+    except KeyboardInterrupt:
+        print("Service arrêté")
+    except OSError as exc:
+        print(f"ERREUR: {exc}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,66 +5,150 @@ Script de génération du fichier Excel Configurateur Mining
 Génère un fichier Excel structuré avec 5 onglets à partir du JSON de configuration
 """
 
+import argparse
 import json
-import math
 import os
+import re
+import tempfile
+import time
+import zipfile
+from contextlib import contextmanager
+from copy import copy
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Dict, Iterable, List, Any, Sequence, Tuple
 
 try:
     import openpyxl
     from openpyxl import Workbook
+    from openpyxl.cell import Cell, WriteOnlyCell
     from openpyxl.chart import PieChart, BarChart, Reference
     from openpyxl.chart.label import DataLabelList
     from openpyxl.styles import (
         PatternFill, Font, Alignment, Border, Side,
         NamedStyle
     )
+    from openpyxl.styles.fonts import DEFAULT_FONT
     from openpyxl.worksheet.datavalidation import DataValidation
-    from openpyxl.utils import get_column_letter
+    from openpyxl.utils import get_column_letter, range_boundaries
 except ImportError:
     print("ERREUR: openpyxl n'est pas installé.")
     print("Installez-le avec: pip install openpyxl")
     exit(1)
 
+# Génération du layout automatique (vectorisée si NumPy est disponible)
+from layout_engine import compute_layout
+# Contrôle des chevauchements (index spatial en grille)
+from layout_checks import Conflict, conflict_alerts, find_conflicts
+# Surfaces exactes (union des empreintes par type)
+from layout_geometry import layout_surfaces
+# Raccordement containers -> transformateurs et câbles BT
+from cable_engine import cable_plan, phase_cable_lengths
+# Disposition d'emprise minimale (--optimize)
+from layout_optimizer import optimize_layout, print_summary
+# Chargement validé et indexé de la configuration (cache disque)
+from config_loader import ConfigError, get_equipment, load_config
+# Constantes partagées avec le calcul natif des formules CALCUL_ENGINE
+from calcul_engine import (
+    CABLE_COST_USD_PER_M, CIVIL_COST_USD_PER_M2, HOURS_PER_YEAR, MAINTENANCE_RATE, MINING_TYPES,
+    calculate, calculate_phases, layout_phase_surfaces, select_container
+)
+# Régénération incrémentale (cache des parties XML des onglets)
+from sheet_cache import SheetCache, code_version, reads, sheet_parts
+
 
 # ============================================================================
 # CONFIGURATION DES STYLES
 # ============================================================================
 
-def get_header_style():
-    """Style pour les en-têtes de tableaux"""
-    return {
-        'font': Font(bold=True, color="FFFFFF", size=11),
-        'fill': PatternFill(start_color="366092", end_color="366092", fill_type="solid"),
-        'alignment': Alignment(horizontal="center", vertical="center"),
-        'border': Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-    }
+# Noms des styles nommés du configurateur (enregistrés une fois par workbook)
+STYLE_TITLE = "cfg_title"        # Titres de sections
+STYLE_HEADER = "cfg_header"      # En-têtes de tableaux
+STYLE_CELL = "cfg_cell"          # Cellules de données
+STYLE_EDITABLE = "cfg_editable"  # Cellules modifiables du layout (X, Y, Rotation)
+STYLE_INPUT = "cfg_input"        # Cellules de saisie INPUT_PROJECT
+STYLE_LABEL = "cfg_label"        # Libellés en gras
+STYLE_TOTAL = "cfg_total"        # Lignes de total
+STYLE_ALERT = "cfg_alert"        # Cellule d'alerte
 
-def get_cell_style():
-    """Style pour les cellules de données"""
-    return {
-        'border': Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
+
+def build_named_styles() -> List[NamedStyle]:
+    """Construit les styles nommés du configurateur (une instance par workbook)"""
+    thin = Side(style='thin')
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    return [
+        NamedStyle(
+            name=STYLE_TITLE,
+            font=Font(bold=True, size=14, color="1F4E78"),
+            fill=PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid"),
+            alignment=Alignment(horizontal="left", vertical="center")
         ),
-        'alignment': Alignment(vertical="center")
-    }
+        NamedStyle(
+            name=STYLE_HEADER,
+            font=Font(bold=True, color="FFFFFF", size=11),
+            fill=PatternFill(start_color="366092", end_color="366092", fill_type="solid"),
+            alignment=Alignment(horizontal="center", vertical="center"),
+            border=border
+        ),
+        NamedStyle(
+            name=STYLE_CELL,
+            font=copy(DEFAULT_FONT),
+            border=border,
+            alignment=Alignment(vertical="center")
+        ),
+        NamedStyle(
+            name=STYLE_EDITABLE,
+            font=copy(DEFAULT_FONT),
+            fill=PatternFill(start_color="E2EFDA", end_color="E2EFDA", fill_type="solid"),
+            border=border
+        ),
+        NamedStyle(
+            name=STYLE_INPUT,
+            font=copy(DEFAULT_FONT),
+            fill=PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
+        ),
+        NamedStyle(name=STYLE_LABEL, font=Font(bold=True)),
+        NamedStyle(name=STYLE_TOTAL, font=Font(bold=True, size=12)),
+        NamedStyle(
+            name=STYLE_ALERT,
+            font=copy(DEFAULT_FONT),
+            fill=PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+        ),
+    ]
 
-def get_title_style():
-    """Style pour les titres de sections"""
-    return {
-        'font': Font(bold=True, size=14, color="1F4E78"),
-        'fill': PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid"),
-        'alignment': Alignment(horizontal="left", vertical="center")
-    }
+
+def register_named_styles(wb: Workbook) -> None:
+    """
+    Enregistre les styles nommés dans le workbook (idempotent).
+
+    Les cellules référencent ensuite le style par son nom : openpyxl réutilise
+    les Font/Fill/Border déjà indexés au lieu d'en allouer par cellule.
+    Les styles de cellule correspondants sont pré-indexés, dans l'ordre du
+    registre, par une cellule de chaque style dans un onglet temporaire
+    (Cell.style_id indexe le style à la première lecture) : l'indice de style
+    d'une cellule (attribut s du XML) ne dépend donc pas des onglets
+    construits avant elle (voir sheet_cache).
+    """
+    existing = set(wb.named_styles)
+    styles = [style for style in build_named_styles() if style.name not in existing]
+    if not styles:
+        return
+    scratch = wb.create_sheet("_styles")
+    try:
+        for style in styles:
+            wb.add_named_style(style)
+            cell = Cell(scratch)
+            cell.style = style.name
+            cell.style_id  # Indexation dans l'ordre du registre
+    finally:
+        wb.remove(scratch)
+
+
+def apply_style(ws, cell_range: str, name: str) -> None:
+    """Applique un style nommé à toutes les cellules d'une plage (ex: "A6:B120")"""
+    min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+    for row in ws.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col):
+        for cell in row:
+            cell.style = name
 
 
 # ============================================================================
@@ -72,210 +156,260 @@ def get_title_style():
 # ============================================================================
 
 def read_json_config(json_path: str) -> Dict[str, Any]:
-    """Lit et parse le fichier JSON de configuration"""
-    with open(json_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """Lit, valide et indexe le fichier JSON de configuration (voir config_loader)"""
+    return load_config(json_path)
+
+
+# ============================================================================
+# ÉCRITURE SÉQUENTIELLE DES FEUILLES
+# ============================================================================
+
+class SheetWriter:
+    """
+    Écrit une feuille ligne par ligne.
+
+    En mode normal les cellules sont créées via ws.cell(); en mode streaming
+    (workbook write_only) chaque ligne est émise immédiatement via ws.append()
+    et n'est plus conservée en mémoire. Les largeurs de colonnes doivent donc
+    être connues avant la première ligne.
+
+    Les styles sont désignés par leur nom (voir register_named_styles).
+    """
+
+    def __init__(self, ws, start_row: int = 1, column_widths: Dict[str, float] = None):
+        self.ws = ws
+        self.streaming = ws.parent.write_only
+        self.row = start_row
+        register_named_styles(ws.parent)
+        for letter, width in (column_widths or {}).items():
+            ws.column_dimensions[letter].width = width
+
+    @staticmethod
+    def _column_styles(width: int, style: str = None, styles: Dict[int, str] = None) -> Dict[int, str]:
+        """Style nommé de chaque colonne (index 1-based)"""
+        cell_styles = {}
+        if style:
+            cell_styles = {col: style for col in range(1, width + 1)}
+        if styles:
+            cell_styles.update(styles)
+        return cell_styles
+
+    def append(self, values: List[Any], style: str = None, styles: Dict[int, str] = None) -> int:
+        """
+        Écrit une ligne et retourne son numéro.
+
+        Args:
+            values: Valeurs des colonnes A, B, ... (None = cellule vide)
+            style: Style nommé appliqué à toutes les colonnes de values
+            styles: Styles nommés par colonne (index 1-based), prioritaires sur style
+        """
+        cell_styles = self._column_styles(len(values), style, styles)
+        width = max([len(values)] + list(cell_styles))
+
+        row = self.row
+        if self.streaming:
+            cells = []
+            for col in range(1, width + 1):
+                value = values[col - 1] if col <= len(values) else None
+                if col in cell_styles:
+                    cell = WriteOnlyCell(self.ws, value=value)
+                    cell.style = cell_styles[col]
+                    cells.append(cell)
+                else:
+                    cells.append(value)
+            self.ws.append(cells)
+        else:
+            for col in range(1, width + 1):
+                value = values[col - 1] if col <= len(values) else None
+                if value is None and col not in cell_styles:
+                    continue
+                cell = self.ws.cell(row=row, column=col, value=value)
+                if col in cell_styles:
+                    cell.style = cell_styles[col]
+        self.row += 1
+        return row
+
+    def append_rows(self, rows: Iterable[List[Any]], style: str = None,
+                    styles: Dict[int, str] = None) -> Tuple[int, int]:
+        """
+        Écrit un tableau de lignes de même structure et retourne (première, dernière) ligne.
+
+        En mode normal les valeurs sont écrites d'abord, puis les styles sont
+        appliqués par bandes de colonnes via apply_style().
+        """
+        first_row = self.row
+        if self.streaming:
+            for values in rows:
+                self.append(values, style, styles)
+            return first_row, self.row - 1
+
+        ws = self.ws
+        width = 0
+        for values in rows:
+            for col, value in enumerate(values, start=1):
+                if value is not None:
+                    ws.cell(row=self.row, column=col, value=value)
+            width = max(width, len(values))
+            self.row += 1
+        last_row = self.row - 1
+
+        if last_row >= first_row:
+            cell_styles = self._column_styles(width, style, styles)
+            band_start = None
+            for col in range(1, max([width] + list(cell_styles)) + 2):
+                name = cell_styles.get(col)
+                if band_start is not None and name != cell_styles[band_start]:
+                    apply_style(ws, f"{get_column_letter(band_start)}{first_row}:"
+                                    f"{get_column_letter(col - 1)}{last_row}", cell_styles[band_start])
+                    band_start = None
+                if band_start is None and name is not None:
+                    band_start = col
+        return first_row, last_row
+
+    def title(self, text: str, last_col: str) -> int:
+        """Écrit un titre de section fusionné de A jusqu'à last_col"""
+        self.merge(f'A{self.row}:{last_col}{self.row}')
+        return self.append([text], styles={1: STYLE_TITLE})
+
+    def header(self, headers: List[str]) -> int:
+        """Écrit une ligne d'en-têtes de tableau"""
+        return self.append(headers, style=STYLE_HEADER)
+
+    def merge(self, cell_range: str) -> None:
+        """Fusionne une plage (en streaming la fusion est écrite en fin de feuille)"""
+        if self.streaming:
+            self.ws.merged_cells.add(cell_range)
+        else:
+            self.ws.merge_cells(cell_range)
+
+    def skip(self, count: int = 1) -> None:
+        """Laisse des lignes vides"""
+        for _ in range(count):
+            if self.streaming:
+                self.ws.append([])
+            self.row += 1
 
 
 # ============================================================================
 # ONGLET 1: SETUP_ADMIN
 # ============================================================================
 
+@reads("equipment_library", "energy_sources", "standards.civil_work", "standards.rules")
 def create_setup_admin_sheet(wb: Workbook, config: Dict[str, Any]) -> Dict[str, int]:
     """Crée l'onglet SETUP_ADMIN avec toutes les bibliothèques et paramètres"""
     ws = wb.create_sheet("SETUP_ADMIN")
-    
-    row = 1
+    writer = SheetWriter(ws, column_widths={
+        'A': 18, 'B': 35, 'C': 18, 'D': 15, 'E': 18, 'F': 15, 'G': 15, 'H': 15, 'I': 12
+    })
     
     # === BIBLIOTHÈQUE CONTAINERS ===
-    ws.merge_cells(f'A{row}:I{row}')
-    title_cell = ws[f'A{row}']
-    title_cell.value = "BIBLIOTHÈQUE CONTAINERS"
-    for key, value in get_title_style().items():
-        setattr(title_cell, key, value)
-    
-    row += 1
-    headers = ["ID", "Nom", "Puissance (MW)", "Courant (A)", "Refroidissement", 
-               "CAPEX (USD)", "Longueur (m)", "Largeur (m)", "Fondation"]
-    for col_idx, header in enumerate(headers, start=1):
-        cell = ws.cell(row=row, column=col_idx, value=header)
-        for key, value in get_header_style().items():
-            setattr(cell, key, value)
-    
-    row += 1
-    containers_start_row = row
-    for container in config["equipment_library"]["containers"]:
-        cooling = ", ".join(container.get("cooling", []))
-        ws.cell(row=row, column=1, value=container["id"])
-        ws.cell(row=row, column=2, value=container["name"])
-        ws.cell(row=row, column=3, value=container["power_mw"])
-        ws.cell(row=row, column=4, value=container.get("current_a", ""))
-        ws.cell(row=row, column=5, value=cooling)
-        ws.cell(row=row, column=6, value=container["capex_usd"])
-        ws.cell(row=row, column=7, value=container["dimensions_m"]["length"])
-        ws.cell(row=row, column=8, value=container["dimensions_m"]["width"])
-        ws.cell(row=row, column=9, value=container.get("foundation", ""))
-        
-        for col in range(1, 10):
-            cell = ws.cell(row=row, column=col)
-            for key, value in get_cell_style().items():
-                setattr(cell, key, value)
-        row += 1
-    
-    containers_end_row = row - 1
-    row += 2
+    writer.title("BIBLIOTHÈQUE CONTAINERS", "I")
+    writer.header(["ID", "Nom", "Puissance (MW)", "Courant (A)", "Refroidissement", 
+                   "CAPEX (USD)", "Longueur (m)", "Largeur (m)", "Fondation"])
+    
+    writer.append_rows((
+        [
+            container["id"],
+            container["name"],
+            container["power_mw"],
+            container.get("current_a", ""),
+            ", ".join(container.get("cooling", [])),
+            container["capex_usd"],
+            container["dimensions_m"]["length"],
+            container["dimensions_m"]["width"],
+            container.get("foundation", "")
+        ]
+        for container in config["equipment_library"]["containers"]
+    ), style=STYLE_CELL)
+    
+    writer.skip(2)
     
     # === BIBLIOTHÈQUE TRANSFORMATEURS ===
-    ws.merge_cells(f'A{row}:H{row}')
-    title_cell = ws[f'A{row}']
-    title_cell.value = "BIBLIOTHÈQUE TRANSFORMATEURS"
-    for key, value in get_title_style().items():
-        setattr(title_cell, key, value)
-    
-    row += 1
-    headers = ["ID", "Nom", "Puissance (MW)", "CAPEX (USD)", 
-               "Longueur (m)", "Largeur (m)", "Fondation"]
-    for col_idx, header in enumerate(headers, start=1):
-        cell = ws.cell(row=row, column=col_idx, value=header)
-        for key, value in get_header_style().items():
-            setattr(cell, key, value)
-    
-    row += 1
-    transformers_start_row = row
-    for transformer in config["equipment_library"]["transformers"]:
-        ws.cell(row=row, column=1, value=transformer["id"])
-        ws.cell(row=row, column=2, value=transformer["name"])
-        ws.cell(row=row, column=3, value=transformer["power_mw"])
-        ws.cell(row=row, column=4, value=transformer["capex_usd"])
-        ws.cell(row=row, column=5, value=transformer["dimensions_m"]["length"])
-        ws.cell(row=row, column=6, value=transformer["dimensions_m"]["width"])
-        ws.cell(row=row, column=7, value=transformer.get("foundation", ""))
-        
-        for col in range(1, 8):
-            cell = ws.cell(row=row, column=col)
-            for key, value in get_cell_style().items():
-                setattr(cell, key, value)
-        row += 1
-    
-    transformers_end_row = row - 1
-    row += 2
+    writer.title("BIBLIOTHÈQUE TRANSFORMATEURS", "H")
+    writer.header(["ID", "Nom", "Puissance (MW)", "CAPEX (USD)", 
+                   "Longueur (m)", "Largeur (m)", "Fondation"])
+    
+    writer.append_rows((
+        [
+            transformer["id"],
+            transformer["name"],
+            transformer["power_mw"],
+            transformer["capex_usd"],
+            transformer["dimensions_m"]["length"],
+            transformer["dimensions_m"]["width"],
+            transformer.get("foundation", "")
+        ]
+        for transformer in config["equipment_library"]["transformers"]
+    ), style=STYLE_CELL)
+    
+    writer.skip(2)
     
     # === BIBLIOTHÈQUE POWERBLOCKS ===
-    ws.merge_cells(f'A{row}:I{row}')
-    title_cell = ws[f'A{row}']
-    title_cell.value = "BIBLIOTHÈQUE POWERBLOCKS"
-    for key, value in get_title_style().items():
-        setattr(title_cell, key, value)
-    
-    row += 1
-    headers = ["ID", "Nom", "Puissance (MW)", "Nbr Transformateurs", 
-               "Redondance", "CAPEX (USD)", "Longueur (m)", "Largeur (m)", "Fondation"]
-    for col_idx, header in enumerate(headers, start=1):
-        cell = ws.cell(row=row, column=col_idx, value=header)
-        for key, value in get_header_style().items():
-            setattr(cell, key, value)
-    
-    row += 1
-    powerblocks_start_row = row
-    for powerblock in config["equipment_library"]["powerblocks"]:
-        ws.cell(row=row, column=1, value=powerblock["id"])
-        ws.cell(row=row, column=2, value=powerblock["name"])
-        ws.cell(row=row, column=3, value=powerblock["power_mw"])
-        ws.cell(row=row, column=4, value=powerblock.get("transformers", 0))
-        ws.cell(row=row, column=5, value=powerblock.get("redundancy_transformers", 0))
-        ws.cell(row=row, column=6, value=powerblock["capex_usd"])
-        ws.cell(row=row, column=7, value=powerblock["dimensions_m"]["length"])
-        ws.cell(row=row, column=8, value=powerblock["dimensions_m"]["width"])
-        ws.cell(row=row, column=9, value=powerblock.get("foundation", ""))
-        
-        for col in range(1, 10):
-            cell = ws.cell(row=row, column=col)
-            for key, value in get_cell_style().items():
-                setattr(cell, key, value)
-        row += 1
-    
-    powerblocks_end_row = row - 1
-    row += 2
+    writer.title("BIBLIOTHÈQUE POWERBLOCKS", "I")
+    writer.header(["ID", "Nom", "Puissance (MW)", "Nbr Transformateurs", 
+                   "Redondance", "CAPEX (USD)", "Longueur (m)", "Largeur (m)", "Fondation"])
+    
+    writer.append_rows((
+        [
+            powerblock["id"],
+            powerblock["name"],
+            powerblock["power_mw"],
+            powerblock.get("transformers", 0),
+            powerblock.get("redundancy_transformers", 0),
+            powerblock["capex_usd"],
+            powerblock["dimensions_m"]["length"],
+            powerblock["dimensions_m"]["width"],
+            powerblock.get("foundation", "")
+        ]
+        for powerblock in config["equipment_library"]["powerblocks"]
+    ), style=STYLE_CELL)
+    
+    writer.skip(2)
     
     # === BIBLIOTHÈQUE ÉNERGIE ===
-    ws.merge_cells(f'A{row}:D{row}')
-    title_cell = ws[f'A{row}']
-    title_cell.value = "BIBLIOTHÈQUE ÉNERGIE"
-    for key, value in get_title_style().items():
-        setattr(title_cell, key, value)
-    
-    row += 1
-    headers = ["Type", "Buffer requis", "OPEX (USD/MWh)"]
-    for col_idx, header in enumerate(headers, start=1):
-        cell = ws.cell(row=row, column=col_idx, value=header)
-        for key, value in get_header_style().items():
-            setattr(cell, key, value)
-    
-    row += 1
-    energy_start_row = row
-    for energy_type, energy_data in config["energy_sources"].items():
-        ws.cell(row=row, column=1, value=energy_type)
-        ws.cell(row=row, column=2, value="Oui" if energy_data["buffer_required"] else "Non")
-        ws.cell(row=row, column=3, value=energy_data["opex_usd_per_mwh"])
-        
-        for col in range(1, 4):
-            cell = ws.cell(row=row, column=col)
-            for key, value in get_cell_style().items():
-                setattr(cell, key, value)
-        row += 1
-    
-    energy_end_row = row - 1
-    
-    # Retourner les informations pour utilisation dans autres onglets
-    return {
-        "energy_start_row": energy_start_row,
-        "energy_end_row": energy_end_row
-    }
-    row += 2
+    writer.title("BIBLIOTHÈQUE ÉNERGIE", "D")
+    writer.header(["Type", "Buffer requis", "OPEX (USD/MWh)"])
+    
+    energy_start_row, energy_end_row = writer.append_rows((
+        [
+            energy_type,
+            "Oui" if energy_data["buffer_required"] else "Non",
+            energy_data["opex_usd_per_mwh"]
+        ]
+        for energy_type, energy_data in config["energy_sources"].items()
+    ), style=STYLE_CELL)
+    
+    writer.skip(2)
+    
+    # === PRIX CONTAINERS PAR TYPE MINING ===
+    # Container retenu pour chaque type de refroidissement (calcul_engine.select_container),
+    # prix lu par CALCUL_ENGINE selon INPUT_PROJECT!C8
+    writer.title("PRIX CONTAINERS PAR TYPE MINING", "C")
+    writer.header(["Type mining", "Container", "CAPEX (USD)"])
+    
+    mining_start_row, mining_end_row = writer.append_rows((
+        [mining_type, container["id"], container["capex_usd"]]
+        for mining_type, container in ((mining_type, select_container(config, mining_type))
+                                       for mining_type in MINING_TYPES)
+    ), style=STYLE_CELL)
+    
+    writer.skip(2)
     
     # === STANDARDS GÉNIE CIVIL ===
-    ws.merge_cells(f'A{row}:C{row}')
-    title_cell = ws[f'A{row}']
-    title_cell.value = "STANDARDS GÉNIE CIVIL"
-    for key, value in get_title_style().items():
-        setattr(title_cell, key, value)
-    
-    row += 1
-    headers = ["Type", "Nom", "Épaisseur (cm)"]
-    for col_idx, header in enumerate(headers, start=1):
-        cell = ws.cell(row=row, column=col_idx, value=header)
-        for key, value in get_header_style().items():
-            setattr(cell, key, value)
-    
-    row += 1
-    for layer in config["standards"]["civil_work"]["layers"]:
-        ws.cell(row=row, column=1, value=layer["type"])
-        ws.cell(row=row, column=2, value=layer.get("name", ""))
-        ws.cell(row=row, column=3, value=layer["thickness_cm"])
-        
-        for col in range(1, 4):
-            cell = ws.cell(row=row, column=col)
-            for key, value in get_cell_style().items():
-                setattr(cell, key, value)
-        row += 1
+    writer.title("STANDARDS GÉNIE CIVIL", "C")
+    writer.header(["Type", "Nom", "Épaisseur (cm)"])
+    
+    writer.append_rows((
+        [layer["type"], layer.get("name", ""), layer["thickness_cm"]]
+        for layer in config["standards"]["civil_work"]["layers"]
+    ), style=STYLE_CELL)
     
-    row += 2
+    writer.skip(2)
     
     # === RÈGLES ===
-    ws.merge_cells(f'A{row}:B{row}')
-    title_cell = ws[f'A{row}']
-    title_cell.value = "RÈGLES"
-    for key, value in get_title_style().items():
-        setattr(title_cell, key, value)
-    
-    row += 1
-    headers = ["Règle", "Valeur"]
-    for col_idx, header in enumerate(headers, start=1):
-        cell = ws.cell(row=row, column=col_idx, value=header)
-        for key, value in get_header_style().items():
-            setattr(cell, key, value)
-    
-    row += 1
+    writer.title("RÈGLES", "B")
+    writer.header(["Règle", "Valeur"])
+    
     rules = config["standards"]["rules"]
     rule_mapping = {
         "container_atomic_unit": "Container unité atomique",
@@ -292,74 +426,47 @@ def create_setup_admin_sheet(wb: Workbook, config: Dict[str, Any]) -> Dict[str,
         rule_name = rule_mapping.get(rule_key, rule_key)
         if isinstance(rule_value, bool):
             rule_value = "Oui" if rule_value else "Non"
-        ws.cell(row=row, column=1, value=rule_name)
-        ws.cell(row=row, column=2, value=rule_value)
-        
-        for col in range(1, 3):
-            cell = ws.cell(row=row, column=col)
-            for key, value in get_cell_style().items():
-                setattr(cell, key, value)
-        row += 1
-    
-    # Ajuster largeurs colonnes
-    ws.column_dimensions['A'].width = 18
-    ws.column_dimensions['B'].width = 35
-    ws.column_dimensions['C'].width = 18
-    ws.column_dimensions['D'].width = 15
-    ws.column_dimensions['E'].width = 18
-    ws.column_dimensions['F'].width = 15
-    ws.column_dimensions['G'].width = 15
-    ws.column_dimensions['H'].width = 15
-    ws.column_dimensions['I'].width = 12
+        writer.append([rule_name, rule_value], style=STYLE_CELL)
+    
+    # Retourner les informations pour utilisation dans autres onglets
+    return {
+        "energy_start_row": energy_start_row,
+        "energy_end_row": energy_end_row,
+        "mining_start_row": mining_start_row,
+        "mining_end_row": mining_end_row
+    }
 
 
 # ============================================================================
 # ONGLET 2: INPUT_PROJECT
 # ============================================================================
 
+@reads("project_input", "energy_sources")
 def create_input_project_sheet(wb: Workbook, config: Dict[str, Any]) -> None:
     """Crée l'onglet INPUT_PROJECT avec les paramètres utilisateur"""
     ws = wb.create_sheet("INPUT_PROJECT")
-    
-    row = 1
+    writer = SheetWriter(ws, column_widths={'A': 25, 'B': 5, 'C': 25})
     
     # Titre
-    ws.merge_cells(f'A{row}:B{row}')
-    title_cell = ws[f'A{row}']
-    title_cell.value = "PARAMÈTRES DU PROJET"
-    for key, value in get_title_style().items():
-        setattr(title_cell, key, value)
+    writer.title("PARAMÈTRES DU PROJET", "B")
+    writer.skip()
     
-    row += 2
-    
-    # Paramètres de base
+    # Paramètres de base (valeurs par défaut en colonne C, lignes 3 à 10)
+    project_input = config["project_input"]
     labels = [
-        ("Nom projet", "C3"),
-        ("Pays", "C4"),
-        ("Puissance IT cible (MW)", "C5"),
-        ("Puissance future (MW)", "C6"),
-        ("Type d'énergie", "C7"),
-        ("Type mining", "C8"),
-        ("Restriction surface", "C9"),
-        ("Surface max (m²)", "C10")
+        ("Nom projet", project_input.get("project_name", "")),
+        ("Pays", project_input.get("country", "")),
+        ("Puissance IT cible (MW)", project_input.get("power_target_mw", 0)),
+        ("Puissance future (MW)", project_input.get("future_power_mw", 0)),
+        ("Type d'énergie", project_input.get("energy_type", "grid")),
+        ("Type mining", project_input.get("mining_type", "air")),
+        ("Restriction surface", "Non" if project_input.get("surface_limit_m2") is None else "Oui"),
+        ("Surface max (m²)", project_input.get("surface_limit_m2") or "")
     ]
     
-    for label, cell_ref in labels:
-        ws.cell(row=row, column=1, value=label).font = Font(bold=True)
-        ws.cell(row=row, column=2, value=":")
-        ws.cell(row=row, column=3).fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
-        row += 1
-    
-    # Valeurs par défaut
-    project_input = config["project_input"]
-    ws["C3"].value = project_input.get("project_name", "")
-    ws["C4"].value = project_input.get("country", "")
-    ws["C5"].value = project_input.get("power_target_mw", 0)
-    ws["C6"].value = project_input.get("future_power_mw", 0)
-    ws["C7"].value = project_input.get("energy_type", "grid")
-    ws["C8"].value = project_input.get("mining_type", "air")
-    ws["C9"].value = "Non" if project_input.get("surface_limit_m2") is None else "Oui"
-    ws["C10"].value = project_input.get("surface_limit_m2") or ""
+    for label, value in labels:
+        writer.append([label, ":", value],
+                      styles={1: STYLE_LABEL, 3: STYLE_INPUT})
     
     # Validation liste déroulante pour Type d'énergie
     energy_types = list(config["energy_sources"].keys())
@@ -367,80 +474,52 @@ def create_input_project_sheet(wb: Workbook, config: Dict[str, Any]) -> None:
         type="list",
         formula1=f'"{",".join(energy_types)}"'
     )
-    energy_dv.add(ws["C7"])
-    ws.add_data_validation(energy_dv)
+    energy_dv.add("C7")
+    ws.data_validations.append(energy_dv)
     
     # Validation liste déroulante pour Type mining
     mining_dv = DataValidation(
         type="list",
-        formula1='"air,immersion"'
+        formula1=f'"{",".join(MINING_TYPES)}"'
     )
-    mining_dv.add(ws["C8"])
-    ws.add_data_validation(mining_dv)
+    mining_dv.add("C8")
+    ws.data_validations.append(mining_dv)
     
     # Validation liste déroulante pour Restriction surface
     restriction_dv = DataValidation(
         type="list",
         formula1='"Oui,Non"'
     )
-    restriction_dv.add(ws["C9"])
-    ws.add_data_validation(restriction_dv)
+    restriction_dv.add("C9")
+    ws.data_validations.append(restriction_dv)
     
-    row += 2
+    writer.skip(2)
     
     # Phasage chantier
-    ws.merge_cells(f'A{row}:C{row}')
-    title_cell = ws[f'A{row}']
-    title_cell.value = "PHASAGE CHANTIER"
-    for key, value in get_title_style().items():
-        setattr(title_cell, key, value)
-    
-    row += 1
-    headers = ["Phase", "Puissance (MW)"]
-    for col_idx, header in enumerate(headers, start=1):
-        cell = ws.cell(row=row, column=col_idx, value=header)
-        for key, value in get_header_style().items():
-            setattr(cell, key, value)
-    
-    row += 1
+    writer.title("PHASAGE CHANTIER", "C")
+    writer.header(["Phase", "Puissance (MW)"])
+    
     phasing = project_input.get("phasing", [])
     for i, phase in enumerate(phasing, start=1):
-        ws.cell(row=row, column=1, value=f"Phase {i}")
-        ws.cell(row=row, column=2, value=phase.get("power_mw", 0))
-        row += 1
+        writer.append([f"Phase {i}", phase.get("power_mw", 0)])
     
     # Ligne vide pour ajouter des phases
-    ws.cell(row=row, column=1, value="Phase ?").fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
-    ws.cell(row=row, column=2).fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
-    
-    # Ajuster largeurs colonnes
-    ws.column_dimensions['A'].width = 25
-    ws.column_dimensions['B'].width = 5
-    ws.column_dimensions['C'].width = 25
+    writer.append(["Phase ?"], styles={1: STYLE_INPUT, 2: STYLE_INPUT})
 
 
 # ============================================================================
 # ONGLET 3: CALCUL_ENGINE
 # ============================================================================
 
+@reads("standards.rules", "equipment_library", "energy_sources")
 def create_calcul_engine_sheet(wb: Workbook, config: Dict[str, Any], setup_info: Dict[str, int]) -> Dict[str, int]:
     """Crée l'onglet CALCUL_ENGINE avec les formules de calcul"""
     ws = wb.create_sheet("CALCUL_ENGINE")
-    
-    row = 1
+    writer = SheetWriter(ws, column_widths={'A': 25, 'B': 18, 'C': 20, 'D': 18, 'E': 5})
     
     # === CALCULS QUANTITÉS ===
-    ws.merge_cells(f'A{row}:C{row}')
-    title_cell = ws[f'A{row}']
-    title_cell.value = "CALCULS QUANTITÉS"
-    for key, value in get_title_style().items():
-        setattr(title_cell, key, value)
-    
-    row += 1
-    ws.cell(row=row, column=1, value="Équipement").font = Font(bold=True)
-    ws.cell(row=row, column=2, value="Quantité").font = Font(bold=True)
-    
-    row += 1
+    writer.title("CALCULS QUANTITÉS", "C")
+    writer.append(["Équipement", "Quantité"], style=STYLE_LABEL)
     
     rules = config["standards"]["rules"]
     container_power = rules["container_power_mw"]
@@ -449,418 +528,210 @@ def create_calcul_engine_sheet(wb: Workbook, config: Dict[str, Any], setup_info:
     no_powerblock_below = rules["no_powerblock_below_mw"]
     
     # Containers
-    ws.cell(row=row, column=1, value="Containers HD5")
-    ws.cell(row=row, column=2, value=f'=ARRONDI.SUP(INPUT_PROJECT!C5/{container_power};0)')
-    row += 1
+    containers_qty_row = writer.append(
+        ["Containers HD5", f'=ARRONDI.SUP(INPUT_PROJECT!C5/{container_power};0)'])
     
     # Transformateurs
-    ws.cell(row=row, column=1, value="Transformateurs")
-    ws.cell(row=row, column=2, value=f'=ARRONDI.SUP(INPUT_PROJECT!C5/{transformer_power};0)')
-    row += 1
+    transformers_qty_row = writer.append(
+        ["Transformateurs", f'=ARRONDI.SUP(INPUT_PROJECT!C5/{transformer_power};0)'])
     
     # PowerBlocks
-    ws.cell(row=row, column=1, value="PowerBlocks")
-    ws.cell(row=row, column=2, value=f'=SI(INPUT_PROJECT!C5<{no_powerblock_below};0;ARRONDI.SUP(INPUT_PROJECT!C5/{powerblock_power};0))')
-    row += 2
+    powerblocks_qty_row = writer.append(
+        ["PowerBlocks", f'=SI(INPUT_PROJECT!C5<{no_powerblock_below};0;ARRONDI.SUP(INPUT_PROJECT!C5/{powerblock_power};0))'])
+    writer.skip()
     
     # === CALCULS CAPEX ===
-    ws.merge_cells(f'A{row}:E{row}')
-    title_cell = ws[f'A{row}']
-    title_cell.value = "CALCULS CAPEX"
-    for key, value in get_title_style().items():
-        setattr(title_cell, key, value)
-    
-    row += 1
-    headers = ["Équipement", "Quantité", "Prix unitaire (USD)", "CAPEX (USD)"]
-    for col_idx, header in enumerate(headers, start=1):
-        cell = ws.cell(row=row, column=col_idx, value=header)
-        for key, value in get_header_style().items():
-            setattr(cell, key, value)
-    
-    row += 1
-    capex_start_row = row
-    
-    # Stocker les lignes de quantité pour référence
-    containers_qty_row = row - 3  # Ligne de quantité containers (B4)
-    transformers_qty_row = row - 2  # Ligne de quantité transformateurs (B5)
-    powerblocks_qty_row = row - 1  # Ligne de quantité powerblocks (B6)
-    
-    # Containers CAPEX
-    container_id = config["equipment_library"]["containers"][0]["id"]
-    container_capex = config["equipment_library"]["containers"][0]["capex_usd"]
-    ws.cell(row=row, column=1, value="Containers")
-    ws.cell(row=row, column=2, value=f'=B{containers_qty_row}')
-    ws.cell(row=row, column=3, value=container_capex)
-    ws.cell(row=row, column=4, value=f'=B{row}*C{row}')
-    row += 1
+    writer.title("CALCULS CAPEX", "E")
+    writer.header(["Équipement", "Quantité", "Prix unitaire (USD)", "CAPEX (USD)"])
+    
+    capex_start_row = writer.row
+    
+    # Containers CAPEX: prix du container du type mining sélectionné (INPUT_PROJECT!C8)
+    mining_start = setup_info["mining_start_row"]
+    mining_end = setup_info["mining_end_row"]
+    container_capex = f'=INDEX(SETUP_ADMIN!C{mining_start}:C{mining_end};EQUIV(INPUT_PROJECT!C8;SETUP_ADMIN!A{mining_start}:A{mining_end};0);1)'
+    row = writer.row
+    writer.append(["Containers", f'=B{containers_qty_row}', container_capex, f'=B{row}*C{row}'])
     
     # Transformateurs CAPEX
-    transformer_id = config["equipment_library"]["transformers"][0]["id"]
-    transformer_capex = config["equipment_library"]["transformers"][0]["capex_usd"]
-    ws.cell(row=row, column=1, value="Transformateurs")
-    ws.cell(row=row, column=2, value=f'=B{transformers_qty_row}')
-    ws.cell(row=row, column=3, value=transformer_capex)
-    ws.cell(row=row, column=4, value=f'=B{row}*C{row}')
-    row += 1
+    transformer_capex = get_equipment(config, "transformers")["capex_usd"]
+    row = writer.row
+    writer.append(["Transformateurs", f'=B{transformers_qty_row}', transformer_capex, f'=B{row}*C{row}'])
     
     # PowerBlocks CAPEX
-    powerblock_id = config["equipment_library"]["powerblocks"][0]["id"]
-    powerblock_capex = config["equipment_library"]["powerblocks"][0]["capex_usd"]
-    ws.cell(row=row, column=1, value="PowerBlocks")
-    ws.cell(row=row, column=2, value=f'=B{powerblocks_qty_row}')
-    ws.cell(row=row, column=3, value=powerblock_capex)
-    ws.cell(row=row, column=4, value=f'=B{row}*C{row}')
-    row += 1
+    powerblock_capex = get_equipment(config, "powerblocks")["capex_usd"]
+    row = writer.row
+    writer.append(["PowerBlocks", f'=B{powerblocks_qty_row}', powerblock_capex, f'=B{row}*C{row}'])
     
     # Génie Civil (à calculer basé sur surface)
-    ws.cell(row=row, column=1, value="Génie Civil")
-    ws.cell(row=row, column=2, value="")
-    ws.cell(row=row, column=3, value="")
-    ws.cell(row=row, column=4, value='=LAYOUT!B2*100')  # Surface totale * coût/m² (100 USD/m² exemple)
-    row += 1
+    # Surface totale * coût/m²
+    writer.append(["Génie Civil", "", "", f'=LAYOUT!B1*{CIVIL_COST_USD_PER_M2}'])
+    
+    # Câbles BT: longueur totale des raccordements (mètres, LAYOUT!K1) * coût/m
+    row = writer.row
+    writer.append(["Câbles BT (m)", '=LAYOUT!K1', CABLE_COST_USD_PER_M, f'=B{row}*C{row}'])
     
     # CAPEX Total
-    ws.cell(row=row, column=1, value="CAPEX TOTAL").font = Font(bold=True, size=12)
-    ws.cell(row=row, column=2, value="")
-    ws.cell(row=row, column=3, value="")
-    ws.cell(row=row, column=4, value=f'=SOMME(D{capex_start_row}:D{row-1})').font = Font(bold=True, size=12)
-    capex_total_row = row
-    row += 2
+    row = writer.row
+    capex_total_row = writer.append(
+        ["CAPEX TOTAL", "", "", f'=SOMME(D{capex_start_row}:D{row-1})'],
+        styles={1: STYLE_TOTAL, 4: STYLE_TOTAL})
+    writer.skip()
     
     # === CALCULS OPEX ===
-    ws.merge_cells(f'A{row}:C{row}')
-    title_cell = ws[f'A{row}']
-    title_cell.value = "CALCULS OPEX (ANNUEL)"
-    for key, value in get_title_style().items():
-        setattr(title_cell, key, value)
-    
-    row += 1
-    ws.cell(row=row, column=1, value="Élément").font = Font(bold=True)
-    ws.cell(row=row, column=2, value="OPEX (USD/an)").font = Font(bold=True)
-    
-    row += 1
+    writer.title("CALCULS OPEX (ANNUEL)", "C")
+    writer.append(["Élément", "OPEX (USD/an)"], style=STYLE_LABEL)
     
     # OPEX Électricité
     # Formule complexe pour récupérer OPEX selon type énergie
     # On utilise INDEX/MATCH pour trouver l'OPEX du type d'énergie sélectionné
-    ws.cell(row=row, column=1, value="Électricité")
     # Formule: puissance * 8760 * OPEX selon type énergie
     energy_start = setup_info["energy_start_row"]
     energy_end = setup_info["energy_end_row"]
     energy_col_ref = f'INDEX(SETUP_ADMIN!C{energy_start}:C{energy_end};EQUIV(INPUT_PROJECT!C7;SETUP_ADMIN!A{energy_start}:A{energy_end};0);1)'
-    ws.cell(row=row, column=2, value=f'=INPUT_PROJECT!C5*8760*{energy_col_ref}')
-    row += 1
+    opex_electricity_row = writer.append(["Électricité", f'=INPUT_PROJECT!C5*{HOURS_PER_YEAR}*{energy_col_ref}'])
     
-    # OPEX Maintenance (% CAPEX - exemple 2%)
-    opex_maint_row = row
-    ws.cell(row=row, column=1, value="Maintenance (2% CAPEX)")
-    ws.cell(row=row, column=2, value=f'=D{capex_total_row}*0.02')
-    row += 1
+    # OPEX Maintenance (% CAPEX)
+    opex_maint_row = writer.append([f"Maintenance ({MAINTENANCE_RATE:.0%} CAPEX)", f'=D{capex_total_row}*{MAINTENANCE_RATE}'])
     
     # OPEX Total
-    opex_total_row = row
-    ws.cell(row=row, column=1, value="OPEX TOTAL").font = Font(bold=True, size=12)
-    ws.cell(row=row, column=2, value=f'=SOMME(B{row-2}:B{row-1})').font = Font(bold=True, size=12)
-    
-    # Ajuster largeurs colonnes
-    ws.column_dimensions['A'].width = 25
-    ws.column_dimensions['B'].width = 18
-    ws.column_dimensions['C'].width = 20
-    ws.column_dimensions['D'].width = 18
-    ws.column_dimensions['E'].width = 5
+    opex_total_row = writer.append(
+        ["OPEX TOTAL", f'=SOMME(B{opex_electricity_row}:B{opex_maint_row})'], style=STYLE_TOTAL)
     
     # Retourner les informations pour utilisation dans autres onglets
     return {
+        "containers_qty_row": containers_qty_row,
+        "transformers_qty_row": transformers_qty_row,
+        "powerblocks_qty_row": powerblocks_qty_row,
         "capex_containers_row": capex_start_row,
         "capex_transformers_row": capex_start_row + 1,
         "capex_powerblocks_row": capex_start_row + 2,
         "capex_civil_row": capex_start_row + 3,
+        "capex_cables_row": capex_start_row + 4,
         "capex_total_row": capex_total_row,
-        "opex_electricity_row": row - 2,
-        "opex_maintenance_row": row - 1,
+        "opex_electricity_row": opex_total_row - 2,
+        "opex_maintenance_row": opex_total_row - 1,
         "opex_total_row": opex_total_row
     }
 
 
-# ============================================================================
-# GÉNÉRATION DU LAYOUT AUTOMATIQUE
-# ============================================================================
-
-def generate_layout(config: Dict[str, Any], power_target_mw: float) -> List[Dict[str, Any]]:
-    """Génère le layout automatique des équipements"""
-    layout_data = []
-    
-    rules = config["standards"]["rules"]
-    defaults = config["layout_engine"]["defaults"]
-    layout_rules = config["layout_engine"]["rules"]
-    
-    container_power = rules["container_power_mw"]
-    transformer_power = rules["transformer_size_mw"]
-    max_containers_per_transformer = rules["max_containers_per_transformer"]
-    
-    # Dimensions
-    container_dim = config["layout_engine"]["elements_dimensions"]["HD5"]
-    transformer_dim = config["layout_engine"]["elements_dimensions"]["TR_5MW"]
-    
-    container_length = container_dim["length"]
-    container_width = container_dim["width"]
-    transformer_length = transformer_dim["length"]
-    transformer_width = transformer_dim["width"]
-    
-    # Espacements
-    container_spacing = defaults["container_spacing_m"]
-    row_spacing = defaults["row_spacing_m"]
-    road_width = defaults["road_width_m"]
-    grass_width = defaults["grass_strip_width_m"]
-    
-    # Calculs quantités
-    num_containers = math.ceil(power_target_mw / container_power)
-    num_transformers = math.ceil(power_target_mw / transformer_power)
-    
-    # Organisation en lignes (3 containers max par transformateur)
-    containers_per_row = max_containers_per_transformer
-    num_rows = math.ceil(num_containers / containers_per_row)
-    
-    current_x = road_width  # Commence après la route initiale
-    current_y = road_width  # Commence après la route initiale
-    
-    # Génération des containers et transformateurs
-    container_idx = 0
-    transformer_idx = 0
-    
-    for row in range(num_rows):
-        row_y = current_y
-        
-        # Containers de la ligne
-        containers_in_row = min(containers_per_row, num_containers - container_idx)
-        for col in range(containers_in_row):
-            x_pos = current_x + col * (container_length + container_spacing)
-            layout_data.append({
-                "id": f"HD5-{container_idx + 1}",
-                "type": "Container",
-                "x": x_pos,
-                "y": row_y,
-                "rotation": 0,
-                "phase": 1,
-                "length": container_length,
-                "width": container_width
-            })
-            container_idx += 1
-        
-        # Transformateur de la ligne (placé après les containers)
-        if transformer_idx < num_transformers:
-            trans_x = current_x + containers_in_row * (container_length + container_spacing) + container_spacing
-            layout_data.append({
-                "id": f"TR-{transformer_idx + 1}",
-                "type": "Transformateur",
-                "x": trans_x,
-                "y": row_y,
-                "rotation": 0,
-                "phase": 1,
-                "length": transformer_length,
-                "width": transformer_width
-            })
-            transformer_idx += 1
-        
-        # Routes autour de chaque container (si règle activée)
-        if layout_rules.get("road_around_each_container", False):
-            for col in range(containers_in_row):
-                cont_x = current_x + col * (container_length + container_spacing)
-                # Route nord
-                layout_data.append({
-                    "id": f"ROAD-N-{row}-{col}",
-                    "type": "Route",
-                    "x": cont_x - road_width / 2,
-                    "y": row_y - road_width / 2,
-                    "rotation": 0,
-                    "phase": 1,
-                    "length": container_length + road_width,
-                    "width": road_width
-                })
-                # Route sud
-                layout_data.append({
-                    "id": f"ROAD-S-{row}-{col}",
-                    "type": "Route",
-                    "x": cont_x - road_width / 2,
-                    "y": row_y + container_width + road_width / 2,
-                    "rotation": 0,
-                    "phase": 1,
-                    "length": container_length + road_width,
-                    "width": road_width
-                })
-                # Route est
-                layout_data.append({
-                    "id": f"ROAD-E-{row}-{col}",
-                    "type": "Route",
-                    "x": cont_x + container_length + road_width / 2,
-                    "y": row_y - road_width / 2,
-                    "rotation": 0,
-                    "phase": 1,
-                    "length": road_width,
-                    "width": container_width + road_width
-                })
-                # Route ouest
-                layout_data.append({
-                    "id": f"ROAD-W-{row}-{col}",
-                    "type": "Route",
-                    "x": cont_x - road_width / 2,
-                    "y": row_y - road_width / 2,
-                    "rotation": 0,
-                    "phase": 1,
-                    "length": road_width,
-                    "width": container_width + road_width
-                })
-        
-        # Route autour de la ligne (si règle activée)
-        if layout_rules.get("road_around_each_row", False) and row == 0:
-            # Route ouest de la ligne
-            row_width = containers_in_row * (container_length + container_spacing) - container_spacing
-            layout_data.append({
-                "id": f"ROAD-ROW-W-{row}",
-                "type": "Route",
-                "x": current_x - road_width,
-                "y": row_y - road_width / 2,
-                "rotation": 0,
-                "phase": 1,
-                "length": road_width,
-                "width": container_width + road_width + (transformer_width if transformer_idx <= num_transformers else 0)
-            })
-        
-        # Mise à jour Y pour la ligne suivante
-        max_width_in_row = max(container_width, transformer_width if transformer_idx <= num_transformers else 0)
-        current_y += max_width_in_row + row_spacing
-        
-        # Gazon entre les lignes (si règle activée et pas dernière ligne)
-        if layout_rules.get("grass_between_rows", False) and row < num_rows - 1:
-            grass_y = row_y + max_width_in_row + road_width
-            layout_data.append({
-                "id": f"GRASS-{row}",
-                "type": "Gazon",
-                "x": current_x - road_width,
-                "y": grass_y,
-                "rotation": 0,
-                "phase": 1,
-                "length": row_width + road_width * 2,
-                "width": grass_width
-            })
-            current_y += grass_width
-    
-    return layout_data
-
 
 # ============================================================================
 # ONGLET 4: LAYOUT
 # ============================================================================
 
-def create_layout_sheet(wb: Workbook, config: Dict[str, Any]) -> None:
-    """Crée l'onglet LAYOUT avec le tableau des positions"""
+@reads("project_input.power_target_mw", "project_input.phasing", "standards.rules", "layout_engine")
+def create_layout_sheet(wb: Workbook, config: Dict[str, Any], conflicts: List[Conflict] = None,
+                        surfaces: Dict[str, float] = None, cables: Dict[str, Any] = None) -> None:
+    """
+    Crée l'onglet LAYOUT avec le tableau des positions (et le résumé des
+    conflits si fourni). surfaces: surfaces de l'union des empreintes par
+    type et totale (layout_geometry.layout_surfaces), écrites comme valeurs.
+    cables: plan de câblage (cable_engine.cable_plan), longueur totale en K1.
+    """
     ws = wb.create_sheet("LAYOUT")
+    writer = SheetWriter(ws, column_widths={
+        'A': 20, 'B': 15, 'C': 12, 'D': 18, 'E': 12, 'F': 10, 'G': 12, 'H': 12, 'I': 20, 'J': 22, 'K': 14
+    })
+    surfaces = surfaces or {}
+    cables = cables or {}
+    
+    # Câbles BT (colonnes J-K des lignes 1 et 2): longueur totale, reprise par CALCUL_ENGINE
+    unassigned = cables.get("unassigned", 0)
+    cable_lines = [
+        [None] * 4 + ["Câbles BT (m):", cables.get("total_m", 0.0)],
+        [None] * 4 + ["Containers non raccordés:", unassigned],
+    ]
+    cable_styles = [{10: STYLE_LABEL, 11: STYLE_CELL},
+                    {10: STYLE_LABEL, 11: STYLE_ALERT if unassigned else STYLE_CELL}]
+    
+    # Surfaces par type (colonnes D-E des lignes 1 à 4): zones communes comptées une fois
+    surface_lines = [
+        [f"{label} (m²):", surfaces.get(element_type, 0.0)]
+        for element_type, label in (("Container", "Containers"), ("Transformateur", "Transformateurs"),
+                                    ("Route", "Routes"), ("Gazon", "Gazon"))
+    ]
+    surface_styles = {4: STYLE_LABEL, 5: STYLE_CELL}
     
-    row = 1
-    
-    # Surface totale (sera calculée)
-    ws.cell(row=row, column=1, value="Surface totale utilisée (m²):").font = Font(bold=True)
-    ws.cell(row=row, column=2, value='=SOMMEPROD(G6:G1000;H6:H1000)')
+    # Surface totale: union de toutes les empreintes, calculée à la génération
+    writer.append(["Surface totale utilisée (m²):", surfaces.get("Total", 0.0), None, *surface_lines[0],
+                   *cable_lines[0]],
+                  styles={1: STYLE_LABEL, **surface_styles, **cable_styles[0]})
     
     # Vérification limite de surface (si définie)
-    row += 1
-    ws.cell(row=row, column=1, value="Surface limite (m²):").font = Font(bold=True)
-    ws.cell(row=row, column=2, value='=SI(INPUT_PROJECT!C9="Oui";INPUT_PROJECT!C10;"Non limité")')
-    
-    row += 1
-    ws.cell(row=row, column=1, value="Alerte dépassement:").font = Font(bold=True)
-    ws.cell(row=row, column=2, value='=SI(ET(INPUT_PROJECT!C9="Oui";B2>B3);"⚠ DÉPASSEMENT";"OK")')
-    ws.cell(row=row, column=2).fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-    row += 2
+    writer.append(["Surface limite (m²):", '=SI(INPUT_PROJECT!C9="Oui";INPUT_PROJECT!C10;"Non limité")',
+                   None, *surface_lines[1], *cable_lines[1]],
+                  styles={1: STYLE_LABEL, **surface_styles, **cable_styles[1]})
+    
+    writer.append(["Alerte dépassement:", '=SI(ET(INPUT_PROJECT!C9="Oui";B1>B2);"⚠ DÉPASSEMENT";"OK")',
+                   None, *surface_lines[2]],
+                  styles={1: STYLE_LABEL, 2: STYLE_ALERT, **surface_styles})
+    
+    # Résumé du contrôle des chevauchements (détail dans la colonne Alerte)
+    if conflicts is None:
+        writer.append([None, None, None, *surface_lines[3]], styles=surface_styles)
+    else:
+        overlaps = sum(1 for conflict in conflicts if conflict.overlap)
+        writer.append([
+            "Conflits de positionnement:",
+            len(conflicts),
+            f"{overlaps} chevauchement(s), {len(conflicts) - overlaps} trop proche(s)",
+            *surface_lines[3]
+        ], styles={1: STYLE_LABEL, 2: STYLE_ALERT if conflicts else STYLE_CELL, **surface_styles})
     
     # Tableau Layout
-    headers = ["ID Élément", "Type", "X (m)", "Y (m)", "Rotation (°)", "Phase", "Longueur (m)", "Largeur (m)", "Alerte"]
-    for col_idx, header in enumerate(headers, start=1):
-        cell = ws.cell(row=row, column=col_idx, value=header)
-        for key, value in get_header_style().items():
-            setattr(cell, key, value)
-    
-    row += 1
-    
-    # Les données seront générées dynamiquement via une formule ou seront pré-remplies
-    # Pour l'instant, on crée les en-têtes et on laisse les cellules vides/modifiables
-    # Note: Les données du layout seront générées et remplies après création de INPUT_PROJECT
-    # car elles dépendent de la puissance cible
-    
-    # Ajuster largeurs colonnes
-    ws.column_dimensions['A'].width = 20
-    ws.column_dimensions['B'].width = 15
-    ws.column_dimensions['C'].width = 12
-    ws.column_dimensions['D'].width = 12
-    ws.column_dimensions['E'].width = 12
-    ws.column_dimensions['F'].width = 10
-    ws.column_dimensions['G'].width = 12
-    ws.column_dimensions['H'].width = 12
-    ws.column_dimensions['I'].width = 20
+    writer.header(["ID Élément", "Type", "X (m)", "Y (m)", "Rotation (°)", "Phase", "Longueur (m)", "Largeur (m)", "Alerte",
+                   "Raccordement", "Câble BT (m)"])
+    
+    # Les données du layout sont ajoutées par populate_layout_sheet() à partir
+    # de la ligne 6, car elles dépendent de la puissance cible. En streaming,
+    # la feuille reste ouverte et les lignes sont ajoutées à la suite.
 
 
 # ============================================================================
 # ONGLET 5: GRAPHIQUES
 # ============================================================================
 
-def create_graphiques_sheet(wb: Workbook, config: Dict[str, Any], calcul_info: Dict[str, int]) -> None:
-    """Crée l'onglet GRAPHIQUES avec les données et graphiques"""
+def create_graphiques_sheet(wb: Workbook, config: Dict[str, Any], calcul_info: Dict[str, int],
+                            phases: List[Dict[str, Any]] = None) -> Dict[str, int]:
+    """
+    Crée l'onglet GRAPHIQUES avec les données et graphiques.
+    phases: évolution par phase (calcul_engine.calculate_phases)
+    """
     ws = wb.create_sheet("GRAPHIQUES")
-    
-    row = 1
+    writer = SheetWriter(ws, column_widths={'A': 20, 'B': 18, 'C': 18})
     
     # === RÉPARTITION CAPEX ===
-    ws.merge_cells(f'A{row}:C{row}')
-    title_cell = ws[f'A{row}']
-    title_cell.value = "RÉPARTITION CAPEX"
-    for key, value in get_title_style().items():
-        setattr(title_cell, key, value)
-    
-    row += 1
-    headers = ["Élément", "CAPEX (USD)", "Part (%)"]
-    for col_idx, header in enumerate(headers, start=1):
-        cell = ws.cell(row=row, column=col_idx, value=header)
-        for key, value in get_header_style().items():
-            setattr(cell, key, value)
-    
-    row += 1
-    capex_pie_start_row = row
+    writer.title("RÉPARTITION CAPEX", "C")
+    writer.header(["Élément", "CAPEX (USD)", "Part (%)"])
+    
+    capex_pie_start_row = writer.row
+    total_row = capex_pie_start_row + 5
     
     # Références aux valeurs CAPEX de CALCUL_ENGINE
-    containers_capex_row = row
-    ws.cell(row=row, column=1, value="Containers")
-    ws.cell(row=row, column=2, value=f'=CALCUL_ENGINE!D{calcul_info["capex_containers_row"]}')
-    row += 1
-    
-    ws.cell(row=row, column=1, value="Transformateurs")
-    ws.cell(row=row, column=2, value=f'=CALCUL_ENGINE!D{calcul_info["capex_transformers_row"]}')
-    row += 1
-    
-    ws.cell(row=row, column=1, value="PowerBlocks")
-    ws.cell(row=row, column=2, value=f'=CALCUL_ENGINE!D{calcul_info["capex_powerblocks_row"]}')
-    row += 1
-    
-    ws.cell(row=row, column=1, value="Génie Civil")
-    ws.cell(row=row, column=2, value=f'=CALCUL_ENGINE!D{calcul_info["capex_civil_row"]}')
-    row += 1
-    
-    total_row = row
-    ws.cell(row=row, column=1, value="TOTAL").font = Font(bold=True)
-    ws.cell(row=row, column=2, value='=SOMME(B6:B9)').font = Font(bold=True)
-    ws.cell(row=row, column=3, value="100%").font = Font(bold=True)
-    # Ajouter formule pour les pourcentages
-    ws.cell(row=containers_capex_row, column=3, value='=SI($B$10<>0;B6/$B$10;0)')
-    ws.cell(row=containers_capex_row+1, column=3, value='=SI($B$10<>0;B7/$B$10;0)')
-    ws.cell(row=containers_capex_row+2, column=3, value='=SI($B$10<>0;B8/$B$10;0)')
-    ws.cell(row=containers_capex_row+3, column=3, value='=SI($B$10<>0;B9/$B$10;0)')
-    capex_total_row_graph = row
-    row += 3
+    capex_lines = [
+        ("Containers", calcul_info["capex_containers_row"]),
+        ("Transformateurs", calcul_info["capex_transformers_row"]),
+        ("PowerBlocks", calcul_info["capex_powerblocks_row"]),
+        ("Génie Civil", calcul_info["capex_civil_row"]),
+        ("Câbles BT", calcul_info["capex_cables_row"])
+    ]
+    for label, calcul_row in capex_lines:
+        row = writer.row
+        writer.append([
+            label,
+            f'=CALCUL_ENGINE!D{calcul_row}',
+            f'=SI($B${total_row}<>0;B{row}/$B${total_row};0)'
+        ])
+    
+    writer.append(["TOTAL", f'=SOMME(B{capex_pie_start_row}:B{total_row - 1})', "100%"], style=STYLE_LABEL)
+    writer.skip(2)
     
     # Graphique camembert CAPEX
     pie = PieChart()
     pie.title = "Répartition CAPEX"
-    labels = Reference(ws, min_col=1, min_row=capex_pie_start_row, max_row=capex_pie_start_row+3)
-    data = Reference(ws, min_col=2, min_row=capex_pie_start_row-1, max_row=capex_pie_start_row+3)
+    labels = Reference(ws, min_col=1, min_row=capex_pie_start_row, max_row=total_row-1)
+    data = Reference(ws, min_col=2, min_row=capex_pie_start_row-1, max_row=total_row-1)
     pie.add_data(data, titles_from_data=True)
     pie.set_categories(labels)
     pie.height = 10
@@ -868,26 +739,14 @@ def create_graphiques_sheet(wb: Workbook, config: Dict[str, Any], calcul_info: D
     ws.add_chart(pie, "E2")
     
     # === CAPEX vs OPEX ===
-    ws.merge_cells(f'A{row}:C{row}')
-    title_cell = ws[f'A{row}']
-    title_cell.value = "CAPEX vs OPEX ANNUEL"
-    for key, value in get_title_style().items():
-        setattr(title_cell, key, value)
-    
-    row += 1
-    headers = ["Type", "CAPEX (USD)", "OPEX (USD/an)"]
-    for col_idx, header in enumerate(headers, start=1):
-        cell = ws.cell(row=row, column=col_idx, value=header)
-        for key, value in get_header_style().items():
-            setattr(cell, key, value)
-    
-    row += 1
-    comparison_start_row = row
-    
-    ws.cell(row=row, column=1, value="Total")
-    ws.cell(row=row, column=2, value=f'=CALCUL_ENGINE!D{calcul_info["capex_total_row"]}')
-    ws.cell(row=row, column=3, value=f'=CALCUL_ENGINE!B{calcul_info["opex_total_row"]}')
-    row += 1
+    writer.title("CAPEX vs OPEX ANNUEL", "C")
+    writer.header(["Type", "CAPEX (USD)", "OPEX (USD/an)"])
+    
+    comparison_start_row = writer.append([
+        "Total",
+        f'=CALCUL_ENGINE!D{calcul_info["capex_total_row"]}',
+        f'=CALCUL_ENGINE!B{calcul_info["opex_total_row"]}'
+    ])
     
     # Graphique barres CAPEX vs OPEX
     bar = BarChart()
@@ -904,87 +763,351 @@ def create_graphiques_sheet(wb: Workbook, config: Dict[str, Any], calcul_info: D
     bar.width = 15
     ws.add_chart(bar, f"E{comparison_start_row + 5}")
     
-    row += 3
+    writer.skip(3)
     
     # === ÉVOLUTION PAR PHASE ===
-    ws.merge_cells(f'A{row}:C{row}')
-    title_cell = ws[f'A{row}']
-    title_cell.value = "ÉVOLUTION PAR PHASE"
-    for key, value in get_title_style().items():
-        setattr(title_cell, key, value)
+    writer.title("ÉVOLUTION PAR PHASE", "C")
+    writer.header(["Phase", "Puissance (MW)", "CAPEX cumulé (USD)"])
     
-    row += 1
-    headers = ["Phase", "Puissance (MW)", "CAPEX (USD)"]
-    for col_idx, header in enumerate(headers, start=1):
-        cell = ws.cell(row=row, column=col_idx, value=header)
-        for key, value in get_header_style().items():
-            setattr(cell, key, value)
+    # Valeurs calculées à la génération, à partir du phasage et du layout
+    # (chaque élément du LAYOUT porte sa phase de construction)
+    if phases:
+        writer.append_rows((
+            [f"Phase {phase['phase']}", phase["power_mw"], phase["cumulative_capex_usd"]]
+            for phase in phases
+        ), style=STYLE_CELL)
     
-    # Les données par phase seront dynamiques basées sur INPUT_PROJECT
-    # Pour l'instant, on crée la structure
+    return {
+        "capex_pie_start_row": capex_pie_start_row,
+        "capex_pie_total_row": total_row,
+        "comparison_row": comparison_start_row
+    }
+
+
+# ============================================================================
+# VALEURS EN CACHE DES FORMULES
+# ============================================================================
+
+def formula_values(config: Dict[str, Any], results: Dict[str, Any], calcul_info: Dict[str, int],
+                   graphiques_info: Dict[str, int]) -> Dict[str, Dict[str, Any]]:
+    """
+    Valeurs des formules calculées nativement (calcul_engine.calculate),
+    par onglet puis par cellule, à enregistrer comme valeurs en cache.
+    """
+    calcul = {
+        f'B{calcul_info["containers_qty_row"]}': results["containers"],
+        f'B{calcul_info["transformers_qty_row"]}': results["transformers"],
+        f'B{calcul_info["powerblocks_qty_row"]}': results["powerblocks"],
+        f'D{calcul_info["capex_civil_row"]}': results["capex_civil"],
+        f'B{calcul_info["capex_cables_row"]}': results["cable_length_m"],
+        f'D{calcul_info["capex_cables_row"]}': results["capex_cables"],
+        f'D{calcul_info["capex_total_row"]}': results["capex_total"],
+        f'B{calcul_info["opex_electricity_row"]}': results["opex_electricity"],
+        f'B{calcul_info["opex_maintenance_row"]}': results["opex_maintenance"],
+        f'B{calcul_info["opex_total_row"]}': results["opex_total"]
+    }
+    for equipment in ("containers", "transformers", "powerblocks"):
+        row = calcul_info[f"capex_{equipment}_row"]
+        calcul[f'B{row}'] = results[equipment]
+        calcul[f'D{row}'] = results[f"capex_{equipment}"]
+    calcul[f'C{calcul_info["capex_containers_row"]}'] = select_container(config, results["mining_type"])["capex_usd"]
+    
+    surface_limit = config["project_input"].get("surface_limit_m2")
+    layout = {
+        "B2": surface_limit if surface_limit is not None else "Non limité",
+        "B3": "⚠ DÉPASSEMENT" if surface_limit is not None and results["surface_m2"] > surface_limit else "OK"
+    }
     
-    # Ajuster largeurs colonnes
-    ws.column_dimensions['A'].width = 20
-    ws.column_dimensions['B'].width = 18
-    ws.column_dimensions['C'].width = 18
+    capex_total = results["capex_total"]
+    graphiques = {}
+    row = graphiques_info["capex_pie_start_row"]
+    capex_keys = ("capex_containers", "capex_transformers", "capex_powerblocks", "capex_civil", "capex_cables")
+    for offset, key in enumerate(capex_keys):
+        graphiques[f'B{row + offset}'] = results[key]
+        graphiques[f'C{row + offset}'] = results[key] / capex_total if capex_total != 0 else 0
+    graphiques[f'B{graphiques_info["capex_pie_total_row"]}'] = capex_total
+    graphiques[f'B{graphiques_info["comparison_row"]}'] = capex_total
+    graphiques[f'C{graphiques_info["comparison_row"]}'] = results["opex_total"]
+    
+    return {"CALCUL_ENGINE": calcul, "LAYOUT": layout, "GRAPHIQUES": graphiques}
+
+
+def _cached_value_xml(value: Any) -> Tuple[str, str]:
+    """(attribut de type, élément <v>) d'une valeur en cache"""
+    if isinstance(value, str):
+        escaped = value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        return ' t="str"', f"<v>{escaped}</v>"
+    return "", f"<v>{value!r}</v>"
+
+
+def _inject_cached_values(xml: bytes, values: Dict[str, Any]) -> bytes:
+    """Renseigne la valeur en cache (<v/> écrit vide par openpyxl) des cellules formule de values"""
+    def inject(match):
+        ref = match.group(1)
+        if ref not in values:
+            return match.group(0)
+        type_attr, value_xml = _cached_value_xml(values[ref])
+        return f'<c r="{ref}"{match.group(2)}{type_attr}>{match.group(3)}{value_xml}</c>'
+    text = xml.decode("utf-8")
+    text = re.sub(r'<c r="([A-Z]+[0-9]+)"([^>]*)>(<f>.*?</f>)<v\s*/></c>', inject, text)
+    return text.encode("utf-8")
+
+
+def save_workbook(wb: Workbook, output_path: str, cached_values: Dict[str, Dict[str, Any]] = None,
+                  sheet_cache: SheetCache = None) -> None:
+    """
+    Sauvegarde le workbook, puis réécrit les parties XML des onglets:
+    - onglets repris du cache (sheet_cache): partie XML en cache substituée,
+      onglets reconstruits: partie XML enregistrée dans le cache
+    - valeurs des formules (cached_values, voir build_workbook) enregistrées
+      comme valeurs en cache, pour que les lecteurs sans moteur de calcul
+      affichent des valeurs correctes
+    """
+    wb.save(output_path)
+    if not cached_values and sheet_cache is None:
+        return
+    cached_values = cached_values or {}
+    
+    with zipfile.ZipFile(output_path) as archive:
+        part_titles = {part: title for title, part in sheet_parts(archive).items()}
+        fd, tmp_path = tempfile.mkstemp(suffix=".xlsx", dir=os.path.dirname(os.path.abspath(output_path)))
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as output:
+                for info in archive.infolist():
+                    data = archive.read(info.filename)
+                    title = part_titles.get(info.filename)
+                    if title is not None:
+                        if sheet_cache is not None:
+                            # Partie enregistrée avant les valeurs, qui changent avec les entrées
+                            data = sheet_cache.part_xml(title, data)
+                        if cached_values.get(title):
+                            data = _inject_cached_values(data, cached_values[title])
+                    output.writestr(info, data)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
 
 
 # ============================================================================
 # FONCTION PRINCIPALE
 # ============================================================================
 
-def populate_layout_sheet(wb: Workbook, config: Dict[str, Any]) -> None:
-    """Remplit l'onglet LAYOUT avec les données générées"""
-    ws = wb["LAYOUT"]
-    
+def layout_power_target(config: Dict[str, Any]) -> float:
+    """Puissance utilisée pour générer le layout initial"""
     # Utiliser une puissance par défaut pour générer le layout initial
     # L'utilisateur pourra modifier les positions ensuite
-    power_target = config["project_input"].get("power_target_mw", 50)  # Exemple: 50 MW
-    
-    layout_data = generate_layout(config, power_target)
-    
-    # Remplir les données
-    start_row = 6  # Après les en-têtes (ligne 5) et infos surface
-    for idx, item in enumerate(layout_data, start=start_row):
-        ws.cell(row=idx, column=1, value=item["id"])
-        ws.cell(row=idx, column=2, value=item["type"])
-        ws.cell(row=idx, column=3, value=item["x"])  # Modifiable
-        ws.cell(row=idx, column=4, value=item["y"])  # Modifiable
-        ws.cell(row=idx, column=5, value=item["rotation"])  # Modifiable
-        ws.cell(row=idx, column=6, value=item["phase"])
-        ws.cell(row=idx, column=7, value=item["length"])
-        ws.cell(row=idx, column=8, value=item["width"])
-        
-        # Alerte chevauchement (formule simplifiée - à améliorer selon besoin)
-        # Cette formule vérifie si un élément chevauche avec les autres
-        # Note: C'est une version simplifiée, pour un vrai système il faudrait une VBA ou une logique plus complexe
-        ws.cell(row=idx, column=9, value='')  # Alerte vide pour l'instant
+    return config["project_input"].get("power_target_mw", 50)  # Exemple: 50 MW
+
+
+@reads("project_input.power_target_mw", "project_input.phasing", "standards.rules", "layout_engine")
+def populate_layout_sheet(wb: Workbook, config: Dict[str, Any],
+                          layout_data: Sequence[Dict[str, Any]] = None,
+                          alerts: List[str] = None, cables: Dict[str, Any] = None) -> None:
+    """
+    Remplit l'onglet LAYOUT avec les données générées.
+
+    layout_data, alerts (texte de la colonne Alerte par élément) et cables
+    (plan de câblage, cable_engine.cable_plan) sont recalculés s'ils ne sont
+    pas fournis.
+    """
+    ws = wb["LAYOUT"]
+    
+    if layout_data is None:
+        layout_data = compute_layout(config, layout_power_target(config))
+    if alerts is None:
+        alerts = conflict_alerts(layout_data, find_conflicts(layout_data, config))
+    if cables is None:
+        cables = cable_plan(layout_data, config)
+    
+    # Raccordement de chaque container: (ID du transformateur, longueur de câble)
+    connections = {
+        container: (layout_data[feeder]["id"], length) if feeder >= 0 else ("Non raccordé", None)
+        for container, feeder, length in zip(cables["containers"], cables["feeders"], cables["lengths"])
+    }
+    
+    # Remplir les données (après les en-têtes (ligne 5) et infos surface)
+    # Les cellules modifiables (X, Y, Rotation) sont mises en évidence
+    writer = SheetWriter(ws, start_row=6)
+    writer.append_rows((
+        [
+            item["id"],
+            item["type"],
+            item["x"],  # Modifiable
+            item["y"],  # Modifiable
+            item["rotation"],  # Modifiable
+            item["phase"],
+            item["length"],
+            item["width"],
+            alert,  # Chevauchements / distances minimales (layout_checks)
+            *connections.get(index, (None, None))
+        ]
+        for index, (item, alert) in enumerate(zip(layout_data, alerts))
+    ), style=STYLE_CELL, styles={3: STYLE_EDITABLE, 4: STYLE_EDITABLE, 5: STYLE_EDITABLE})
+
+
+@contextmanager
+def timed(timings: Dict[str, float], phase: str):
+    """Mesure la durée d'une phase dans timings (si fourni)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[phase] = time.perf_counter() - start
+
+
+# Constructeurs de chaque onglet réutilisable depuis le cache (GRAPHIQUES,
+# qui contient des graphiques, est toujours reconstruit)
+CACHED_SHEETS = {
+    "SETUP_ADMIN": (create_setup_admin_sheet,),
+    "INPUT_PROJECT": (create_input_project_sheet,),
+    "CALCUL_ENGINE": (create_calcul_engine_sheet,),
+    "LAYOUT": (create_layout_sheet, populate_layout_sheet),
+}
+
+
+def generator_version(streaming: bool) -> str:
+    """Version du code générateur, incluse dans l'empreinte des onglets en cache"""
+    script_dir = Path(__file__).parent
+    sources = [Path(__file__)] + [script_dir / f"{name}.py" for name in
+                                  ("layout_engine", "layout_checks", "layout_geometry", "cable_engine",
+                                   "calcul_engine", "config_loader", "sheet_cache")]
+    return code_version(sources, openpyxl.__version__, f"streaming={streaming}")
+
+
+def build_workbook(config: Dict[str, Any], streaming: bool = False,
+                   timings: Dict[str, float] = None,
+                   cached_values: Dict[str, Dict[str, Any]] = None,
+                   sheet_cache: SheetCache = None) -> Workbook:
+    """
+    Construit le workbook complet (5 onglets).
+
+    Args:
+        config: Configuration JSON
+        streaming: Utilise un workbook write_only, les lignes sont écrites au fil
+            de l'eau (mémoire bornée pour les grands layouts)
+        timings: Si fourni, reçoit la durée (s) de chaque phase
+        cached_values: Si fourni, reçoit les valeurs des formules calculées
+            nativement, à enregistrer à la sauvegarde (save_workbook)
+        sheet_cache: Si fourni, les onglets dont les entrées n'ont pas changé
+            sont laissés vides et repris du cache à la sauvegarde (save_workbook)
+    """
+    wb = Workbook(write_only=streaming)
+    if not streaming:
+        wb.remove(wb.active)  # Supprimer feuille par défaut
+    register_named_styles(wb)
+    
+    # Onglets repris du cache: titre -> info retournée par le constructeur
+    fingerprints = {}
+    reused = {}
+    if sheet_cache is not None:
+        for title, builders in CACHED_SHEETS.items():
+            fingerprints[title] = sheet_cache.fingerprint(title, config, builders)
+            info = sheet_cache.lookup(title, fingerprints[title])
+            if info is not None:
+                reused[title] = info
+    
+    def build_sheet(title: str, phase: str, build):
+        """Construit un onglet, ou crée un onglet vide s'il est repris du cache"""
+        if title in reused:
+            print(f"Onglet {title} inchangé (cache)")
+            wb.create_sheet(title)
+            return reused[title]
+        print(f"Création de l'onglet {title}...")
+        with timed(timings, phase):
+            return build()
+    
+    # Le layout et son contrôle sont calculés d'abord: le résumé des conflits
+    # figure en tête de l'onglet LAYOUT (écrit avant les lignes en streaming)
+    if "LAYOUT" in reused:
+        surface_m2 = reused["LAYOUT"]["surface_m2"]
+        phase_surfaces = reused["LAYOUT"]["phase_surfaces"]
+        cable_length_m = reused["LAYOUT"]["cable_length_m"]
+        phase_cables = reused["LAYOUT"]["phase_cables"]
+    else:
+        print("Génération du layout...")
+        with timed(timings, "generate_layout"):
+            layout_data = compute_layout(config, layout_power_target(config))
+            surfaces = layout_surfaces(layout_data)
+            surface_m2 = surfaces["Total"]
+            num_phases = max(len(config["project_input"].get("phasing") or []), 1)
+            phase_surfaces = layout_phase_surfaces(layout_data, num_phases)
         
-        # Mettre en évidence les cellules modifiables (X, Y, Rotation)
-        for col in [3, 4, 5]:
-            cell = ws.cell(row=idx, column=col)
-            cell.fill = PatternFill(start_color="E2EFDA", end_color="E2EFDA", fill_type="solid")
-            cell.border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
+        print("Raccordement des containers aux transformateurs...")
+        with timed(timings, "cable_plan"):
+            cables = cable_plan(layout_data, config)
+            cable_length_m = cables["total_m"]
+            phase_cables = phase_cable_lengths(cables, num_phases)
         
-        # Appliquer le style aux autres cellules
-        for col in [1, 2, 6, 7, 8, 9]:
-            cell = ws.cell(row=idx, column=col)
-            for key, value in get_cell_style().items():
-                setattr(cell, key, value)
+        print("Contrôle des chevauchements...")
+        with timed(timings, "find_conflicts"):
+            conflicts = find_conflicts(layout_data, config)
+            alerts = conflict_alerts(layout_data, conflicts)
+    
+    # Créer les onglets
+    setup_info = build_sheet("SETUP_ADMIN", "create_setup_admin_sheet",
+                             lambda: create_setup_admin_sheet(wb, config))
+    build_sheet("INPUT_PROJECT", "create_input_project_sheet",
+                lambda: create_input_project_sheet(wb, config))
+    calcul_info = build_sheet("CALCUL_ENGINE", "create_calcul_engine_sheet",
+                              lambda: create_calcul_engine_sheet(wb, config, setup_info))
+    build_sheet("LAYOUT", "create_layout_sheet",
+                lambda: create_layout_sheet(wb, config, conflicts, surfaces, cables))
+    
+    print("Création de l'onglet GRAPHIQUES...")
+    with timed(timings, "create_graphiques_sheet"):
+        phases = calculate_phases(config, phase_surfaces, phase_cables)
+        graphiques_info = create_graphiques_sheet(wb, config, calcul_info, phases)
+    
+    if "LAYOUT" not in reused:
+        print("Remplissage du layout initial...")
+        with timed(timings, "populate_layout_sheet"):
+            populate_layout_sheet(wb, config, layout_data, alerts, cables)
+    
+    # Onglets reconstruits: enregistrés dans le cache à la sauvegarde
+    if sheet_cache is not None:
+        infos = {"SETUP_ADMIN": setup_info, "INPUT_PROJECT": {}, "CALCUL_ENGINE": calcul_info,
+                 "LAYOUT": {"surface_m2": surface_m2, "phase_surfaces": phase_surfaces,
+                            "cable_length_m": cable_length_m, "phase_cables": phase_cables}}
+        for title, fingerprint in fingerprints.items():
+            if title not in reused:
+                sheet_cache.built(title, fingerprint, infos[title])
+    
+    if cached_values is not None:
+        with timed(timings, "calculate"):
+            results = calculate(config, config["project_input"].get("power_target_mw", 0),
+                                surface_m2=surface_m2, cable_length_m=cable_length_m)
+            cached_values.update(formula_values(config, results, calcul_info, graphiques_info))
+    
+    return wb
 
 
-def main():
-    """Fonction principale"""
-    # Chemins
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """Arguments de la ligne de commande"""
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
-    json_path = project_root.parent / "mining_configurator_full_v2.json"
-    output_path = project_root / "mining_configurator.xlsx"
+    
+    parser = argparse.ArgumentParser(description="Génère le fichier Excel Configurateur Mining")
+    parser.add_argument("--config", type=Path, default=project_root.parent / "mining_configurator_full_v2.json",
+                        help="Fichier JSON de configuration")
+    parser.add_argument("--output", type=Path, default=project_root / "mining_configurator.xlsx",
+                        help="Fichier Excel généré")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Écriture ligne par ligne (openpyxl write_only), mémoire bornée")
+    parser.add_argument("--full", action="store_true",
+                        help="Reconstruit tous les onglets sans utiliser le cache des onglets")
+    parser.add_argument("--optimize", action="store_true",
+                        help="Layout dans la disposition d'emprise minimale (layout_optimizer.py)")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None):
+    """Fonction principale"""
+    args = parse_args(argv)
+    json_path = args.config
+    output_path = args.output
     
     print(f"Lecture du JSON: {json_path}")
     if not json_path.exists():
@@ -992,35 +1115,29 @@ def main():
         return
     
     # Lire configuration
-    config = read_json_config(str(json_path))
-    
-    # Créer workbook
-    print("Création du fichier Excel...")
-    wb = Workbook()
-    wb.remove(wb.active)  # Supprimer feuille par défaut
-    
-    # Créer les onglets
-    print("Création de l'onglet SETUP_ADMIN...")
-    setup_info = create_setup_admin_sheet(wb, config)
-    
-    print("Création de l'onglet INPUT_PROJECT...")
-    create_input_project_sheet(wb, config)
-    
-    print("Création de l'onglet CALCUL_ENGINE...")
-    calcul_info = create_calcul_engine_sheet(wb, config, setup_info)
+    try:
+        config = read_json_config(str(json_path))
+    except ConfigError as exc:
+        print(f"ERREUR: {exc}")
+        return
     
-    print("Création de l'onglet LAYOUT...")
-    create_layout_sheet(wb, config)
+    # Disposition optimisée: remplace layout_engine.arrangement pour cette génération
+    if args.optimize:
+        print("Optimisation de la disposition du layout...")
+        result = optimize_layout(config, layout_power_target(config))
+        print_summary(result)
+        config["layout_engine"]["arrangement"] = result["arrangement"]
     
-    print("Création de l'onglet GRAPHIQUES...")
-    create_graphiques_sheet(wb, config, calcul_info)
-    
-    print("Remplissage du layout initial...")
-    populate_layout_sheet(wb, config)
+    # Créer workbook
+    print("Création du fichier Excel" + (" (streaming)..." if args.streaming else "..."))
+    cached_values = {}
+    sheet_cache = None if args.full else SheetCache(generator_version(args.streaming))
+    wb = build_workbook(config, streaming=args.streaming, cached_values=cached_values,
+                        sheet_cache=sheet_cache)
     
-    # Sauvegarder
+    # Sauvegarder (onglets repris du cache et valeurs des formules)
     print(f"Sauvegarde du fichier: {output_path}")
-    wb.save(str(output_path))
+    save_workbook(wb, str(output_path), cached_values, sheet_cache)
     print("✓ Fichier Excel généré avec succès!")
     print(f"\nEmplacement: {output_path}")
 
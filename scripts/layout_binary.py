@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Format binaire compact du layout (.hqlayout), partagé avec le viewer web
+
+Les layouts circulent en JSON (public/models/structure-data.json,
+public/spline-positions.json, service /layout) : chaque coordonnée y est
+répétée sous forme de paire clé/valeur texte. Ce format range les éléments
+en colonnes binaires lisibles sans copie, par NumPy (memmap) comme par le
+navigateur (ArrayBuffer + typed arrays, voir utils/layoutBinary.ts).
+
+Structure du fichier (little-endian, sections alignées sur ALIGNMENT octets):
+
+- en-tête de HEADER_SIZE octets: MAGIC, version, nombre d'éléments,
+  position et longueur du bloc de métadonnées (uint32)
+- une colonne par champ de COLUMNS: x, y, z, rotation, length, width en
+  float32 (précision ~1 mm à 10 km), type et phase en int32
+- table des ids: décalages uint32 (n + 1) puis octets UTF-8 concaténés
+- métadonnées JSON (UTF-8): position et type de chaque colonne, table des
+  ids, libellés des codes de type, axe vertical, provenance
+
+Les codes de type d'un layout du configurateur sont ceux de layout_engine
+(TYPE_*), libellés dans "types" ; pour un JSON importé, les types sont
+numérotés dans l'ordre d'apparition.
+
+Usage:
+    python3 scripts/layout_binary.py --config <fichier.json> --power 600 --output site.hqlayout
+    python3 scripts/layout_binary.py --from-json public/spline-positions.json --output spline.hqlayout
+    python3 scripts/layout_binary.py --info site.hqlayout
+"""
+
+import argparse
+import json
+import re
+import struct
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy optionnel: colonnes écrites et lues avec le module array
+    np = None
+
+from config_loader import ConfigError, load_config
+from layout_engine import TYPE_INFO, compute_layout
+
+MAGIC = b"HQLAYOUT"
+VERSION = 1
+
+# En-tête: magic, version, éléments, position et longueur des métadonnées
+HEADER = struct.Struct("<8sIIII")
+HEADER_SIZE = 32
+
+# Alignement des sections (typed arrays JS: décalage multiple de la taille d'élément)
+ALIGNMENT = 8
+
+# Colonnes (nom, type NumPy, code du module array)
+COLUMNS = (
+    ("x", "<f4", "f"),
+    ("y", "<f4", "f"),
+    ("z", "<f4", "f"),
+    ("rotation", "<f4", "f"),
+    ("length", "<f4", "f"),
+    ("width", "<f4", "f"),
+    ("type", "<i4", "i"),
+    ("phase", "<i4", "i"),
+)
+
+# Noms des types dans les métadonnées (lus par le viewer web)
+DTYPE_NAMES = {"<f4": "float32", "<i4": "int32"}
+
+# Identifiants générés par layout_engine, par code de type (ex. "ROAD-N-{row}-{col}")
+ENGINE_ID_PATTERNS = {
+    code: re.compile("^" + re.sub(r"\\\{\w+\\\}", r"\\d+", re.escape(id_format)) + "$")
+    for code, (_, id_format) in TYPE_INFO.items()
+}
+
+
+# ============================================================================
+# COLONNES À ÉCRIRE
+# ============================================================================
+
+def _engine_types() -> List[str]:
+    """Libellés des codes TYPE_* de layout_engine (indice = code)"""
+    return [TYPE_INFO[code][0] for code in range(max(TYPE_INFO) + 1)]
+
+
+def _engine_code(item: Dict[str, Any]) -> Optional[int]:
+    """Code TYPE_* d'un élément au format layout_engine (id et libellé), sinon None"""
+    for code, pattern in ENGINE_ID_PATTERNS.items():
+        if TYPE_INFO[code][0] == item["type"] and pattern.match(str(item["id"])):
+            return code
+    return None
+
+
+def _dict_columns(items: Sequence[Dict[str, Any]]) -> Tuple[Dict[str, list], List[str]]:
+    """
+    Colonnes (listes) et libellés des types d'une liste de dicts. Codes
+    TYPE_* si tous les éléments viennent de layout_engine, sinon types
+    numérotés dans l'ordre d'apparition.
+    """
+    codes = [_engine_code(item) for item in items]
+    if None in codes:
+        types: List[str] = []
+        numbers: Dict[str, int] = {}
+        codes = []
+        for item in items:
+            label = str(item["type"])
+            if label not in numbers:
+                numbers[label] = len(types)
+                types.append(label)
+            codes.append(numbers[label])
+    else:
+        types = _engine_types()
+    columns = {name: [item.get(name, 0) for item in items]
+               for name, _, _ in COLUMNS if name not in ("type", "phase")}
+    columns["type"] = codes
+    columns["phase"] = [item.get("phase", 1) for item in items]
+    return columns, types
+
+
+def layout_columns(layout: Sequence) -> Tuple[Dict[str, Any], List[str], List[str]]:
+    """(colonnes, ids, libellés des types) d'un layout (LayoutArray ou liste de dicts)"""
+    data = getattr(layout, "data", None)
+    if data is not None:  # LayoutArray: colonnes prises directement dans le tableau structuré
+        columns = {name: data[name] for name, _, _ in COLUMNS if name != "z"}
+        columns["z"] = np.zeros(len(data), dtype="<f4")
+        return columns, [item["id"] for item in layout], _engine_types()
+    columns, types = _dict_columns(layout)
+    return columns, [str(item["id"]) for item in layout], types
+
+
+def json_elements(data: Any) -> List[Dict[str, Any]]:
+    """
+    Éléments d'un JSON de positions du viewer: liste de points
+    (spline-positions.json: x, y, z, name, type) ou groupes d'éléments
+    (structure-data.json: {groupe: [{id, position, dimensions}]}, le groupe
+    servant de type)
+    """
+    groups = [(None, data)] if isinstance(data, list) else list(data.items())
+    elements = []
+    for group, entries in groups:
+        entries = entries if isinstance(entries, list) else [entries]
+        for k, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                continue
+            x, y, z = entry.get("position") or (entry.get("x", 0), entry.get("y", 0), entry.get("z", 0))
+            dimensions = entry.get("dimensions") or (0, 0)
+            elements.append({
+                "id": entry.get("id", entry.get("name", f"{group}-{k + 1}" if len(entries) != 1 else group)),
+                "type": entry.get("type", group),
+                "x": x, "y": y, "z": z,
+                "rotation": entry.get("rotation", 0),
+                "phase": entry.get("phase", 1),
+                "length": dimensions[0],
+                "width": dimensions[1],
+            })
+    return elements
+
+
+def json_up_axis(data: Any) -> str:
+    """
+    Axe vertical d'un JSON de positions du viewer: "Y" pour la liste de points
+    (spline-positions.json, repère three.js), "Z" pour les groupes
+    d'éléments (structure-data.json: position [x, y, 0], dimensions [L, W, H],
+    lues ainsi par generate_site.py)
+    """
+    return "Y" if isinstance(data, list) else "Z"
+
+
+# ============================================================================
+# ÉCRITURE
+# ============================================================================
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _column_bytes(values, numpy_dtype: str, code: str) -> bytes:
+    """Octets little-endian d'une colonne (tableau NumPy ou liste)"""
+    if np is not None:
+        return np.ascontiguousarray(values, dtype=numpy_dtype).tobytes()
+    column = array(code, values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tobytes()
+
+
+def encode_layout(layout: Sequence, up_axis: str = "Z", source: Dict[str, Any] = None) -> bytes:
+    """
+    Encode un layout au format .hqlayout
+
+    Args:
+        layout: LayoutArray ou liste de dicts (id, type, x, y[, z], rotation, phase, length, width)
+        up_axis: axe vertical des coordonnées ("Z" pour le configurateur, "Y" pour three.js)
+        source: informations de provenance, copiées dans les métadonnées
+    """
+    columns, ids, types = layout_columns(layout)
+    count = len(ids)
+    sections = []  # (décalage, octets)
+    offset = HEADER_SIZE
+    meta_columns = []
+    for name, numpy_dtype, code in COLUMNS:
+        raw = _column_bytes(columns[name], numpy_dtype, code)
+        sections.append((offset, raw))
+        meta_columns.append({"name": name, "dtype": DTYPE_NAMES[numpy_dtype], "offset": offset})
+        offset = _aligned(offset + len(raw))
+
+    encoded = [identifier.encode("utf-8") for identifier in ids]
+    positions = [0]
+    for identifier in encoded:
+        positions.append(positions[-1] + len(identifier))
+    id_offsets = offset
+    sections.append((id_offsets, _column_bytes(positions, "<u4", "I")))
+    id_data = _aligned(id_offsets + 4 * (count + 1))
+    sections.append((id_data, b"".join(encoded)))
+    meta_offset = _aligned(id_data + positions[-1])
+
+    meta = json.dumps({
+        "format": "hqlayout",
+        "version": VERSION,
+        "count": count,
+        "columns": meta_columns,
+        "ids": {"offsets": id_offsets, "data": id_data, "length": positions[-1]},
+        "types": types,
+        "up_axis": up_axis,
+        "source": source or {},
+    }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    buffer = bytearray(meta_offset + len(meta))
+    buffer[:HEADER.size] = HEADER.pack(MAGIC, VERSION, count, meta_offset, len(meta))
+    for position, raw in sections:
+        buffer[position:position + len(raw)] = raw
+    buffer[meta_offset:] = meta
+    return bytes(buffer)
+
+
+def write_layout(layout: Sequence, path, up_axis: str = "Z", source: Dict[str, Any] = None) -> int:
+    """Écrit un layout au format .hqlayout, retourne la taille du fichier (octets)"""
+    content = encode_layout(layout, up_axis, source)
+    Path(path).write_bytes(content)
+    return len(content)
+
+
+# ============================================================================
+# LECTURE
+# ============================================================================
+
+class BinaryLayout(Sequence):
+    """
+    Layout lu depuis un fichier .hqlayout.
+
+    columns: colonnes par nom (vues np.memmap sans copie, ou array sans NumPy).
+    Se comporte comme une séquence de dicts au format historique
+    ({"id", "type", "x", "y", "z", "rotation", "phase", "length", "width"}),
+    construits uniquement quand ils sont lus ; les ids sont décodés à la demande.
+    """
+
+    def __init__(self, meta: Dict[str, Any], columns: Dict[str, Any], id_offsets, id_data):
+        self.meta = meta
+        self.columns = columns
+        self.types: List[str] = meta["types"]
+        self._id_offsets = id_offsets
+        self._id_data = id_data
+
+    def __len__(self) -> int:
+        return self.meta["count"]
+
+    def element_id(self, index: int) -> str:
+        start, end = int(self._id_offsets[index]), int(self._id_offsets[index + 1])
+        return bytes(self._id_data[start:end]).decode("utf-8")
+
+    def ids(self) -> List[str]:
+        """Tous les ids (décodés en une fois)"""
+        return [self.element_id(index) for index in range(len(self))]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[k] for k in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("indice d'élément hors du layout")
+        item = {"id": self.element_id(index), "type": self.types[int(self.columns["type"][index])]}
+        for name, _, _ in COLUMNS:
+            if name != "type":
+                value = self.columns[name][index]
+                item[name] = value.item() if hasattr(value, "item") else value
+        return item
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self[index] for index in range(len(self)))
+
+
+def read_layout(path) -> BinaryLayout:
+    """
+    Lit un fichier .hqlayout: projection mémoire (np.memmap) et vues par
+    colonne si NumPy est disponible, sinon lecture complète en arrays
+    """
+    path = Path(path)
+    with path.open("rb") as handle:
+        header = handle.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError(f"{path}: fichier trop court pour un layout binaire")
+    magic, version, count, meta_offset, meta_length = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: pas un fichier .hqlayout")
+    if version != VERSION:
+        raise ValueError(f"{path}: version {version} non supportée (attendue: {VERSION})")
+
+    if np is not None:
+        raw = np.memmap(path, dtype=np.uint8, mode="r")
+        meta = json.loads(raw[meta_offset:meta_offset + meta_length].tobytes())
+        columns = {column["name"]: raw[column["offset"]:column["offset"] + 4 * count].view(
+                   "<f4" if column["dtype"] == "float32" else "<i4") for column in meta["columns"]}
+        ids = meta["ids"]
+        id_offsets = raw[ids["offsets"]:ids["offsets"] + 4 * (count + 1)].view("<u4")
+        id_data = raw[ids["data"]:ids["data"] + ids["length"]]
+        return BinaryLayout(meta, columns, id_offsets, id_data)
+
+    content = path.read_bytes()
+    meta = json.loads(content[meta_offset:meta_offset + meta_length])
+
+    def column(code: str, offset: int, length: int) -> array:
+        values = array(code)
+        values.frombytes(content[offset:offset + 4 * length])
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+    columns = {item["name"]: column("f" if item["dtype"] == "float32" else "i", item["offset"], count)
+               for item in meta["columns"]}
+    ids = meta["ids"]
+    return BinaryLayout(meta, columns, column("I", ids["offsets"], count + 1),
+                        memoryview(content)[ids["data"]:ids["data"] + ids["length"]])
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def print_info(layout: BinaryLayout, path: Path) -> None:
+    """Résumé d'un fichier .hqlayout"""
+    counts: Dict[str, int] = {}
+    for code in layout.columns["type"]:
+        label = layout.types[int(code)]
+        counts[label] = counts.get(label, 0) + 1
+    print(f"📦 {path}: {len(layout)} éléments, {path.stat().st_size / 1024:.1f} Ko "
+          f"(axe vertical {layout.meta['up_axis']})")
+    for label, count in counts.items():
+        print(f"   {label}: {count}")
+    if layout.meta["source"]:
+        print(f"   Source: {json.dumps(layout.meta['source'], ensure_ascii=False)}")
+
+
+def main(argv: List[str] = None):
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Layout au format binaire compact (.hqlayout)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--config", type=Path, help="Fichier JSON de configuration (layout du configurateur)")
+    source.add_argument("--from-json", type=Path, help="JSON de positions du viewer à convertir")
+    source.add_argument("--info", type=Path, help="Fichier .hqlayout à décrire")
+    parser.add_argument("--power", type=float, default=None, help="Puissance IT (MW), défaut: project_input")
+    parser.add_argument("--no-merge", action="store_true", help="Une route par côté de container")
+    parser.add_argument("--up-axis", choices=("Y", "Z"), default=None,
+                        help="Axe vertical (défaut: Z pour le configurateur et structure-data.json, "
+                             "Y pour une liste de points three.js)")
+    parser.add_argument("--output", type=Path, default=None, help="Fichier .hqlayout à écrire")
+    args = parser.parse_args(argv)
+
+    if args.info:
+        try:
+            print_info(read_layout(args.info), args.info)
+        except (OSError, ValueError) as exc:
+            print(f"ERREUR: {exc}")
+            return 1
+        return 0
+
+    start = time.perf_counter()
+    if args.config:
+        try:
+            config = load_config(str(args.config))
+        except ConfigError as exc:
+            print(f"ERREUR: {exc}")
+            return 1
+        power = args.power if args.power is not None else config["project_input"].get("power_target_mw", 50)
+        layout = compute_layout(config, power, merge=not args.no_merge)
+        up_axis = args.up_axis or "Z"
+        origin = {"config": getattr(config, "source_hash", ""), "power_mw": power}
+        output = args.output or Path(f"layout_{power:g}MW.hqlayout")
+    else:
+        try:
+            data = json.loads(args.from_json.read_text(encoding="utf-8"))
+            layout = json_elements(data)
+        except (OSError, ValueError) as exc:
+            print(f"ERREUR: {args.from_json}: {exc}")
+            return 1
+        up_axis = args.up_axis or json_up_axis(data)
+        origin = {"json": args.from_json.name}
+        output = args.output or args.from_json.with_suffix(".hqlayout")
+
+    size = write_layout(layout, output, up_axis, origin)
+    print(f"✅ {len(layout)} éléments -> {output} ({size / 1024:.1f} Ko) en {time.perf_counter() - start:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Contrôle des chevauchements du layout
+
+Détecte les paires d'éléments qui se chevauchent ou qui sont plus proches
+que la distance minimale imposée par la configuration, à l'aide d'un index
+spatial en grille uniforme : chaque élément n'est comparé qu'aux éléments
+des cellules qu'il occupe, soit un coût quasi linéaire au lieu de O(n²).
+
+Les empreintes sont les rectangles englobants (x, y, longueur, largeur)
+après rotation autour du point (x, y) ; exactes pour les rotations
+multiples de 90°.
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+# Distance minimale entre types d'éléments: clé de layout_engine.defaults,
+# ou None pour ne signaler que les chevauchements. Les paires absentes
+# (routes notamment, qui bordent les containers par construction) ne sont
+# pas contrôlées.
+CLEARANCE_RULES = {
+    ("Container", "Container"): "container_spacing_m",
+    ("Container", "Transformateur"): "container_spacing_m",
+    ("Transformateur", "Transformateur"): "road_width_m",
+    ("Container", "Gazon"): None,
+    ("Transformateur", "Gazon"): None,
+}
+
+# Tolérance numérique (m) pour les espacements exactement égaux au minimum
+EPSILON = 1e-6
+
+
+class Conflict(NamedTuple):
+    """Paire d'éléments en conflit (indices dans le layout)"""
+    first: int
+    second: int
+    overlap: bool      # True: chevauchement, False: trop proche
+    distance: float    # Distance entre empreintes (0 si chevauchement)
+    clearance: float   # Distance minimale exigée
+
+
+def footprint(x: float, y: float, length: float, width: float, rotation: float) -> Tuple[float, float, float, float]:
+    """Rectangle englobant (x0, y0, x1, y1) d'un élément tourné de rotation degrés autour de (x, y)"""
+    if not rotation:
+        return x, y, x + length, y + width
+    angle = math.radians(rotation)
+    cos_a, sin_a = math.cos(angle), math.sin(angle)
+    xs = (0.0, length * cos_a, -width * sin_a, length * cos_a - width * sin_a)
+    ys = (0.0, length * sin_a, width * cos_a, length * sin_a + width * cos_a)
+    return x + min(xs), y + min(ys), x + max(xs), y + max(ys)
+
+
+def _elements(layout: Sequence) -> Iterable[Tuple[str, float, float, float, float, float]]:
+    """(type, x, y, rotation, longueur, largeur) de chaque élément, sans construire de dicts si possible"""
+    data = getattr(layout, "data", None)
+    if data is not None:  # LayoutArray (layout_engine)
+        from layout_engine import TYPE_INFO
+        labels = {code: info[0] for code, info in TYPE_INFO.items()}
+        types = [labels[code] for code in data["type"].tolist()]
+        return zip(types, data["x"].tolist(), data["y"].tolist(), data["rotation"].tolist(),
+                   data["length"].tolist(), data["width"].tolist())
+    return ((item["type"], item["x"], item["y"], item["rotation"], item["length"], item["width"])
+            for item in layout)
+
+
+def resolve_clearances(config: Dict[str, Any]) -> Dict[Tuple[str, str], float]:
+    """Distances minimales (m) par paire de types, dans les deux sens"""
+    defaults = config["layout_engine"]["defaults"]
+    clearances = {}
+    for (type_a, type_b), key in CLEARANCE_RULES.items():
+        value = float(defaults[key]) if key else 0.0
+        clearances[(type_a, type_b)] = value
+        clearances[(type_b, type_a)] = value
+    return clearances
+
+
+def find_conflicts(layout: Sequence, config: Dict[str, Any]) -> List[Conflict]:
+    """
+    Retourne toutes les paires d'éléments qui se chevauchent ou ne respectent
+    pas la distance minimale, triées par indices.
+    """
+    clearances = resolve_clearances(config)
+    checked_types = {t for pair in clearances for t in pair}
+    max_clearance = max(clearances.values(), default=0.0)
+
+    indices, types, boxes = [], [], []
+    for idx, (element_type, x, y, rotation, length, width) in enumerate(_elements(layout)):
+        if element_type in checked_types:
+            indices.append(idx)
+            types.append(element_type)
+            boxes.append(footprint(x, y, length, width, rotation))
+    if len(boxes) < 2:
+        return []
+
+    # Taille de cellule: dimension médiane des éléments (au moins la distance max),
+    # pour qu'un élément typique n'occupe que quelques cellules
+    sizes = sorted(max(x1 - x0, y1 - y0) for x0, y0, x1, y1 in boxes)
+    cell = max(sizes[len(sizes) // 2], max_clearance, 1.0)
+
+    # Chaque élément est inscrit dans les cellules de son empreinte élargie de la
+    # distance max; deux éléments assez proches partagent donc au moins une cellule
+    grid: Dict[Tuple[int, int], List[int]] = {}
+    for k, (x0, y0, x1, y1) in enumerate(boxes):
+        for ix in range(math.floor((x0 - max_clearance) / cell), math.floor((x1 + max_clearance) / cell) + 1):
+            for iy in range(math.floor((y0 - max_clearance) / cell), math.floor((y1 + max_clearance) / cell) + 1):
+                grid.setdefault((ix, iy), []).append(k)
+
+    conflicts = []
+    seen = set()
+    for members in grid.values():
+        for a_pos, a in enumerate(members):
+            ax0, ay0, ax1, ay1 = boxes[a]
+            type_a = types[a]
+            for b in members[a_pos + 1:]:
+                clearance = clearances.get((type_a, types[b]))
+                if clearance is None or (a, b) in seen:
+                    continue
+                bx0, by0, bx1, by1 = boxes[b]
+                dx = max(bx0 - ax1, ax0 - bx1, 0.0)
+                dy = max(by0 - ay1, ay0 - by1, 0.0)
+                overlap = (min(ax1, bx1) - max(ax0, bx0) > EPSILON
+                           and min(ay1, by1) - max(ay0, by0) > EPSILON)
+                distance = 0.0 if overlap else math.hypot(dx, dy)
+                if overlap or distance < clearance - EPSILON:
+                    seen.add((a, b))
+                    conflicts.append(Conflict(indices[a], indices[b], overlap, distance, clearance))
+
+    conflicts.sort()
+    return conflicts
+
+
+def conflict_alerts(layout: Sequence, conflicts: List[Conflict]) -> List[str]:
+    """Texte de la colonne Alerte de LAYOUT pour chaque élément ('' si aucun conflit)"""
+    overlaps: Dict[int, List[str]] = {}
+    too_close: Dict[int, List[str]] = {}
+    for conflict in conflicts:
+        target = overlaps if conflict.overlap else too_close
+        first_id = layout[conflict.first]["id"]
+        second_id = layout[conflict.second]["id"]
+        target.setdefault(conflict.first, []).append(second_id)
+        target.setdefault(conflict.second, []).append(first_id)
+
+    alerts = [''] * len(layout)
+    for idx in set(overlaps) | set(too_close):
+        parts = []
+        if idx in overlaps:
+            parts.append("⚠ Chevauchement: " + ", ".join(overlaps[idx]))
+        if idx in too_close:
+            parts.append("⚠ Trop proche: " + ", ".join(too_close[idx]))
+        alerts[idx] = " | ".join(parts)
+    return alerts
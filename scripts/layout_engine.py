@@ -0,0 +1,543 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Moteur de layout du configurateur Mining
+
+Calcule les positions des containers, transformateurs, routes et bandes de
+gazon pour une puissance cible, sur une grille ligne par ligne.
+
+Disposition (layout_engine.arrangement, optionnel, voir layout_optimizer.py):
+chaque ligne regroupe blocks_per_row blocs, un bloc étant containers_per_block
+containers suivis de leur transformateur ; rotation (0 ou 90°) oriente
+containers et transformateurs. Par défaut: un bloc de
+max_containers_per_transformer containers par ligne, rotation 0.
+
+Le layout est construit une seule fois pour la puissance totale ; chaque
+élément reçoit la phase de project_input.phasing où il est construit. Les
+phases sont incrémentales : les éléments des phases 1..k forment le site
+à la fin de la phase k, prolongé sans déplacement par la phase k+1.
+
+Les routes générées autour de chaque container se chevauchent: par défaut
+(merge_roads), elles sont remplacées, phase par phase, par le plus petit
+ensemble de bandes disjointes couvrant la même surface
+(layout_geometry.union_strips), placées après les autres éléments.
+
+Deux implémentations produisent exactement les mêmes éléments, dans le même
+ordre :
+- generate_layout_array() : calcul vectorisé NumPy en une passe, résultat
+  dans un tableau structuré (LayoutArray), converti en dicts à la demande
+- generate_layout() : liste de dicts (format historique de l'onglet LAYOUT),
+  issue du tableau si NumPy est disponible, sinon de boucles Python
+"""
+
+import math
+from bisect import bisect_right
+from collections.abc import Sequence
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List
+
+try:
+    import numpy as np
+except ImportError:  # NumPy optionnel: repli sur les boucles Python
+    np = None
+
+from layout_geometry import PRECISION, union_strips
+
+HAS_NUMPY = np is not None
+
+
+# ============================================================================
+# CODES DE TYPE
+# ============================================================================
+
+TYPE_CONTAINER = 0
+TYPE_TRANSFORMER = 1
+TYPE_ROAD_N = 2
+TYPE_ROAD_S = 3
+TYPE_ROAD_E = 4
+TYPE_ROAD_W = 5
+TYPE_ROAD_ROW_W = 6
+TYPE_GRASS = 7
+TYPE_ROAD_STRIP = 8  # Bande de routes fusionnées (merge_roads)
+
+# Code -> (libellé de type dans LAYOUT, format de l'identifiant)
+# {n} = numéro de l'élément (index + 1), {row}/{col} = position dans la grille
+TYPE_INFO = {
+    TYPE_CONTAINER: ("Container", "HD5-{n}"),
+    TYPE_TRANSFORMER: ("Transformateur", "TR-{n}"),
+    TYPE_ROAD_N: ("Route", "ROAD-N-{row}-{col}"),
+    TYPE_ROAD_S: ("Route", "ROAD-S-{row}-{col}"),
+    TYPE_ROAD_E: ("Route", "ROAD-E-{row}-{col}"),
+    TYPE_ROAD_W: ("Route", "ROAD-W-{row}-{col}"),
+    TYPE_ROAD_ROW_W: ("Route", "ROAD-ROW-W-{row}"),
+    TYPE_GRASS: ("Gazon", "GRASS-{row}"),
+    TYPE_ROAD_STRIP: ("Route", "ROAD-{n}"),
+}
+
+# Routes générées par élément, remplacées par des bandes par merge_roads()
+ROAD_TYPES = (TYPE_ROAD_N, TYPE_ROAD_S, TYPE_ROAD_E, TYPE_ROAD_W, TYPE_ROAD_ROW_W)
+
+LAYOUT_DTYPE = None
+if HAS_NUMPY:
+    LAYOUT_DTYPE = np.dtype([
+        ("index", np.int32),     # Container: n° de container ; Transformateur/Gazon/Route ligne: n° de ligne
+        ("type", np.int8),       # TYPE_*
+        ("x", np.float64),
+        ("y", np.float64),
+        ("rotation", np.float64),
+        ("phase", np.int16),
+        ("length", np.float64),
+        ("width", np.float64),
+    ])
+
+
+# Orientations possibles des containers et transformateurs (degrés)
+ROTATIONS = (0, 90)
+
+
+# ============================================================================
+# PARAMÈTRES
+# ============================================================================
+
+def default_arrangement(config: Dict[str, Any]) -> Dict[str, int]:
+    """Disposition historique: un bloc transformateur par ligne, rotation 0"""
+    return {
+        "containers_per_block": config["standards"]["rules"]["max_containers_per_transformer"],
+        "blocks_per_row": 1,
+        "rotation": 0,
+    }
+
+
+def oriented(length: float, width: float, rotation: float):
+    """
+    Emprise d'un élément tourné de 0 ou 90°: (le long de la ligne, profondeur,
+    décalage de x). Tourné de 90° autour de (x, y), l'élément occupe
+    [x - largeur, x]: x = bord gauche de l'emprise + décalage.
+    """
+    if rotation == 90:
+        return width, length, width
+    return length, width, 0.0
+
+
+def layout_parameters(config: Dict[str, Any], power_target_mw: float,
+                      arrangement: Dict[str, int] = None) -> Dict[str, Any]:
+    """
+    Extrait de la configuration les dimensions, espacements et quantités du layout.
+    arrangement: disposition (défaut: layout_engine.arrangement, sinon default_arrangement)
+    """
+    rules = config["standards"]["rules"]
+    defaults = config["layout_engine"]["defaults"]
+    layout_rules = config["layout_engine"]["rules"]
+
+    container_dim = config["layout_engine"]["elements_dimensions"]["HD5"]
+    transformer_dim = config["layout_engine"]["elements_dimensions"]["TR_5MW"]
+
+    if arrangement is None:
+        arrangement = config["layout_engine"].get("arrangement") or {}
+    arrangement = {**default_arrangement(config), **arrangement}
+
+    num_containers = math.ceil(power_target_mw / rules["container_power_mw"])
+    containers_per_row = arrangement["containers_per_block"] * arrangement["blocks_per_row"]
+
+    # Nombre cumulé de containers à la fin de chaque phase
+    phasing = config["project_input"].get("phasing") or []
+    phase_powers = list(accumulate(phase["power_mw"] for phase in phasing))
+
+    return {
+        "container_length": container_dim["length"],
+        "container_width": container_dim["width"],
+        "transformer_length": transformer_dim["length"],
+        "transformer_width": transformer_dim["width"],
+        "container_spacing": defaults["container_spacing_m"],
+        "row_spacing": defaults["row_spacing_m"],
+        "road_width": defaults["road_width_m"],
+        "grass_width": defaults["grass_strip_width_m"],
+        "num_containers": num_containers,
+        "num_transformers": math.ceil(power_target_mw / rules["transformer_size_mw"]),
+        # Organisation en lignes de blocs (un transformateur par bloc)
+        "containers_per_block": arrangement["containers_per_block"],
+        "blocks_per_row": arrangement["blocks_per_row"],
+        "rotation": arrangement["rotation"],
+        "containers_per_row": containers_per_row,
+        "num_rows": math.ceil(num_containers / containers_per_row),
+        # Passage entre deux blocs d'une ligne (au moins l'espacement des containers)
+        "block_gap": max(defaults["road_width_m"], defaults["container_spacing_m"]),
+        "road_around_each_container": layout_rules.get("road_around_each_container", False),
+        "road_around_each_row": layout_rules.get("road_around_each_row", False),
+        "grass_between_rows": layout_rules.get("grass_between_rows", False),
+        # Phases: les éléments au-delà du phasage relèvent de la dernière phase
+        "num_phases": max(len(phasing), 1),
+        "container_phase_limits": [math.ceil(power / rules["container_power_mw"]) for power in phase_powers],
+    }
+
+
+def element_phase(limits: List[int], index: int, num_phases: int) -> int:
+    """Phase (à partir de 1) du index-ième container, d'après les cumuls par phase"""
+    return min(bisect_right(limits, index) + 1, num_phases)
+
+
+# ============================================================================
+# MOTEUR VECTORISÉ
+# ============================================================================
+
+class LayoutArray(Sequence):
+    """
+    Layout sous forme de tableau structuré NumPy (un élément par ligne).
+
+    Se comporte comme une séquence de dicts au format historique
+    ({"id", "type", "x", "y", "rotation", "phase", "length", "width"}),
+    construits uniquement quand ils sont lus.
+    """
+
+    def __init__(self, data, containers_per_row: int):
+        self.data = data
+        self.containers_per_row = containers_per_row
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def _make_item(self, index, type_code, x, y, rotation, phase, length, width) -> Dict[str, Any]:
+        label, id_format = TYPE_INFO[type_code]
+        if type_code in (TYPE_ROAD_N, TYPE_ROAD_S, TYPE_ROAD_E, TYPE_ROAD_W):
+            row, col = divmod(index, self.containers_per_row)
+        else:
+            row, col = index, 0
+        return {
+            "id": id_format.format(n=index + 1, row=row, col=col),
+            "type": label,
+            "x": x,
+            "y": y,
+            "rotation": rotation,
+            "phase": phase,
+            "length": length,
+            "width": width
+        }
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return LayoutArray(self.data[key], self.containers_per_row)
+        record = self.data[key]
+        return self._make_item(*record.tolist())
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        columns = [self.data[name].tolist() for name in self.data.dtype.names]
+        for values in zip(*columns):
+            yield self._make_item(*values)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Convertit en liste de dicts (format historique)"""
+        return list(self)
+
+
+def generate_layout_array(config: Dict[str, Any], power_target_mw: float,
+                          arrangement: Dict[str, int] = None) -> LayoutArray:
+    """
+    Génère le layout en une passe vectorisée (nécessite NumPy).
+
+    Chaque ligne de la grille contient, dans cet ordre : ses containers, les
+    transformateurs de ses blocs, les routes autour de chaque container, la
+    route ouest de la première ligne et la bande de gazon qui la suit.
+    """
+    if not HAS_NUMPY:
+        raise ImportError("NumPy est requis pour generate_layout_array(): pip install numpy")
+
+    p = layout_parameters(config, power_target_mw, arrangement)
+    L, W = p["container_length"], p["container_width"]
+    TL, TW = p["transformer_length"], p["transformer_width"]
+    spacing, rw, gw = p["container_spacing"], p["road_width"], p["grass_width"]
+    n_containers, per_row, n_rows = p["num_containers"], p["containers_per_row"], p["num_rows"]
+    per_block, rotation = p["containers_per_block"], p["rotation"]
+
+    layout = np.zeros(0, dtype=LAYOUT_DTYPE)
+    if n_rows == 0:
+        return LayoutArray(layout, per_row)
+
+    # Emprises au sol selon l'orientation (le long de la ligne, profondeur)
+    c_along, c_depth, c_dx = oriented(L, W, rotation)
+    t_along, t_depth, t_dx = oriented(TL, TW, rotation)
+    pitch = c_along + spacing
+    block_pitch = per_block * pitch + spacing + t_along + p["block_gap"]
+
+    current_x = rw  # Commence après la route initiale
+    rows = np.arange(n_rows)
+    in_row = np.minimum(per_row, n_containers - rows * per_row)
+    grass = (rows < n_rows - 1) & bool(p["grass_between_rows"])
+    max_width_in_row = max(c_depth, t_depth)
+
+    # Y de chaque ligne: cumul séquentiel (même arrondi que l'ajout ligne par ligne)
+    steps = np.empty(2 * n_rows + 1)
+    steps[0] = rw
+    steps[1::2] = max_width_in_row + p["row_spacing"]
+    steps[2::2] = np.where(grass, gw, 0)
+    row_y = np.cumsum(steps)[0::2][:n_rows]
+
+    # Containers: ligne, bloc dans la ligne et place dans le bloc
+    c_index = np.arange(n_containers)
+    c_row, c_col = np.divmod(c_index, per_row)
+    c_block_col, c_slot = np.divmod(c_col, per_block)
+    c_x = current_x + c_block_col * block_pitch + c_slot * pitch  # Bord gauche de l'emprise
+    c_y = row_y[c_row]
+
+    # Blocs: un transformateur par bloc tant qu'il en reste
+    n_blocks = -(-n_containers // per_block)
+    blocks = np.arange(n_blocks)
+    b_row, b_col = np.divmod(blocks, p["blocks_per_row"])
+    in_block = np.minimum(per_block, n_containers - blocks * per_block)
+    t_blocks = blocks[blocks < p["num_transformers"]]
+    t_in_row = np.bincount(b_row[t_blocks], minlength=n_rows)
+
+    # Nombre d'éléments par ligne, pour entrelacer les types dans l'ordre historique
+    roads_per_container = 4 if p["road_around_each_container"] else 0
+    row_road = np.zeros(n_rows, dtype=np.int64)
+    if p["road_around_each_row"]:
+        row_road[0] = 1
+    per_row_count = in_row * (1 + roads_per_container) + t_in_row + row_road + grass
+    row_offset = np.concatenate(([0], np.cumsum(per_row_count)[:-1]))
+
+    layout = np.zeros(int(per_row_count.sum()), dtype=LAYOUT_DTYPE)
+
+    # Phase de chaque container (cumuls par phase), puis de la ligne qu'il ouvre
+    n_phases = p["num_phases"]
+    c_phase = np.minimum(np.searchsorted(p["container_phase_limits"], c_index, side="right") + 1, n_phases)
+    row_phase = c_phase[rows * per_row]
+
+    def put(positions, type_code, index, x, y, length, width, phase, element_rotation=0):
+        layout["index"][positions] = index
+        layout["type"][positions] = type_code
+        layout["x"][positions] = x
+        layout["y"][positions] = y
+        layout["rotation"][positions] = element_rotation
+        layout["length"][positions] = length
+        layout["width"][positions] = width
+        layout["phase"][positions] = phase
+
+    # Containers de la ligne
+    c_pos = row_offset[c_row] + c_col
+    put(c_pos, TYPE_CONTAINER, c_index, c_x + c_dx, c_y, L, W, c_phase, rotation)
+
+    # Transformateur de chaque bloc (placé après ses containers), construit avec
+    # le premier container du bloc: aucun container sans alimentation dans sa phase
+    t_rows = b_row[t_blocks]
+    t_pos = row_offset[t_rows] + in_row[t_rows] + b_col[t_blocks]
+    t_x = current_x + b_col[t_blocks] * block_pitch + in_block[t_blocks] * pitch + spacing
+    put(t_pos, TYPE_TRANSFORMER, t_blocks, t_x + t_dx, row_y[t_rows], TL, TW,
+        c_phase[t_blocks * per_block], rotation)
+
+    # Routes autour de chaque container (N, S, E, O pour chaque container)
+    if roads_per_container:
+        base = row_offset[c_row] + in_row[c_row] + t_in_row[c_row] + 4 * c_col
+        half = rw / 2
+        put(base, TYPE_ROAD_N, c_index, c_x - half, c_y - half, c_along + rw, rw, c_phase)
+        put(base + 1, TYPE_ROAD_S, c_index, c_x - half, c_y + c_depth + half, c_along + rw, rw, c_phase)
+        put(base + 2, TYPE_ROAD_E, c_index, c_x + c_along + half, c_y - half, rw, c_depth + rw, c_phase)
+        put(base + 3, TYPE_ROAD_W, c_index, c_x - half, c_y - half, rw, c_depth + rw, c_phase)
+
+    # Route ouest de la première ligne
+    blocks_in_first_row = -(-int(in_row[0]) // per_block)
+    last_block = int(in_row[0]) - (blocks_in_first_row - 1) * per_block
+    row_width = (blocks_in_first_row - 1) * block_pitch + last_block * pitch - spacing
+    if p["road_around_each_row"]:
+        pos = int(row_offset[0] + in_row[0] * (1 + roads_per_container) + t_in_row[0])
+        put(pos, TYPE_ROAD_ROW_W, 0, current_x - rw, row_y[0] - rw / 2, rw, c_depth + rw + t_depth, row_phase[0])
+
+    # Gazon entre les lignes (construit avec la ligne suivante)
+    g_rows = rows[grass]
+    if len(g_rows):
+        g_pos = row_offset[g_rows] + per_row_count[g_rows] - 1
+        put(g_pos, TYPE_GRASS, g_rows, current_x - rw, row_y[g_rows] + max_width_in_row + rw,
+            row_width + rw * 2, gw, row_phase[g_rows + 1])
+
+    return LayoutArray(layout, per_row)
+
+
+# ============================================================================
+# FORMAT HISTORIQUE (LISTE DE DICTS)
+# ============================================================================
+
+def _generate_layout_python(config: Dict[str, Any], power_target_mw: float,
+                            arrangement: Dict[str, int] = None) -> List[Dict[str, Any]]:
+    """Génère le layout par boucles Python (sans NumPy)"""
+    layout_data = []
+
+    p = layout_parameters(config, power_target_mw, arrangement)
+    container_length, container_width = p["container_length"], p["container_width"]
+    transformer_length, transformer_width = p["transformer_length"], p["transformer_width"]
+    container_spacing, row_spacing = p["container_spacing"], p["row_spacing"]
+    road_width, grass_width = p["road_width"], p["grass_width"]
+    num_containers, num_transformers = p["num_containers"], p["num_transformers"]
+    containers_per_row, num_rows = p["containers_per_row"], p["num_rows"]
+    per_block, blocks_per_row, rotation = p["containers_per_block"], p["blocks_per_row"], p["rotation"]
+
+    # Emprises au sol selon l'orientation (le long de la ligne, profondeur)
+    c_along, c_depth, c_dx = oriented(container_length, container_width, rotation)
+    t_along, t_depth, t_dx = oriented(transformer_length, transformer_width, rotation)
+    pitch = c_along + container_spacing
+    block_pitch = per_block * pitch + container_spacing + t_along + p["block_gap"]
+
+    current_x = road_width  # Commence après la route initiale
+    current_y = road_width  # Commence après la route initiale
+    max_width_in_row = max(c_depth, t_depth)
+    row_width = 0
+
+    container_idx = 0
+    num_phases = p["num_phases"]
+    container_limits = p["container_phase_limits"]
+
+    def element(element_id, element_type, x, y, length, width, phase, element_rotation=0):
+        return {
+            "id": element_id,
+            "type": element_type,
+            "x": x,
+            "y": y,
+            "rotation": element_rotation,
+            "phase": phase,
+            "length": length,
+            "width": width
+        }
+
+    for row in range(num_rows):
+        row_y = current_y
+        # Phase du premier container de la ligne (et de la suivante, pour le gazon)
+        row_phase = element_phase(container_limits, container_idx, num_phases)
+        next_row_phase = element_phase(container_limits, container_idx + containers_per_row, num_phases)
+
+        # Containers de la ligne (bord gauche de l'emprise: x - décalage)
+        containers_in_row = min(containers_per_row, num_containers - container_idx)
+        blocks_in_row = -(-containers_in_row // per_block)
+        if row == 0:
+            last_block = containers_in_row - (blocks_in_row - 1) * per_block
+            row_width = (blocks_in_row - 1) * block_pitch + last_block * pitch - container_spacing
+        container_x = []
+        for col in range(containers_in_row):
+            block_col, slot = divmod(col, per_block)
+            x_pos = current_x + block_col * block_pitch + slot * pitch
+            container_x.append(x_pos)
+            layout_data.append(element(f"HD5-{container_idx + 1}", "Container", x_pos + c_dx, row_y,
+                                       container_length, container_width,
+                                       element_phase(container_limits, container_idx, num_phases), rotation))
+            container_idx += 1
+
+        # Transformateur de chaque bloc (placé après ses containers), construit
+        # avec le premier container du bloc
+        for block_col in range(blocks_in_row):
+            block = row * blocks_per_row + block_col
+            if block >= num_transformers:
+                break
+            in_block = min(per_block, num_containers - block * per_block)
+            trans_x = current_x + block_col * block_pitch + in_block * pitch + container_spacing
+            trans_phase = element_phase(container_limits, block * per_block, num_phases)
+            layout_data.append(element(f"TR-{block + 1}", "Transformateur", trans_x + t_dx, row_y,
+                                       transformer_length, transformer_width, trans_phase, rotation))
+
+        # Routes autour de chaque container (si règle activée)
+        if p["road_around_each_container"]:
+            for col, cont_x in enumerate(container_x):
+                phase = element_phase(container_limits, row * containers_per_row + col, num_phases)
+                layout_data.append(element(f"ROAD-N-{row}-{col}", "Route",
+                                           cont_x - road_width / 2, row_y - road_width / 2,
+                                           c_along + road_width, road_width, phase))
+                layout_data.append(element(f"ROAD-S-{row}-{col}", "Route",
+                                           cont_x - road_width / 2, row_y + c_depth + road_width / 2,
+                                           c_along + road_width, road_width, phase))
+                layout_data.append(element(f"ROAD-E-{row}-{col}", "Route",
+                                           cont_x + c_along + road_width / 2, row_y - road_width / 2,
+                                           road_width, c_depth + road_width, phase))
+                layout_data.append(element(f"ROAD-W-{row}-{col}", "Route",
+                                           cont_x - road_width / 2, row_y - road_width / 2,
+                                           road_width, c_depth + road_width, phase))
+
+        # Route ouest de la première ligne (si règle activée)
+        if p["road_around_each_row"] and row == 0:
+            layout_data.append(element(f"ROAD-ROW-W-{row}", "Route",
+                                       current_x - road_width, row_y - road_width / 2,
+                                       road_width, c_depth + road_width + t_depth, row_phase))
+
+        # Mise à jour Y pour la ligne suivante
+        current_y += max_width_in_row + row_spacing
+
+        # Gazon entre les lignes (si règle activée et pas dernière ligne)
+        if p["grass_between_rows"] and row < num_rows - 1:
+            layout_data.append(element(f"GRASS-{row}", "Gazon",
+                                       current_x - road_width, row_y + max_width_in_row + road_width,
+                                       row_width + road_width * 2, grass_width, next_row_phase))
+            current_y += grass_width
+
+    return layout_data
+
+
+# ============================================================================
+# FUSION DES ROUTES
+# ============================================================================
+
+def road_strips(boxes: List[tuple], phases: List[int]) -> List[tuple]:
+    """Bandes (x, y, longueur, largeur, phase) couvrant les routes, union calculée phase par phase"""
+    by_phase: Dict[int, List[tuple]] = {}
+    for box, phase in zip(boxes, phases):
+        by_phase.setdefault(phase, []).append(box)
+    return [(x0, y0, round(x1 - x0, PRECISION), round(y1 - y0, PRECISION), phase)
+            for phase in sorted(by_phase) for x0, y0, x1, y1 in union_strips(by_phase[phase])]
+
+
+def merge_roads(layout: Sequence) -> Sequence:
+    """
+    Remplace les routes par élément (N, S, E, O, ouest de ligne) par des bandes
+    ROAD-n disjointes de même surface, ajoutées après les autres éléments.
+    Accepte et retourne un LayoutArray ou une liste de dicts.
+    """
+    data = getattr(layout, "data", None)
+    if data is not None:  # LayoutArray
+        is_road = np.isin(data["type"], ROAD_TYPES)
+        roads = data[is_road]
+        corners = np.stack((roads["x"], roads["y"], roads["x"] + roads["length"],
+                            roads["y"] + roads["width"]), axis=1).tolist()
+        boxes = [tuple(round(value, PRECISION) for value in box) for box in corners]
+        strips = road_strips(boxes, roads["phase"].tolist())
+        merged = np.zeros(len(strips), dtype=LAYOUT_DTYPE)
+        if strips:
+            x, y, length, width, phase = zip(*strips)
+            merged["index"] = np.arange(len(strips))
+            merged["type"] = TYPE_ROAD_STRIP
+            merged["x"], merged["y"], merged["length"], merged["width"] = x, y, length, width
+            merged["phase"] = phase
+        return LayoutArray(np.concatenate((data[~is_road], merged)), layout.containers_per_row)
+
+    others, boxes, phases = [], [], []
+    for item in layout:
+        if item["type"] == "Route":
+            boxes.append(tuple(round(value, PRECISION) for value in
+                               (item["x"], item["y"], item["x"] + item["length"], item["y"] + item["width"])))
+            phases.append(item["phase"])
+        else:
+            others.append(item)
+    return others + [
+        {"id": f"ROAD-{k + 1}", "type": "Route", "x": x, "y": y, "rotation": 0,
+         "phase": phase, "length": length, "width": width}
+        for k, (x, y, length, width, phase) in enumerate(road_strips(boxes, phases))
+    ]
+
+
+# ============================================================================
+# POINTS D'ENTRÉE
+# ============================================================================
+
+def generate_layout(config: Dict[str, Any], power_target_mw: float,
+                    arrangement: Dict[str, int] = None, merge: bool = True) -> List[Dict[str, Any]]:
+    """
+    Génère le layout automatique des équipements (liste de dicts).
+    merge: routes fusionnées en bandes (merge_roads), sinon une route par côté de container
+    """
+    if HAS_NUMPY:
+        layout = generate_layout_array(config, power_target_mw, arrangement)
+        return (merge_roads(layout) if merge else layout).to_dicts()
+    layout = _generate_layout_python(config, power_target_mw, arrangement)
+    return merge_roads(layout) if merge else layout
+
+
+def compute_layout(config: Dict[str, Any], power_target_mw: float,
+                   arrangement: Dict[str, int] = None, merge: bool = True) -> Sequence:
+    """Layout le plus économique disponible: LayoutArray si NumPy, sinon liste de dicts"""
+    if HAS_NUMPY:
+        layout = generate_layout_array(config, power_target_mw, arrangement)
+    else:
+        layout = _generate_layout_python(config, power_target_mw, arrangement)
+    return merge_roads(layout) if merge else layout
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Géométrie des empreintes du layout: surfaces exactes et bandes de routes
+
+Les éléments du layout se recouvrent (les quatre routes générées autour de
+chaque container chevauchent celles des voisins, le gazon borde les routes) :
+la somme longueur x largeur compte plusieurs fois les zones communes.
+
+- union_area() : aire exacte de l'union de rectangles, par balayage en x et
+  arbre de segments sur les y compressés, en O(n log n) (bandes de y
+  indépendantes balayées séparément)
+- union_strips() : union décomposée en rectangles disjoints (bandes), dans le
+  sens qui en produit le moins ; sert à fusionner les routes en bandes
+- layout_surfaces() : surface de l'union par type d'élément et totale
+
+Les empreintes sont les rectangles englobants après rotation (voir
+layout_checks.footprint), coordonnées arrondies à PRECISION décimales pour
+que des bords adjacents calculés différemment coïncident.
+"""
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy optionnel: empreintes calculées élément par élément
+    np = None
+
+from layout_checks import footprint
+
+# Arrondi des coordonnées (décimales, soit le micromètre)
+PRECISION = 6
+
+# Rectangle (x0, y0, x1, y1)
+Box = Tuple[float, float, float, float]
+
+
+# ============================================================================
+# EMPREINTES
+# ============================================================================
+
+def footprint_array(data) -> "np.ndarray":
+    """Empreintes (x0, y0, x1, y1) des lignes d'un tableau LayoutArray.data, tableau (n, 4)"""
+    angle = np.radians(data["rotation"])
+    cos_a, sin_a = np.cos(angle), np.sin(angle)
+    length, width = data["length"], data["width"]
+    zeros = np.zeros(len(data))
+    xs = np.stack((zeros, length * cos_a, -width * sin_a, length * cos_a - width * sin_a))
+    ys = np.stack((zeros, length * sin_a, width * cos_a, length * sin_a + width * cos_a))
+    return np.stack((data["x"] + xs.min(axis=0), data["y"] + ys.min(axis=0),
+                     data["x"] + xs.max(axis=0), data["y"] + ys.max(axis=0)), axis=1)
+
+
+def layout_footprints(layout: Sequence) -> Tuple[List[str], List[Box], List[int]]:
+    """(types, empreintes arrondies, phases) des éléments, sans construire de dicts si possible"""
+    data = getattr(layout, "data", None)
+    if data is not None:  # LayoutArray (layout_engine)
+        from layout_engine import TYPE_INFO
+        labels = {code: info[0] for code, info in TYPE_INFO.items()}
+        # Même arrondi que les listes de dicts (résultats identiques)
+        boxes = [tuple(round(value, PRECISION) for value in box) for box in footprint_array(data).tolist()]
+        return [labels[code] for code in data["type"].tolist()], boxes, data["phase"].tolist()
+    types, boxes, phases = [], [], []
+    for item in layout:
+        box = footprint(item["x"], item["y"], item["length"], item["width"], item["rotation"])
+        types.append(item["type"])
+        boxes.append(tuple(round(value, PRECISION) for value in box))
+        phases.append(item["phase"])
+    return types, boxes, phases
+
+
+# ============================================================================
+# AIRE DE L'UNION
+# ============================================================================
+
+def _bands(boxes: List[Box]) -> List[List[Box]]:
+    """Rectangles groupés en bandes horizontales disjointes (intervalles en y qui se recouvrent)"""
+    bands: List[List[Box]] = []
+    top = None
+    for box in sorted(boxes, key=lambda box: box[1]):
+        if top is None or box[1] >= top:
+            bands.append([])
+            top = box[3]
+        bands[-1].append(box)
+        top = max(top, box[3])
+    return bands
+
+
+def _sweep_area(boxes: List[Box]) -> float:
+    """Aire de l'union par balayage en x (arbre de segments sur les y compressés)"""
+    ys = sorted({y for box in boxes for y in (box[1], box[3])})
+    rank = {y: k for k, y in enumerate(ys)}
+    size = 1
+    while size < len(ys) - 1:
+        size *= 2
+
+    # span: longueur de l'intervalle de chaque nœud ; covered: longueur couverte
+    span = [0.0] * (2 * size)
+    for k in range(len(ys) - 1):
+        span[size + k] = ys[k + 1] - ys[k]
+    for node in range(size - 1, 0, -1):
+        span[node] = span[2 * node] + span[2 * node + 1]
+    count = [0] * (2 * size)
+    covered = [0.0] * (2 * size)
+
+    def pull(node: int) -> None:
+        if count[node]:
+            covered[node] = span[node]
+        elif node < size:
+            covered[node] = covered[2 * node] + covered[2 * node + 1]
+        else:
+            covered[node] = 0.0
+
+    def update(lo: int, hi: int, delta: int) -> None:
+        """Ajoute delta à la couverture des intervalles élémentaires [lo, hi)"""
+        left, right = lo + size, hi + size
+        first, last = left, right - 1
+        while left < right:
+            if left & 1:
+                count[left] += delta
+                pull(left)
+                left += 1
+            if right & 1:
+                right -= 1
+                count[right] += delta
+                pull(right)
+            left >>= 1
+            right >>= 1
+        # Les nœuds modifiés ont leurs ancêtres sur les chemins des deux bords
+        for node in (first >> 1, last >> 1):
+            while node:
+                pull(node)
+                node >>= 1
+
+    events = []
+    for x0, y0, x1, y1 in boxes:
+        events.append((x0, 1, rank[y0], rank[y1]))
+        events.append((x1, -1, rank[y0], rank[y1]))
+    events.sort()
+
+    area = 0.0
+    previous_x = events[0][0]
+    for x, delta, lo, hi in events:
+        area += covered[1] * (x - previous_x)
+        previous_x = x
+        update(lo, hi, delta)
+    return area
+
+
+def union_area(boxes: Iterable[Box]) -> float:
+    """
+    Aire de l'union de rectangles (m²), chaque zone comptée une fois.
+
+    Les rectangles sont d'abord groupés en bandes horizontales indépendantes
+    (lignes du layout), puis chaque bande est balayée en x: la longueur
+    couverte en y est lue à la racine d'un arbre de segments sur les y
+    compressés (compte de couverture par nœud, sans propagation), mis à jour
+    en O(log n) par événement.
+    """
+    boxes = [box for box in boxes if box[2] > box[0] and box[3] > box[1]]
+    return sum(_sweep_area(band) for band in _bands(boxes))
+
+
+# ============================================================================
+# DÉCOMPOSITION EN BANDES
+# ============================================================================
+
+def _horizontal_strips(boxes: List[Box]) -> List[Box]:
+    """
+    Union en bandes horizontales: tranches entre ordonnées consécutives,
+    intervalles couverts de chaque tranche, tranches identiques fusionnées
+    """
+    ys = sorted({y for box in boxes for y in (box[1], box[3])})
+    pending = sorted(boxes, key=lambda box: box[1])
+    strips = []
+    active: List[Box] = []
+    open_strips: Dict[Tuple[float, float], float] = {}  # (x0, x1) -> y de début
+    position = 0
+    for k, y in enumerate(ys):
+        while position < len(pending) and pending[position][1] <= y:
+            active.append(pending[position])
+            position += 1
+        active = [box for box in active if box[3] > y]
+
+        # Intervalles couverts de la tranche [y, y suivant]
+        intervals = []
+        if k < len(ys) - 1:
+            for x0, _, x1, _ in sorted(active):
+                if intervals and x0 <= intervals[-1][1]:
+                    if x1 > intervals[-1][1]:
+                        intervals[-1][1] = x1
+                else:
+                    intervals.append([x0, x1])
+        current = {(x0, x1) for x0, x1 in intervals}
+
+        # Bandes interrompues: fermées à y ; nouvelles: ouvertes à y
+        for interval in [interval for interval in open_strips if interval not in current]:
+            strips.append((interval[0], open_strips.pop(interval), interval[1], y))
+        for interval in current:
+            open_strips.setdefault(interval, y)
+    return strips
+
+
+def union_strips(boxes: Iterable[Box]) -> List[Box]:
+    """
+    Union de rectangles en rectangles disjoints, en bandes horizontales ou
+    verticales selon le découpage qui en donne le moins (triés par y, puis x)
+    """
+    boxes = [box for box in boxes if box[2] > box[0] and box[3] > box[1]]
+    if not boxes:
+        return []
+    horizontal = _horizontal_strips(boxes)
+    vertical = [(y0, x0, y1, x1) for x0, y0, x1, y1 in
+                _horizontal_strips([(y0, x0, y1, x1) for x0, y0, x1, y1 in boxes])]
+    strips = vertical if len(vertical) < len(horizontal) else horizontal
+    return sorted(strips, key=lambda box: (box[1], box[0], box[3], box[2]))
+
+
+# ============================================================================
+# SURFACES DU LAYOUT
+# ============================================================================
+
+def layout_surfaces(layout: Sequence) -> Dict[str, float]:
+    """
+    Surface de l'union des empreintes (m²) par type d'élément (libellés de
+    LAYOUT: Container, Transformateur, Route, Gazon) et totale ("Total",
+    zones communes à plusieurs types comptées une fois)
+    """
+    types, boxes, _ = layout_footprints(layout)
+    by_type: Dict[str, List[Box]] = {}
+    for element_type, box in zip(types, boxes):
+        by_type.setdefault(element_type, []).append(box)
+    surfaces = {element_type: round(union_area(type_boxes), PRECISION) for element_type, type_boxes in by_type.items()}
+    surfaces["Total"] = round(union_area(boxes), PRECISION)
+    return surfaces
+
+
+def cumulative_surfaces(layout: Sequence, num_phases: int) -> List[float]:
+    """Surface de l'union des éléments des phases 1..k, pour k = 1..num_phases"""
+    _, boxes, phases = layout_footprints(layout)
+    return [round(union_area(box for box, phase in zip(boxes, phases) if phase <= k), PRECISION)
+            for k in range(1, num_phases + 1)]
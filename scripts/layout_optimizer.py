@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Optimiseur de disposition du layout
+
+Cherche la disposition (layout_engine.arrangement) qui minimise l'emprise du
+site, c'est-à-dire l'aire du rectangle englobant tous les éléments, pour un
+terrain d'élancement au plus max_aspect (longueur / largeur; sans cette
+borne, une seule ligne de blocs serait toujours la plus compacte) :
+- containers_per_block: containers par transformateur (groupement en blocs),
+  sans créer plus de blocs que la disposition historique
+- blocks_per_row: blocs par ligne (longueur des lignes)
+- rotation: orientation des containers et transformateurs (0 ou 90°)
+
+1. Estimation analytique de l'emprise de toutes les dispositions (formule
+   fermée, sans générer de layout) ; seules celles à moins de PRUNE_MARGIN
+   de la meilleure estimation sont explorées
+2. Recuit simulé: une chaîne par processus (pool), partant des meilleures
+   estimations, évalue l'emprise exacte des layouts générés
+3. Contrôle des distances minimales (layout_checks.find_conflicts) des
+   meilleures dispositions ; la première sans conflit est retenue
+
+L'emprise est comparée à project_input.surface_limit_m2 (surface du terrain).
+
+Usage:
+    python3 scripts/layout_optimizer.py --config <fichier.json> --power 600 [--limit 150000] [--max-aspect 2]
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy optionnel: layouts en listes de dicts
+    np = None
+
+from config_loader import ConfigError, load_config
+from layout_checks import find_conflicts, footprint
+from layout_engine import ROTATIONS, compute_layout, default_arrangement, layout_parameters, oriented
+
+# Dispositions explorées: estimation au plus (1 + PRUNE_MARGIN) x la meilleure
+PRUNE_MARGIN = 0.25
+
+# Élancement maximal du terrain par défaut (grand côté / petit côté)
+MAX_ASPECT = 2.0
+
+# Recuit simulé: itérations par chaîne, température initiale (fraction de
+# l'emprise de départ) et finale (fraction de la température initiale)
+ITERATIONS = 300
+ANNEAL_T0 = 0.05
+ANNEAL_T_END = 1e-3
+
+# Nombre maximal de dispositions soumises au contrôle des distances
+VALIDATE_LIMIT = 10
+
+# Disposition: (containers_per_block, blocks_per_row, rotation)
+Arrangement = Tuple[int, int, int]
+
+
+def as_dict(arrangement: Arrangement) -> Dict[str, int]:
+    """Disposition au format de layout_engine.arrangement"""
+    containers_per_block, blocks_per_row, rotation = arrangement
+    return {"containers_per_block": containers_per_block, "blocks_per_row": blocks_per_row, "rotation": rotation}
+
+
+# ============================================================================
+# ESPACE DE RECHERCHE ET ESTIMATION
+# ============================================================================
+
+def block_sizes(p: Dict[str, Any], max_per_transformer: int) -> List[int]:
+    """
+    Containers par bloc admissibles: au plus max_per_transformer, et pas plus
+    de blocs (donc de transformateurs) que max(transformateurs, disposition historique)
+    """
+    n = p["num_containers"]
+    max_blocks = max(p["num_transformers"], math.ceil(n / max_per_transformer))
+    return [size for size in range(1, max_per_transformer + 1) if math.ceil(n / size) <= max_blocks]
+
+
+def constrained_area(width: float, height: float, max_aspect: float) -> float:
+    """Aire du rectangle, infinie s'il est plus élancé que max_aspect"""
+    if max(width, height) > max_aspect * min(width, height):
+        return math.inf
+    return width * height
+
+
+def estimate_area(p: Dict[str, Any], arrangement: Arrangement, max_aspect: float = MAX_ASPECT) -> float:
+    """
+    Emprise estimée (m²) sans générer le layout: lignes pleines de blocs
+    complets, marges de routes, sans débord des routes autour des containers
+    (infinie si le rectangle est plus élancé que max_aspect)
+    """
+    per_block, blocks_per_row, rotation = arrangement
+    c_along, c_depth, _ = oriented(p["container_length"], p["container_width"], rotation)
+    t_along, t_depth, _ = oriented(p["transformer_length"], p["transformer_width"], rotation)
+    spacing, rw = p["container_spacing"], p["road_width"]
+
+    blocks = math.ceil(p["num_containers"] / per_block)
+    blocks_per_row = min(blocks_per_row, blocks)
+    rows = math.ceil(blocks / blocks_per_row)
+    block_pitch = per_block * (c_along + spacing) + spacing + t_along + p["block_gap"]
+    grass = p["grass_width"] if p["grass_between_rows"] else 0
+
+    width = 2 * rw + blocks_per_row * block_pitch - p["block_gap"]
+    height = rw + rows * (max(c_depth, t_depth) + p["row_spacing"]) + (rows - 1) * grass
+    return constrained_area(width, height, max_aspect)
+
+
+def search_space(config: Dict[str, Any], power_mw: float) -> Tuple[Dict[str, Any], List[int], int]:
+    """(paramètres du layout, containers par bloc admissibles, blocs par ligne max)"""
+    p = layout_parameters(config, power_mw, default_arrangement(config))
+    sizes = block_sizes(p, config["standards"]["rules"]["max_containers_per_transformer"])
+    max_blocks_per_row = max(math.ceil(p["num_containers"] / min(sizes)), 1)
+    return p, sizes, max_blocks_per_row
+
+
+def prune(p: Dict[str, Any], sizes: List[int], max_aspect: float = MAX_ASPECT) -> Tuple[List[Tuple[float, Arrangement]], float]:
+    """
+    Estimation de toutes les dispositions.
+
+    Returns:
+        (dispositions retenues triées par estimation, borne d'élagage);
+        si aucune ne respecte max_aspect, toutes, sans borne
+    """
+    estimates = []
+    for size in sizes:
+        for blocks_per_row in range(1, math.ceil(p["num_containers"] / size) + 1):
+            for rotation in ROTATIONS:
+                arrangement = (size, blocks_per_row, rotation)
+                estimates.append((estimate_area(p, arrangement, max_aspect), arrangement))
+    estimates.sort()
+    bound = estimates[0][0] * (1 + PRUNE_MARGIN)
+    if math.isinf(bound):
+        # Site trop petit pour l'élancement demandé (quelques containers):
+        # toutes les dispositions sont explorées, sans contrainte de forme
+        return [(0.0, arrangement) for _, arrangement in estimates], math.inf
+    return [entry for entry in estimates if entry[0] <= bound], bound
+
+
+# ============================================================================
+# EMPRISE EXACTE
+# ============================================================================
+
+def layout_bounds(layout: Sequence) -> Tuple[float, float, float, float]:
+    """Rectangle englobant (x0, y0, x1, y1) des empreintes de tous les éléments"""
+    data = getattr(layout, "data", None)
+    if data is not None:  # LayoutArray (layout_engine)
+        angle = np.radians(data["rotation"])
+        cos_a, sin_a = np.cos(angle), np.sin(angle)
+        length, width = data["length"], data["width"]
+        xs = np.stack((np.zeros(len(data)), length * cos_a, -width * sin_a, length * cos_a - width * sin_a))
+        ys = np.stack((np.zeros(len(data)), length * sin_a, width * cos_a, length * sin_a + width * cos_a))
+        return (float((data["x"] + xs.min(axis=0)).min()), float((data["y"] + ys.min(axis=0)).min()),
+                float((data["x"] + xs.max(axis=0)).max()), float((data["y"] + ys.max(axis=0)).max()))
+    boxes = [footprint(item["x"], item["y"], item["length"], item["width"], item["rotation"]) for item in layout]
+    return (min(box[0] for box in boxes), min(box[1] for box in boxes),
+            max(box[2] for box in boxes), max(box[3] for box in boxes))
+
+
+def layout_area(config: Dict[str, Any], power_mw: float, arrangement: Arrangement,
+                max_aspect: float = math.inf) -> float:
+    """Emprise exacte (m²) du layout généré avec cette disposition (infinie au-delà de max_aspect)"""
+    x0, y0, x1, y1 = layout_bounds(compute_layout(config, power_mw, as_dict(arrangement), merge=False))
+    return constrained_area(x1 - x0, y1 - y0, max_aspect)
+
+
+# ============================================================================
+# RECUIT SIMULÉ (POOL DE PROCESSUS)
+# ============================================================================
+
+# Configuration et espace de recherche du processus courant (transmis une
+# fois par processus via l'initialiseur du pool)
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _init_worker(config: Dict[str, Any], power_mw: float, max_aspect: float) -> None:
+    """Initialiseur du pool: mémorise la configuration et l'espace de recherche"""
+    _WORKER_STATE["config"] = config
+    _WORKER_STATE["power_mw"] = power_mw
+    _WORKER_STATE["max_aspect"] = max_aspect
+    _WORKER_STATE["space"] = search_space(config, power_mw)
+
+
+def _neighbour(arrangement: Arrangement, rng: random.Random, sizes: List[int],
+               max_blocks_per_row: int) -> Arrangement:
+    """Disposition voisine: longueur de ligne (pas proportionnel), orientation ou taille de bloc"""
+    per_block, blocks_per_row, rotation = arrangement
+    move = rng.random()
+    if move < 0.6:
+        step = rng.randint(1, max(1, blocks_per_row // 4)) * rng.choice((-1, 1))
+        blocks_per_row = min(max(blocks_per_row + step, 1), max_blocks_per_row)
+    elif move < 0.8 or len(sizes) == 1:
+        rotation = ROTATIONS[1 - ROTATIONS.index(rotation)]
+    else:
+        per_block = rng.choice([size for size in sizes if size != per_block])
+    return per_block, blocks_per_row, rotation
+
+
+def _anneal(start: Arrangement, seed: int, iterations: int, bound: float) -> Dict[Arrangement, float]:
+    """
+    Une chaîne de recuit simulé depuis start. Les voisins dont l'estimation
+    dépasse bound sont écartés sans générer leur layout.
+
+    Returns:
+        Emprise exacte de chaque disposition évaluée (infinie si trop élancée)
+    """
+    config, power_mw, max_aspect = _WORKER_STATE["config"], _WORKER_STATE["power_mw"], _WORKER_STATE["max_aspect"]
+    p, sizes, max_blocks_per_row = _WORKER_STATE["space"]
+    rng = random.Random(seed)
+    evaluated: Dict[Arrangement, float] = {}
+
+    def energy(arrangement: Arrangement) -> float:
+        if arrangement not in evaluated:
+            evaluated[arrangement] = layout_area(config, power_mw, arrangement, max_aspect)
+        return evaluated[arrangement]
+
+    current, current_energy = start, energy(start)
+    # Température initiale d'après l'emprise de start sans contrainte de forme (finie)
+    t0 = ANNEAL_T0 * layout_area(config, power_mw, start)
+    for step in range(iterations):
+        temperature = t0 * ANNEAL_T_END ** (step / iterations)
+        candidate = _neighbour(current, rng, sizes, max_blocks_per_row)
+        if estimate_area(p, candidate, max_aspect) > bound:
+            continue
+        candidate_energy = energy(candidate)
+        if math.isinf(candidate_energy):
+            continue
+        if (candidate_energy <= current_energy
+                or rng.random() < math.exp((current_energy - candidate_energy) / temperature)):
+            current, current_energy = candidate, candidate_energy
+    return evaluated
+
+
+def optimize_layout(config: Dict[str, Any], power_mw: float, surface_limit_m2: float = None,
+                    max_aspect: float = MAX_ASPECT, workers: int = None, iterations: int = ITERATIONS,
+                    seed: int = 0) -> Dict[str, Any]:
+    """
+    Disposition d'emprise minimale sans conflit de distances.
+
+    Args:
+        surface_limit_m2: Surface du terrain (défaut: project_input.surface_limit_m2)
+        max_aspect: Élancement maximal du terrain (grand côté / petit côté)
+        workers: Nombre de processus, une chaîne de recuit par processus
+            (None: un par cœur, 1: sans pool)
+        iterations: Itérations par chaîne
+        seed: Graine des chaînes (résultat reproductible)
+
+    Returns:
+        arrangement (format layout_engine.arrangement), area_m2, width_m,
+        height_m, estimate_m2, baseline_area_m2, surface_limit_m2, fits,
+        candidates (estimées), pruned (retenues), evaluated (layouts générés)
+    """
+    start_time = time.perf_counter()
+    if surface_limit_m2 is None:
+        surface_limit_m2 = config["project_input"].get("surface_limit_m2")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    p, sizes, max_blocks_per_row = search_space(config, power_mw)
+    candidates = len(sizes) * max_blocks_per_row * len(ROTATIONS)
+    pruned, bound = prune(p, sizes, max_aspect)
+
+    # Une chaîne par processus, chacune depuis une des meilleures estimations
+    chains = max(workers, 1)
+    starts = [pruned[k % len(pruned)][1] for k in range(chains)]
+    seeds = [seed + k for k in range(chains)]
+    if workers <= 1:
+        _init_worker(config, power_mw, max_aspect)
+        results = [_anneal(start, chain_seed, iterations, bound) for start, chain_seed in zip(starts, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(config, power_mw, max_aspect)) as executor:
+            results = list(executor.map(_anneal, starts, seeds, [iterations] * chains, [bound] * chains))
+    evaluated: Dict[Arrangement, float] = {}
+    for result in results:
+        evaluated.update(result)
+
+    # Meilleures dispositions, contrôlées par ordre d'emprise croissante
+    # (à défaut de disposition valide: disposition historique)
+    baseline = tuple(default_arrangement(config).values())
+    best = baseline
+    feasible = [key for key in evaluated if not math.isinf(evaluated[key])]
+    for arrangement in sorted(feasible, key=lambda key: (evaluated[key], key))[:VALIDATE_LIMIT]:
+        if not find_conflicts(compute_layout(config, power_mw, as_dict(arrangement), merge=False), config):
+            best = arrangement
+            break
+
+    x0, y0, x1, y1 = layout_bounds(compute_layout(config, power_mw, as_dict(best), merge=False))
+    area = (x1 - x0) * (y1 - y0)
+    return {
+        "power_mw": power_mw,
+        "arrangement": as_dict(best),
+        "area_m2": area,
+        "width_m": x1 - x0,
+        "height_m": y1 - y0,
+        "estimate_m2": estimate_area(p, best, math.inf),
+        "baseline_area_m2": layout_area(config, power_mw, baseline),
+        "surface_limit_m2": surface_limit_m2,
+        "fits": surface_limit_m2 is None or area <= surface_limit_m2,
+        "candidates": candidates,
+        "pruned": len(pruned),
+        "evaluated": len(evaluated),
+        "seconds": time.perf_counter() - start_time,
+    }
+
+
+def print_summary(result: Dict[str, Any]) -> None:
+    """Résumé lisible d'un résultat de optimize_layout()"""
+    arrangement = result["arrangement"]
+    print(f"Disposition: {arrangement['blocks_per_row']} bloc(s) de {arrangement['containers_per_block']} "
+          f"container(s) par ligne, rotation {arrangement['rotation']}°")
+    print(f"Emprise: {result['area_m2']:,.0f} m² ({result['width_m']:.1f} x {result['height_m']:.1f} m), "
+          f"disposition par défaut: {result['baseline_area_m2']:,.0f} m²")
+    print(f"Recherche: {result['candidates']} dispositions estimées, {result['pruned']} retenues, "
+          f"{result['evaluated']} layouts évalués en {result['seconds']:.2f} s")
+    if result["surface_limit_m2"] is not None:
+        status = "OK" if result["fits"] else "⚠ DÉPASSEMENT"
+        print(f"Surface limite: {result['surface_limit_m2']:,.0f} m² -> {status}")
+
+
+def main(argv: List[str] = None):
+    """Affiche la disposition optimale au format JSON (layout_engine.arrangement)"""
+    parser = argparse.ArgumentParser(description="Disposition du layout d'emprise minimale")
+    parser.add_argument("--config", type=Path, required=True, help="Fichier JSON de configuration")
+    parser.add_argument("--power", type=float, default=None, help="Puissance IT (MW), défaut: project_input")
+    parser.add_argument("--limit", type=float, default=None,
+                        help="Surface du terrain (m²), défaut: project_input.surface_limit_m2")
+    parser.add_argument("--max-aspect", type=float, default=MAX_ASPECT,
+                        help="Élancement maximal du terrain (grand côté / petit côté)")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (défaut: un par cœur)")
+    parser.add_argument("--iterations", type=int, default=ITERATIONS, help="Itérations par chaîne de recuit")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du recuit simulé")
+    args = parser.parse_args(argv)
+
+    try:
+        config = load_config(str(args.config))
+    except ConfigError as exc:
+        print(f"ERREUR: {exc}")
+        return 1
+    power = args.power if args.power is not None else config["project_input"].get("power_target_mw", 50)
+
+    result = optimize_layout(config, power, args.limit, args.max_aspect, workers=args.workers,
+                             iterations=args.iterations, seed=args.seed)
+    print_summary(result)
+    print(json.dumps({"arrangement": result["arrangement"]}, indent=2))
+    return 0 if result["fits"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache des onglets du configurateur Mining (régénération incrémentale)
+
+Chaque constructeur d'onglet déclare, via @reads(...), les sous-arbres de la
+configuration qu'il lit. L'empreinte d'un onglet est le SHA-256 de ces
+sous-arbres et de la version du code : si elle n'a pas changé depuis la
+génération précédente, la partie XML de l'onglet (xl/worksheets/sheetN.xml)
+est reprise telle quelle au lieu d'être reconstruite.
+
+Une partie XML n'est réutilisable que si elle est autonome : chaînes en
+ligne (inlineStr) et indices de style stables (styles nommés pré-indexés,
+voir register_named_styles). Les onglets contenant des graphiques (parties
+drawing/chart liées) sont toujours reconstruits.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import re
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from config_loader import cache_dir
+
+# Version du format des entrées de cache
+CACHE_VERSION = 1
+
+
+def reads(*paths: str) -> Callable:
+    """
+    Déclare les sous-arbres de configuration lus par un constructeur
+    d'onglet (chemins pointés, ex. "project_input.power_target_mw").
+    """
+    def decorator(builder: Callable) -> Callable:
+        builder.config_inputs = paths
+        return builder
+    return decorator
+
+
+def config_subtree(config: Dict[str, Any], path: str) -> Any:
+    """Valeur d'un chemin pointé de la configuration (None si absent)"""
+    value = config
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def code_version(paths: Iterable[Path], *extra: str) -> str:
+    """Empreinte du code générateur (sources et paramètres comme la version d'openpyxl)"""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+    for value in extra:
+        digest.update(value.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def sheet_parts(archive) -> Dict[str, str]:
+    """Nom d'onglet -> partie XML du fichier .xlsx (zipfile.ZipFile ouvert)"""
+    workbook_xml = archive.read("xl/workbook.xml").decode("utf-8")
+    rels_xml = archive.read("xl/_rels/workbook.xml.rels").decode("utf-8")
+    targets = {}
+    for rel in re.finditer(r'<Relationship\b[^>]*>', rels_xml):
+        rel_id = re.search(r'\bId="([^"]+)"', rel.group(0)).group(1)
+        target = re.search(r'\bTarget="([^"]+)"', rel.group(0)).group(1)
+        targets[rel_id] = target.lstrip("/") if target.startswith("/") else "xl/" + target
+    parts = {}
+    for sheet in re.finditer(r'<sheet\b[^>]*>', workbook_xml):
+        name = re.search(r'\bname="([^"]+)"', sheet.group(0)).group(1)
+        rel_id = re.search(r'\br:id="([^"]+)"', sheet.group(0)).group(1)
+        parts[name] = targets[rel_id]
+    return parts
+
+
+class SheetCache:
+    """
+    Cache disque des parties XML d'onglets, indexé par empreinte.
+
+    Cycle d'une génération:
+        lookup() avant de construire un onglet: info du constructeur si la
+            partie XML est en cache (l'onglet est alors laissé vide)
+        built() après avoir construit un onglet absent du cache
+        part_xml() au moment de la sauvegarde: partie XML à substituer
+            (onglet repris) ou à enregistrer (onglet construit)
+    """
+
+    def __init__(self, version: str, directory: Path = None):
+        self.version = version
+        self.directory = Path(directory) if directory else cache_dir() / "sheets"
+        self.reused: Dict[str, bytes] = {}
+        self._built: Dict[str, Tuple[str, Any]] = {}
+
+    def fingerprint(self, title: str, config: Dict[str, Any], builders: Iterable[Callable]) -> str:
+        """Empreinte d'un onglet: sous-arbres lus par ses constructeurs + version du code"""
+        paths = sorted({path for builder in builders for path in builder.config_inputs})
+        inputs = {path: config_subtree(config, path) for path in paths}
+        payload = json.dumps([CACHE_VERSION, self.version, title, inputs], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, title: str, fingerprint: str) -> Path:
+        return self.directory / f"{title}-{fingerprint}.pickle"
+
+    def lookup(self, title: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Info du constructeur si l'onglet est en cache (sa partie XML est alors retenue), sinon None"""
+        try:
+            with open(self._entry_path(title, fingerprint), "rb") as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        self.reused[title] = zlib.decompress(entry["xml"])
+        return entry["info"]
+
+    def built(self, title: str, fingerprint: str, info: Dict[str, Any] = None) -> None:
+        """Signale un onglet reconstruit: sa partie XML sera enregistrée à la sauvegarde"""
+        self._built[title] = (fingerprint, info)
+
+    def part_xml(self, title: str, xml: bytes) -> bytes:
+        """
+        Partie XML à écrire pour un onglet: celle du cache si l'onglet est
+        repris; sinon xml, enregistré dans le cache si l'onglet a été construit.
+        """
+        if title in self.reused:
+            return self.reused[title]
+        if title in self._built:
+            fingerprint, info = self._built[title]
+            self._store(title, fingerprint, {"xml": zlib.compress(xml, 1), "info": info})
+        return xml
+
+    def _store(self, title: str, fingerprint: str, entry: Dict[str, Any]) -> None:
+        """Écriture atomique d'une entrée (un échec d'écriture n'est pas bloquant)"""
+        path = self._entry_path(title, fingerprint)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            os.remove(tmp_path)
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Balayage de scénarios du configurateur Mining
+
+Évalue les grandeurs de CALCUL_ENGINE (quantités, surface, câbles BT, CAPEX, OPEX)
+pour toutes les combinaisons puissance x type d'énergie x type de mining,
+en parallèle sur un pool de processus, et écrit un tableau comparatif
+(.csv ou .xlsx).
+
+Usage:
+    python3 scripts/sweep_configurator.py --power 25:600:5 --output sweep.xlsx
+    python3 scripts/sweep_configurator.py --power 50,100,200 --energy grid,solar --mining air
+"""
+
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from cable_engine import cable_length
+from config_loader import ConfigError, load_config
+from calcul_engine import MINING_TYPES, batch_rows, calculate_batch, layout_surface
+from layout_engine import compute_layout
+
+# Colonnes du tableau comparatif: (clé du résultat, en-tête Excel)
+SWEEP_COLUMNS = [
+    ("power_mw", "Puissance (MW)"),
+    ("energy_type", "Type d'énergie"),
+    ("mining_type", "Type mining"),
+    ("containers", "Containers"),
+    ("transformers", "Transformateurs"),
+    ("powerblocks", "PowerBlocks"),
+    ("surface_m2", "Surface (m²)"),
+    ("cable_length_m", "Câbles BT (m)"),
+    ("capex_containers", "CAPEX Containers (USD)"),
+    ("capex_transformers", "CAPEX Transformateurs (USD)"),
+    ("capex_powerblocks", "CAPEX PowerBlocks (USD)"),
+    ("capex_civil", "CAPEX Génie Civil (USD)"),
+    ("capex_cables", "CAPEX Câbles BT (USD)"),
+    ("capex_total", "CAPEX TOTAL (USD)"),
+    ("opex_electricity", "OPEX Électricité (USD/an)"),
+    ("opex_maintenance", "OPEX Maintenance (USD/an)"),
+    ("opex_total", "OPEX TOTAL (USD/an)"),
+]
+
+
+# ============================================================================
+# PLAGES DE PARAMÈTRES
+# ============================================================================
+
+def parse_power_range(text: str) -> List[float]:
+    """
+    Puissances (MW) depuis une liste séparée par des virgules, chaque terme
+    étant une valeur ou une plage début:fin:pas (bornes incluses).
+    Exemple: "25:600:5" ou "10,25:100:25".
+    Lève ValueError pour une plage décroissante ou une liste vide.
+    """
+    powers = []
+    for term in text.split(","):
+        parts = term.strip().split(":")
+        if len(parts) == 1:
+            powers.append(float(parts[0]))
+            continue
+        if len(parts) != 3:
+            raise ValueError(f"Plage invalide: {term!r} (attendu début:fin:pas)")
+        start, stop, step = (float(part) for part in parts)
+        if step <= 0:
+            raise ValueError(f"Pas invalide dans {term!r}")
+        if stop < start:
+            raise ValueError(f"Plage décroissante: {term!r} (fin inférieure au début)")
+        # Multiples du pas (pas d'accumulation d'erreurs d'arrondi)
+        count = int(round((stop - start) / step, 9)) + 1
+        powers.extend(round(start + i * step, 9) for i in range(count))
+    if not powers:
+        raise ValueError(f"Aucune puissance dans {text!r}")
+    # Entiers affichés comme tels (25 plutôt que 25.0)
+    return [int(p) if p == int(p) else p for p in powers]
+
+
+def parse_choices(text: str, available: List[str], label: str) -> List[str]:
+    """Liste de valeurs séparées par des virgules ("all" = toutes les valeurs disponibles)"""
+    if text == "all":
+        return list(available)
+    choices = [choice.strip() for choice in text.split(",") if choice.strip()]
+    unknown = [choice for choice in choices if choice not in available]
+    if unknown:
+        raise ValueError(f"{label} inconnu(s): {', '.join(unknown)} (disponibles: {', '.join(available)})")
+    return choices
+
+
+# ============================================================================
+# CALCUL PARALLÈLE
+# ============================================================================
+
+# Configuration du processus courant (transmise une fois par processus via
+# l'initialiseur du pool)
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _init_worker(config: Dict[str, Any]) -> None:
+    """Initialiseur du pool: mémorise la configuration dans le processus"""
+    _WORKER_STATE["config"] = config
+
+
+def _layout_metrics(power_mw: float) -> Tuple[float, float]:
+    """Surface et longueur de câbles BT du layout d'une puissance (seuls calculs coûteux d'un scénario)"""
+    config = _WORKER_STATE["config"]
+    # Routes non fusionnées: même surface d'union, sans construire les bandes
+    layout = compute_layout(config, power_mw, merge=False)
+    return layout_surface(layout), cable_length(layout, config)
+
+
+def run_sweep(config: Dict[str, Any], powers: List[float], energy_types: List[str],
+              mining_types: List[str], workers: int = None) -> List[Dict[str, Any]]:
+    """
+    Évalue toutes les combinaisons, dans l'ordre puissance > énergie > mining.
+
+    Les layouts (un par puissance, partagé par toutes les combinaisons
+    énergie x mining) sont générés en parallèle, puis toutes les
+    combinaisons sont calculées en une passe par calculate_batch().
+
+    Args:
+        workers: Nombre de processus (None: un par cœur, 1: sans pool)
+    """
+    if not powers or not energy_types or not mining_types:
+        return []
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(powers))
+
+    if workers <= 1:
+        _init_worker(config)
+        metrics = [_layout_metrics(power) for power in powers]
+    else:
+        chunksize = max(1, len(powers) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(config,)) as executor:
+            metrics = list(executor.map(_layout_metrics, powers, chunksize=chunksize))
+
+    scenarios = [
+        (power, energy_type, mining_type, surface, cable)
+        for power, (surface, cable) in zip(powers, metrics)
+        for energy_type in energy_types
+        for mining_type in mining_types
+    ]
+    return batch_rows(calculate_batch(config, *zip(*scenarios)))
+
+
+# ============================================================================
+# ÉCRITURE DES RÉSULTATS
+# ============================================================================
+
+def write_csv(results: List[Dict[str, Any]], output_path: Path) -> None:
+    """Tableau comparatif au format CSV (en-têtes = clés des résultats)"""
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=[key for key, _ in SWEEP_COLUMNS], extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def write_workbook(results: List[Dict[str, Any]], output_path: Path) -> None:
+    """Tableau comparatif dans un onglet SWEEP (workbook en streaming)"""
+    from openpyxl import Workbook
+    from generate_excel_configurator import STYLE_CELL, SheetWriter
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("SWEEP")
+    writer = SheetWriter(ws, column_widths={'A': 15, 'B': 15, 'C': 12})
+    writer.header([label for _, label in SWEEP_COLUMNS])
+    writer.append_rows(([result[key] for key, _ in SWEEP_COLUMNS] for result in results), style=STYLE_CELL)
+    wb.save(str(output_path))
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """Arguments de la ligne de commande"""
+    project_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description="Balayage de scénarios (puissance x énergie x mining)")
+    parser.add_argument("--config", type=Path, default=project_root.parent / "mining_configurator_full_v2.json",
+                        help="Fichier JSON de configuration")
+    parser.add_argument("--power", required=True,
+                        help="Puissances (MW): valeurs et/ou plages début:fin:pas, ex. 25:600:5")
+    parser.add_argument("--energy", default="all",
+                        help="Types d'énergie séparés par des virgules (défaut: tous ceux de energy_sources)")
+    parser.add_argument("--mining", default="all",
+                        help=f"Types de mining séparés par des virgules (défaut: {','.join(MINING_TYPES)})")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (défaut: un par cœur)")
+    parser.add_argument("--output", type=Path, default=project_root / "mining_sweep.xlsx",
+                        help="Fichier de sortie (.xlsx ou .csv)")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None):
+    """Fonction principale"""
+    args = parse_args(argv)
+
+    if not args.config.exists():
+        print(f"ERREUR: Fichier JSON introuvable: {args.config}")
+        return 1
+
+    # Configuration compilée (cache disque): le pool la reçoit déjà indexée
+    try:
+        config = load_config(str(args.config))
+    except ConfigError as exc:
+        print(f"ERREUR: {exc}")
+        return 1
+
+    try:
+        powers = parse_power_range(args.power)
+        energy_types = parse_choices(args.energy, list(config["energy_sources"]), "Type d'énergie")
+        mining_types = parse_choices(args.mining, list(MINING_TYPES), "Type mining")
+    except ValueError as exc:
+        print(f"ERREUR: {exc}")
+        return 1
+
+    total = len(powers) * len(energy_types) * len(mining_types)
+    print(f"{total} scénarios ({len(powers)} puissances x {len(energy_types)} énergies x {len(mining_types)} mining)")
+
+    start = time.perf_counter()
+    results = run_sweep(config, powers, energy_types, mining_types, workers=args.workers)
+    print(f"Calcul: {time.perf_counter() - start:.2f} s")
+
+    if args.output.suffix.lower() == ".csv":
+        write_csv(results, args.output)
+    else:
+        write_workbook(results, args.output)
+    print(f"✓ Résultats écrits: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
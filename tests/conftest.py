@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+"""Fixtures communes des tests du configurateur (scripts/ importés comme modules)"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+CONFIG_PATH = Path(__file__).resolve().parent / "data" / "mining_configurator_full_v2.json"
+
+
+@pytest.fixture(scope="session")
+def config():
+    """Configuration de référence (100 MW, phasage 25 / 50 / 25 MW)"""
+    from config_loader import load_config
+    return load_config(str(CONFIG_PATH))
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Raccordement des containers: capacité des transformateurs et phasage"""
+
+import pytest
+
+import cable_engine
+from cable_engine import cable_plan
+from layout_engine import compute_layout
+
+
+def _elements(layout):
+    return layout.to_dicts() if hasattr(layout, "to_dicts") else list(layout)
+
+
+@pytest.fixture(params=["optimale", "gloutonne"])
+def method(request, monkeypatch):
+    if request.param == "optimale" and cable_engine.cKDTree is None:
+        pytest.skip("SciPy non installé")
+    if request.param == "gloutonne":
+        monkeypatch.setattr(cable_engine, "cKDTree", None)
+    return request.param
+
+
+@pytest.mark.parametrize("power", [100, 600])
+@pytest.mark.parametrize("merge", [False, True])
+def test_feeder_built_no_later_than_container(config, method, power, merge):
+    layout = compute_layout(config, power, merge=merge)
+    elements = _elements(layout)
+    plan = cable_plan(layout, config)
+    assert plan["method"] == method
+    for container, feeder in zip(plan["containers"], plan["feeders"]):
+        if feeder >= 0:
+            assert elements[feeder]["type"] == "Transformateur"
+            assert elements[feeder]["phase"] <= elements[container]["phase"], elements[container]["id"]
+
+
+@pytest.mark.parametrize("power", [100, 600])
+def test_capacity_respected_and_used(config, method, power):
+    layout = compute_layout(config, power, merge=False)
+    plan = cable_plan(layout, config)
+    loads = {}
+    for feeder in plan["feeders"]:
+        if feeder >= 0:
+            loads[feeder] = loads.get(feeder, 0) + 1
+    assert max(loads.values()) <= plan["capacity"]
+    assert plan["connected"] == min(len(plan["containers"]), plan["transformers"] * plan["capacity"])
+
+
+def test_nearest_later_transformer_not_used(method):
+    # Le container de phase 1 est à côté du transformateur de phase 2
+    containers = [(0.0, 0.0), (100.0, 0.0)]
+    transformers = [(1.0, 0.0), (50.0, 0.0)]
+    feeders, _ = cable_engine.assign_transformers(containers, transformers, 1, container_phases=[1, 2],
+                                                  transformer_phases=[2, 1])
+    assert feeders == [1, 0]
+
+
+def test_no_transformer_of_its_phase(method):
+    feeders, _ = cable_engine.assign_transformers([(0.0, 0.0)], [(1.0, 0.0)], 3, container_phases=[1],
+                                                  transformer_phases=[2])
+    assert feeders == [-1]
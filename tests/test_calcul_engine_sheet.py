@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""Prix unitaire des containers de CALCUL_ENGINE: suit le type mining saisi dans INPUT_PROJECT"""
+
+from openpyxl import Workbook
+
+from calcul_engine import MINING_TYPES, select_container
+from generate_excel_configurator import (
+    create_calcul_engine_sheet, create_setup_admin_sheet, register_named_styles
+)
+
+
+def test_container_price_follows_mining_type(config):
+    wb = Workbook()
+    register_named_styles(wb)
+    setup_info = create_setup_admin_sheet(wb, config)
+    calcul_info = create_calcul_engine_sheet(wb, config, setup_info)
+
+    setup = wb["SETUP_ADMIN"]
+    start, end = setup_info["mining_start_row"], setup_info["mining_end_row"]
+    prices = {setup[f"A{row}"].value: setup[f"C{row}"].value for row in range(start, end + 1)}
+    assert prices == {mining_type: select_container(config, mining_type)["capex_usd"]
+                      for mining_type in MINING_TYPES}
+
+    price = wb["CALCUL_ENGINE"][f'C{calcul_info["capex_containers_row"]}'].value
+    assert price == (f"=INDEX(SETUP_ADMIN!C{start}:C{end};"
+                     f"EQUIV(INPUT_PROJECT!C8;SETUP_ADMIN!A{start}:A{end};0);1)")
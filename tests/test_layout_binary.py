@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Conversion des JSON de positions du viewer au format .hqlayout"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from layout_binary import json_elements, json_up_axis, main, read_layout
+
+PUBLIC = Path(__file__).resolve().parents[1] / "public"
+
+
+@pytest.mark.parametrize("name, axis", [
+    ("models/structure-data.json", "Z"),
+    ("spline-positions.json", "Y"),
+])
+def test_from_json_up_axis(tmp_path, name, axis):
+    source = PUBLIC / name
+    data = json.loads(source.read_text(encoding="utf-8"))
+    assert json_up_axis(data) == axis
+
+    output = tmp_path / "layout.hqlayout"
+    assert main(["--from-json", str(source), "--output", str(output)]) == 0
+    layout = read_layout(output)
+    assert layout.meta["up_axis"] == axis
+    assert len(layout) == len(json_elements(data))
+
+    assert main(["--from-json", str(source), "--up-axis", "Y", "--output", str(output)]) == 0
+    assert read_layout(output).meta["up_axis"] == "Y"
+
+
+def test_default_phase(tmp_path):
+    data = {"Container": [{"id": "C-1", "position": [10, 20, 0], "dimensions": [12.2, 2.5, 2.9]}],
+            "Poste": [{"id": "P-1", "position": [0, 0, 0], "dimensions": [5, 3, 3], "phase": 2}]}
+    assert [item["phase"] for item in json_elements(data)] == [1, 2]
+
+    source = tmp_path / "structure.json"
+    source.write_text(json.dumps(data), encoding="utf-8")
+    output = tmp_path / "structure.hqlayout"
+    assert main(["--from-json", str(source), "--output", str(output)]) == 0
+    assert [item["phase"] for item in read_layout(output)] == [1, 2]
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""Phasage du layout: chaque container est alimenté dès sa phase de construction"""
+
+import pytest
+
+from layout_engine import HAS_NUMPY, _generate_layout_python, generate_layout
+
+
+def _layouts(config, power):
+    layouts = {"python": _generate_layout_python(config, power)}
+    if HAS_NUMPY:
+        layouts["numpy"] = generate_layout(config, power, merge=False)
+    return layouts
+
+
+@pytest.mark.parametrize("power", [100, 600, 2000])
+def test_container_not_before_its_transformer(config, power):
+    per_block = config["standards"]["rules"]["max_containers_per_transformer"]
+    for name, layout in _layouts(config, power).items():
+        transformer_phase = {item["id"]: item["phase"] for item in layout if item["type"] == "Transformateur"}
+        for item in layout:
+            if item["type"] != "Container":
+                continue
+            block = (int(item["id"].split("-")[1]) - 1) // per_block
+            feeder = transformer_phase.get(f"TR-{block + 1}")
+            if feeder is not None:
+                assert feeder <= item["phase"], f"{name}: {item['id']} (phase {item['phase']}) avant TR-{block + 1}"
+
+
+def test_phases_identical_between_engines(config):
+    layouts = _layouts(config, 100)
+    if "numpy" not in layouts:
+        pytest.skip("NumPy non installé")
+    assert [item["phase"] for item in layouts["numpy"]] == [item["phase"] for item in layouts["python"]]
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""Indices des styles nommés: stables quel que soit l'ordre de construction des onglets"""
+
+import pytest
+from openpyxl import Workbook
+from openpyxl.cell import Cell
+
+from generate_excel_configurator import build_named_styles, register_named_styles
+
+STYLE_NAMES = [style.name for style in build_named_styles()]
+
+
+@pytest.mark.parametrize("write_only", [False, True])
+def test_style_indices_follow_registry(write_only):
+    wb = Workbook(write_only=write_only)
+    sheets = list(wb.sheetnames)
+    register_named_styles(wb)
+    register_named_styles(wb)  # Idempotent
+    assert wb.sheetnames == sheets
+
+    ws = wb.create_sheet("DATA")
+    # Utilisés dans l'ordre inverse: les indices restent ceux du registre
+    for name in reversed(STYLE_NAMES):
+        cell = Cell(ws)
+        cell.style = name
+        assert cell.style_id == STYLE_NAMES.index(name) + 1, name
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""Plages de puissances du balayage de scénarios"""
+
+import pytest
+
+from sweep_configurator import parse_power_range, run_sweep
+
+
+def test_power_range():
+    assert parse_power_range("10,25:100:25") == [10, 25, 50, 75, 100]
+    assert parse_power_range("0.1:0.3:0.1") == [0.1, 0.2, 0.3]
+
+
+@pytest.mark.parametrize("text", ["10:5:1", "25:100:0", "1:2"])
+def test_invalid_power_range(text):
+    with pytest.raises(ValueError):
+        parse_power_range(text)
+
+
+def test_empty_sweep(config):
+    assert run_sweep(config, [], ["grid"], ["air"]) == []
@@ -0,0 +1,132 @@
+/**
+ * Lecture du format binaire compact du layout (.hqlayout)
+ * Écrit par scripts/layout_binary.py (format décrit dans ce script)
+ *
+ * Les colonnes sont des vues typed array sur l'ArrayBuffer du fichier :
+ * aucune copie ni parsing par élément, les ids sont décodés à la demande.
+ */
+
+const MAGIC = 'HQLAYOUT';
+const VERSION = 1;
+const HEADER_SIZE = 32;
+
+export type LayoutColumnName = 'x' | 'y' | 'z' | 'rotation' | 'length' | 'width' | 'type' | 'phase';
+
+interface LayoutBinaryMeta {
+  format: string;
+  version: number;
+  count: number;
+  columns: { name: LayoutColumnName; dtype: 'float32' | 'int32'; offset: number }[];
+  ids: { offsets: number; data: number; length: number };
+  types: string[];
+  up_axis: 'Y' | 'Z';
+  source: Record<string, unknown>;
+}
+
+export interface LayoutBinaryElement {
+  id: string;
+  type: string;
+  x: number;
+  y: number;
+  z: number;
+  rotation: number;
+  phase: number;
+  length: number;
+  width: number;
+}
+
+export interface LayoutBinary {
+  count: number;
+  /** Libellés des codes de la colonne type */
+  types: string[];
+  /** Axe vertical des coordonnées ('Z' : configurateur, 'Y' : repère three.js) */
+  upAxis: 'Y' | 'Z';
+  source: Record<string, unknown>;
+  x: Float32Array;
+  y: Float32Array;
+  z: Float32Array;
+  rotation: Float32Array;
+  length: Float32Array;
+  width: Float32Array;
+  type: Int32Array;
+  phase: Int32Array;
+  /** Id de l'élément i (décodé à la demande) */
+  getId(index: number): string;
+  /** Élément i au format objet (pour les listes, infobulles...) */
+  getElement(index: number): LayoutBinaryElement;
+}
+
+/**
+ * Lit un layout binaire depuis un ArrayBuffer (vues sans copie)
+ * Les typed arrays lisent l'ordre natif : little-endian sur les plateformes ciblées
+ */
+export function parseLayoutBinary(buffer: ArrayBuffer): LayoutBinary {
+  if (buffer.byteLength < HEADER_SIZE) {
+    throw new Error('Layout binaire: fichier trop court');
+  }
+  const header = new DataView(buffer, 0, HEADER_SIZE);
+  const magic = String.fromCharCode.apply(null, Array.from(new Uint8Array(buffer, 0, 8)));
+  if (magic !== MAGIC) {
+    throw new Error('Layout binaire: pas un fichier .hqlayout');
+  }
+  const version = header.getUint32(8, true);
+  if (version !== VERSION) {
+    throw new Error(`Layout binaire: version ${version} non supportée (attendue : ${VERSION})`);
+  }
+  const count = header.getUint32(12, true);
+  const metaOffset = header.getUint32(16, true);
+  const metaLength = header.getUint32(20, true);
+
+  const decoder = new TextDecoder('utf-8');
+  const meta: LayoutBinaryMeta = JSON.parse(decoder.decode(new Uint8Array(buffer, metaOffset, metaLength)));
+
+  const columns: Partial<Record<LayoutColumnName, Float32Array | Int32Array>> = {};
+  meta.columns.forEach((column) => {
+    columns[column.name] = column.dtype === 'float32'
+      ? new Float32Array(buffer, column.offset, count)
+      : new Int32Array(buffer, column.offset, count);
+  });
+
+  const idOffsets = new Uint32Array(buffer, meta.ids.offsets, count + 1);
+  const idData = new Uint8Array(buffer, meta.ids.data, meta.ids.length);
+  const getId = (index: number): string => decoder.decode(idData.subarray(idOffsets[index], idOffsets[index + 1]));
+
+  const layout: LayoutBinary = {
+    count,
+    types: meta.types,
+    upAxis: meta.up_axis,
+    source: meta.source,
+    x: columns.x as Float32Array,
+    y: columns.y as Float32Array,
+    z: columns.z as Float32Array,
+    rotation: columns.rotation as Float32Array,
+    length: columns.length as Float32Array,
+    width: columns.width as Float32Array,
+    type: columns.type as Int32Array,
+    phase: columns.phase as Int32Array,
+    getId,
+    getElement: (index: number): LayoutBinaryElement => ({
+      id: getId(index),
+      type: meta.types[layout.type[index]],
+      x: layout.x[index],
+      y: layout.y[index],
+      z: layout.z[index],
+      rotation: layout.rotation[index],
+      phase: layout.phase[index],
+      length: layout.length[index],
+      width: layout.width[index],
+    }),
+  };
+  return layout;
+}
+
+/**
+ * Charge un layout binaire (fichier public/ ou service du configurateur)
+ */
+export async function loadLayoutBinary(url: string, init?: RequestInit): Promise<LayoutBinary> {
+  const response = await fetch(url, init);
+  if (!response.ok) {
+    throw new Error(`Layout binaire: ${url} (${response.status})`);
+  }
+  return parseLayoutBinary(await response.arrayBuffer());
+}